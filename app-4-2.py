@@ -1,109 +1,58 @@
+import os
+import time
 import streamlit as st
-import pandas as pd
-import re
-import io
-
-def extract_full_experience_section(text):
-    match = re.search(r'ExpérienceExpérience(.*?)FormationFormation', text, re.DOTALL)
-    return match.group(1) if match else ""
-
-def extract_name_from_experience(section_text):
-    lines = [l.strip() for l in section_text.split('\n') if l.strip()]
-    for i in range(len(lines) - 1):
-        if lines[i] == lines[i+1]:
-            return lines[i]
-    return "Nom inconnu"
-
-def looks_like_name(line):
-    words = line.strip().split()
-    if len(words) < 2 or len(words) > 3:
-        return False
-    for w in words:
-        if not w[0].isupper() or not w.isalpha():
-            return False
-    return True
-
-def extract_name_general(text):
-    lines = [l.strip() for l in text.split('\n') if l.strip()]
-    for line in lines:
-        if looks_like_name(line):
-            return line
-    return "Nom inconnu"
-
-def clean_double_text(text):
-    half = len(text) // 2
-    return text[:half] if len(text) % 2 == 0 and text[:half] == text[half:] else text
-
-def extract_year(date_str):
-    match = re.search(r'(\d{4})', date_str)
-    return match.group(1) if match else ""
-
-def is_valid_poste(poste):
-    if len(poste) > 50:
-        return False
-    if re.search(r'[.!?]', poste):
-        return False
-    if re.search(r'\b(selected|managed|developed|designed|served|created|led)\b', poste, re.I):
-        return False
-    return True
-
-def is_valid_date_line(date_line):
-    return bool(re.search(r'(\w+\.? \d{4})\s*-\s*(aujourd’hui|\w+\.? \d{4})', date_line, re.I))
-
-def parse_experiences(section_text):
-    experiences = []
-    blocs = re.split(r'Logo de ', section_text)
-    for bloc in blocs[1:]:
-        lines = [l.strip() for l in bloc.strip().split('\n') if l.strip()]
-        if not lines:
-            continue
-        entreprise = lines[0]
-        if len(lines) > 1 and lines[1] == entreprise + entreprise:
-            start_line = 2
-        else:
-            start_line = 1
-
-        i = start_line
-        while i + 1 < len(lines):
-            poste = clean_double_text(lines[i])
-            date_line = lines[i+1]
-
-            if not (is_valid_poste(poste) and is_valid_date_line(date_line)):
-                i += 1  # avancer d’une ligne pour ne pas rester bloqué
-                continue
-
-            type_contrat = ""
-            date_debut = ""
-            date_fin = ""
-            contrat_match = re.search(r'·\s*(Stage|Temps plein|Temps partiel|CDI|CDD)', date_line, re.I)
-            if contrat_match:
-                type_contrat = contrat_match.group(1)
-            date_match = re.search(r'(\w+\.? \d{4})\s*-\s*(aujourd’hui|\w+\.? \d{4})', date_line, re.I)
-            if date_match:
-                date_debut = date_match.group(1)
-                date_fin = date_match.group(2)
-
-            experiences.append({
-                "Entreprise": entreprise,
-                "Poste": poste,
-                "Type de contrat": type_contrat,
-                "Date début": date_debut,
-                "Date fin": date_fin,
-                "Année début": extract_year(date_debut),
-                "Année fin": extract_year(date_fin)
-            })
-
-            i += 2
-            # Ignorer les lignes descriptions qui commencent par '-'
-            while i < len(lines) and lines[i].startswith('-'):
-                i += 1
-
-    return experiences
-
-if "profiles_data" not in st.session_state:
-    st.session_state.profiles_data = []
+from linkedin_tools import instrument
+from linkedin_tools.experiences import (
+    extract_full_experience_section, extract_name_from_experience, extract_name_general, parse_experiences,
+)
+from linkedin_tools.profile_zip import iter_profiles
+from linkedin_tools.dedup import normalize_link
+from linkedin_tools.dates import add_tenure, total_tenure, TENURE_COLUMN
+from linkedin_tools.exports import stream_csv_bytes, stream_xlsx_bytes, CSV_MIME, XLSX_MIME
+from linkedin_tools.export_jobs import new_worker, counted
+from linkedin_tools.sqlite_store import (
+    connect, lookup_profile, add_profile, update_profile, get_profile, last_profile_id, record_duplicates,
+    replace_experiences, experiences_frame, profile_slices, delete_profiles, iter_query, fetch_page, count_rows,
+    data_version, FULL_PROFILE_SOURCE, PROFILES_SCOPE, EXPERIENCE_COLUMNS,
+    PROFILE_NAMES_QUERY, EXPERIENCES_QUERY, EXPERIENCES_EXPORT_QUERY, DUPLICATES_QUERY,
+)
+from app_ui import collection, current_page, page_selector, paged_table, export_button, instrument_toggle, instrument_panel
+
+PROFILES_PER_PAGE = 10
+MAX_FAILURES_SHOWN = 100
+
+@st.cache_resource
+def get_export_worker():
+    # Pool d'exports partagé par toutes les sessions (voir export_jobs)
+    return new_worker()
+
+def store_profile(nom, url, data):
+    # URL et noms déjà analysés (voir dedup), cherchés sur les index de la base : un profil
+    # ré-analysé remplace l'ancien. Renvoie (n° du profil remplacé ou None, doublons possibles)
+    with instrument.stage("doublons"):
+        match = lookup_profile(conn, FULL_PROFILE_SOURCE, url, nom)
+    same = match["link"]
+    if same is None and match["name"] is not None:
+        # Même nom : même personne, sauf si les deux URL renseignées diffèrent (homonyme)
+        other_url = normalize_link(get_profile(conn, match["name"])["Lien"])
+        if not other_url or not url or other_url == normalize_link(url):
+            same = match["name"]
+    with instrument.stage("stockage"):
+        if same is not None:
+            update_profile(conn, same, {"Nom": nom, "Lien": url or get_profile(conn, same)["Lien"]})
+            replace_experiences(conn, same, data)
+            return same, []
+        profile_id = add_profile(conn, FULL_PROFILE_SOURCE, {"Nom": nom, "Lien": url})
+        replace_experiences(conn, profile_id, data)
+        return None, record_duplicates(conn, profile_id, match)
 
 st.title("🔍 Parser LinkedIn multi-profils (copié/collé)")
+report = instrument_toggle()
+
+# Profils et expériences enregistrés dans la base SQLite de la collecte (voir sqlite_store et
+# app_ui) : ils survivent au rafraîchissement, et seule la page affichée est relue
+store = collection()
+conn = store["conn"]
 
 url_input = st.text_input("URL du profil LinkedIn (optionnel)")
 text_input = st.text_area("Collez ici tout le texte LinkedIn du profil à analyser", height=400)
@@ -112,56 +61,138 @@ if st.button("Analyser ce profil"):
     if not text_input.strip():
         st.warning("Merci de coller un texte LinkedIn.")
     else:
-        section_exp = extract_full_experience_section(text_input)
-        if not section_exp:
+        # Un seul parcours repère toutes les sections (Expérience, Formation, Langues…) ; les
+        # libellés doublés ("InternIntern" → "Intern") sont ramenés à un exemplaire à l'analyse
+        with instrument.stage("sections"):
+            section_exp = extract_full_experience_section(text_input)
+        if section_exp is None or not section_exp.strip():
             st.error("Section Expérience introuvable.")
         else:
             nom = extract_name_from_experience(section_exp)
             if nom == "Nom inconnu":
                 nom = extract_name_general(text_input)
-            data = parse_experiences(section_exp)
-            df = pd.DataFrame(data)
-            st.session_state.profiles_data.append({
-                "name": nom,
-                "url": url_input.strip() if url_input else "",
-                "df": df
-            })
-            st.success(f"Profil '{nom}' analysé et ajouté.")
-
-if st.session_state.profiles_data:
+            with instrument.stage("analyse"):
+                data = parse_experiences(section_exp)
+            url = url_input.strip() if url_input else ""
+            same, warnings = store_profile(nom, url, data)
+            if same is not None:
+                st.info(f"Profil '{nom}' déjà analysé (n°{same}) : remplacé par cette analyse.")
+            else:
+                for warning in warnings:
+                    st.warning(f"Doublon possible ({warning['Motif']}) : '{nom}' ressemble au profil n°{warning['Doublon de']} '{warning['Nom existant']}'.")
+                st.success(f"Profil '{nom}' analysé et ajouté.")
+
+# Import en lot : archive zip de profils enregistrés en texte, lus un à un et répartis sur les
+# cœurs (voir profile_zip) ; chaque profil est enregistré dès qu'il est analysé
+with st.expander("📦 Importer une archive zip de profils"):
+    archive = st.file_uploader(
+        "Archive .zip : un fichier texte par profil, URL optionnelle dans un fichier .url du même nom",
+        type=["zip"]
+    )
+    if archive and st.button("Importer l'archive"):
+        counts = {"ajoutés": 0, "remplacés": 0, "doublons possibles": 0, "échecs": 0}
+        failures = []
+        nb_done = 0
+        progress = st.empty()
+        with instrument.stage("import zip"):
+            for result in iter_profiles(archive, workers=os.cpu_count() or 1):
+                nb_done += 1
+                if result["Erreur"] is not None:
+                    counts["échecs"] += 1
+                    if len(failures) < MAX_FAILURES_SHOWN:
+                        failures.append({"Fichier": result["Fichier"], "Erreur": result["Erreur"]})
+                else:
+                    same, warnings = store_profile(result["Nom"], result["Lien"], result["Expériences"])
+                    counts["remplacés" if same is not None else "ajoutés"] += 1
+                    counts["doublons possibles"] += bool(warnings)
+                progress.write(f"⏳ {nb_done} fichiers traités — " + ", ".join(f"{v} {k}" for k, v in counts.items()))
+        progress.empty()
+        st.success(f"Archive importée : {nb_done} fichiers — " + ", ".join(f"{v} {k}" for k, v in counts.items()))
+        if failures:
+            st.write(f"Fichiers écartés ({counts['échecs']}, au plus {MAX_FAILURES_SHOWN} affichés) :")
+            st.dataframe(failures, hide_index=True)
+
+nb_profiles = count_rows(conn, PROFILE_NAMES_QUERY, (FULL_PROFILE_SOURCE,))
+if nb_profiles:
     st.markdown("### Profils analysés :")
-    for i, prof in enumerate(st.session_state.profiles_data):
-        st.markdown(f"**{i+1}. {prof.get('name', 'Nom inconnu')}** — URL: {prof.get('url', '') or 'Non renseignée'}")
-        st.dataframe(prof['df'])
-
-    buffer = io.BytesIO()
-    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-        recap_df = pd.DataFrame([
-            {"Nom": p.get('name', 'Nom inconnu'), "URL": p.get('url', '')}
-            for p in st.session_state.profiles_data
-        ])
-        recap_df.to_excel(writer, sheet_name="Récap Profils", index=False)
-
-        for prof in st.session_state.profiles_data:
-            sheet_name = prof.get('name', 'Profil')[:31].replace('/', '-').replace('\\', '-')
-            prof['df'].to_excel(writer, sheet_name=sheet_name, index=False)
-
-    st.download_button(
-        label="📥 Télécharger tous les profils en XLSX (Récap + CVs)",
-        data=buffer.getvalue(),
+    with instrument.stage("affichage"):
+        page = current_page("profiles_page", nb_profiles, PROFILES_PER_PAGE)
+        _, profiles = fetch_page(conn, PROFILE_NAMES_QUERY, (FULL_PROFILE_SOURCE,), page, PROFILES_PER_PAGE)
+        # Une seule table longue pour les expériences de la page ; chaque profil en affiche une
+        # tranche (vue sans copie), avec la durée de chaque expérience et l'ancienneté par entreprise
+        experiences = add_tenure(experiences_frame(conn, FULL_PROFILE_SOURCE, [profile_id for profile_id, _, _ in profiles]))
+        slices = profile_slices(experiences)
+        tenure = total_tenure(experiences, ["N°", "Entreprise"])
+        tenure_slices = profile_slices(tenure)
+        # Colonnes affichées choisies une fois sur la table longue : chaque tranche en est une vue
+        shown = experiences[EXPERIENCE_COLUMNS + [TENURE_COLUMN]]
+        for profile_id, name, url in profiles:
+            st.markdown(f"**{profile_id}. {name or 'Nom inconnu'}** — URL: {url or 'Non renseignée'}")
+            st.dataframe(shown.iloc[slices.get(profile_id, slice(0, 0))], hide_index=True)
+            companies = tenure.iloc[tenure_slices.get(profile_id, slice(0, 0))]
+            if len(companies):
+                st.caption("Ancienneté : " + " · ".join(f"{company} {months} mois" for company, months in zip(companies["Entreprise"], companies["Mois"])))
+        page_selector("profiles_page", nb_profiles, PROFILES_PER_PAGE)
+
+    nb_duplicates = count_rows(conn, DUPLICATES_QUERY, (FULL_PROFILE_SOURCE,))
+    if nb_duplicates:
+        with st.expander(f"⚠️ Doublons possibles ({nb_duplicates})"):
+            paged_table(conn, DUPLICATES_QUERY, (FULL_PROFILE_SOURCE,), key="duplicates_page", total=nb_duplicates)
+
+    def build_workbook(progress):
+        # Récap puis toutes les expériences dans une seule feuille, une ligne par expérience avec
+        # le numéro et le nom du profil, en un seul parcours ; enfin l'ancienneté de chaque profil
+        # dans chaque entreprise, calculée sur la table longue. Dans un thread du pool : connexion
+        # propre au travail
+        export_conn = connect(store["path"])
+        try:
+            params = (FULL_PROFILE_SOURCE,)
+            tenure = total_tenure(add_tenure(experiences_frame(export_conn, FULL_PROFILE_SOURCE)), ["N°", "Entreprise"])
+            names = {profile_id: name for profile_id, name, _ in iter_query(export_conn, PROFILE_NAMES_QUERY, params)}
+            tenure_rows = [
+                (profile_id, names.get(profile_id), company, months)
+                for profile_id, company, months in tenure.astype({"Entreprise": object}).to_numpy().tolist()
+            ]
+            progress(0, total=len(names) + count_rows(export_conn, EXPERIENCES_EXPORT_QUERY, params) + len(tenure_rows))
+            return stream_xlsx_bytes(lambda: [
+                ("Récap Profils", ["N°", "Nom", "URL"], counted(iter_query(export_conn, PROFILE_NAMES_QUERY, params), progress)),
+                ("Expériences", ["N°", "Nom"] + EXPERIENCE_COLUMNS, counted(iter_query(export_conn, EXPERIENCES_EXPORT_QUERY, params), progress)),
+                ("Ancienneté", ["N°", "Nom", "Entreprise", "Mois"], counted(tenure_rows, progress)),
+            ])
+        finally:
+            export_conn.close()
+
+    # Construit en arrière-plan ; une demande identique (même collecte, même version des profils,
+    # même mois pour les postes en cours) reprend le travail déjà lancé
+    export_button(
+        get_export_worker(), ("profils complets", store["id"], data_version(conn, PROFILES_SCOPE), time.strftime("%Y-%m")), build_workbook,
+        label="📥 Télécharger tous les profils en XLSX (Récap, expériences, ancienneté)",
+        prepare_label="⚙️ Préparer le XLSX de tous les profils",
         file_name="profils_linkedin_multi.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        mime=XLSX_MIME
     )
 
-    last = st.session_state.profiles_data[-1]
-    csv = last['df'].to_csv(index=False).encode('utf-8')
+    last_id = last_profile_id(conn, FULL_PROFILE_SOURCE)
+    last_name = get_profile(conn, last_id)["Nom"] or 'Nom inconnu'
+
+    def build_last_profile():
+        # Au clic, hors du rerun : connexion propre à l'export
+        export_conn = connect(store["path"])
+        try:
+            return stream_csv_bytes(EXPERIENCE_COLUMNS, lambda: iter_query(export_conn, EXPERIENCES_QUERY, (last_id,)))
+        finally:
+            export_conn.close()
+
     st.download_button(
-        label=f"📥 Télécharger le dernier profil ({last.get('name', 'Nom inconnu')}) en CSV",
-        data=csv,
-        file_name=f"profil_{last.get('name', 'profil')}.csv",
-        mime="text/csv"
+        label=f"📥 Télécharger le dernier profil ({last_name}) en CSV",
+        data=instrument.bind(build_last_profile),
+        file_name=f"profil_{last_name}.csv",
+        mime=CSV_MIME
     )
 
+# Seuls les profils de cette collecte sont supprimés
 if st.button("🗑️ Réinitialiser tous les profils analysés"):
-    st.session_state.profiles_data = []
-    st.experimental_rerun()
+    delete_profiles(conn, FULL_PROFILE_SOURCE)
+    st.rerun()
+
+instrument_panel(report)
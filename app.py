@@ -1,114 +1,22 @@
 import streamlit as st
-import pandas as pd
-import re
+from linkedin_tools import instrument
+from linkedin_tools.header import parse_one_profile
+from linkedin_tools.exports import stream_xlsx_bytes, XLSX_MIME
+from linkedin_tools.sqlite_store import (
+    connect, lookup_profile, add_profile, record_duplicates, iter_query, count_rows,
+    HEADER_SOURCE, PROFILE_COLUMNS, PROFILES_QUERY, DUPLICATES_QUERY,
+)
+from app_ui import collection, paged_table, instrument_toggle, instrument_panel
 
 st.title("Extracteur itératif de profils LinkedIn - version avec extraction pays")
 
-# Initialisation mémoire session
-if "profiles" not in st.session_state:
-    st.session_state["profiles"] = []
+# Mesures par étape, à la demande (case dans la barre latérale)
+report = instrument_toggle()
 
-def extract_name(text):
-    match = re.search(r"^([A-ZÀ-Ÿ][a-zà-ÿ]+\s+[A-ZÀ-Ÿ][a-zà-ÿ]+)", text)
-    return match.group(1).strip() if match else ""
-
-def extract_relation(text):
-    match = re.search(r"(relation de \d+[e|ᵉ])", text, re.IGNORECASE)
-    return match.group(1).strip() if match else ""
-
-def extract_title(text):
-    relation_pattern = r"(relation de \d+[e|ᵉ])"
-    title_match = None
-
-    relation_search = re.search(relation_pattern, text, re.IGNORECASE)
-    if relation_search:
-        start_pos = relation_search.end()
-        substring = text[start_pos:].strip()
-
-        coord_pos = substring.find("Coordonnées")
-        if coord_pos != -1:
-            substring = substring[:coord_pos].strip()
-
-        if "|" in substring:
-            substring = substring.rsplit("|", 1)[0].strip()
-
-        substring = re.sub(r"^niveau \d+[e|ᵉ]\s*", "", substring, flags=re.IGNORECASE)
-        
-        title_match = substring.strip()
-    else:
-        title_match = ""
-
-    return title_match
-
-def extract_location(text):
-    relation_pattern = r"(relation de \d+[e|ᵉ])"
-    relation_search = re.search(relation_pattern, text, re.IGNORECASE)
-    
-    if relation_search:
-        start_pos = relation_search.end()
-        substring = text[start_pos:].strip()
-
-        coord_pos = substring.find("Coordonnées")
-        if coord_pos != -1:
-            before_coord = substring[:coord_pos].strip()
-
-            if "|" in before_coord:
-                loc_candidate = before_coord.rsplit("|", 1)[-1].strip()
-                if len(loc_candidate.split()) <= 6:
-                    return loc_candidate
-
-            parts = re.split(r"\s{2,}", before_coord)
-            if len(parts) > 1:
-                loc_candidate = parts[-1].strip()
-                if len(loc_candidate.split()) <= 6:
-                    return loc_candidate
-
-            if len(before_coord.split()) <= 6:
-                return before_coord
-    
-    loc_match = re.search(r"([A-Za-zÀ-ÿ\s,.\-]{2,})Coordonnées", text)
-    if loc_match:
-        return loc_match.group(1).strip()
-
-    return ""
-
-def extract_country(text):
-    countries = [
-        "Finlande", "France", "États-Unis", "Japon", "Allemagne", "Canada",
-        "Royaume-Uni", "Espagne", "Italie", "Belgique", "Suisse", "Suède",
-        "Norvège", "Danemark", "Pays-Bas", "Australie", "Chine", "Inde",
-        "Brésil", "Mexique", "Russie", "Turquie"
-    ]
-    for country in countries:
-        if country.lower() in text.lower():
-            return country
-    return ""
-
-def extract_link(text):
-    match = re.search(r"(https?://[^\s]+)", text)
-    return match.group(1).strip() if match else ""
-
-def extract_followers(text):
-    match = re.search(r"(\d[\d\s]* abonnés)", text)
-    return match.group(1).strip() if match else ""
-
-def extract_connections(text):
-    match = re.search(r"(Plus de \d+ relations)", text)
-    return match.group(1).strip() if match else ""
-
-def parse_one_profile(text):
-    clean_text = text.replace("\n", " ").strip()
-    location = extract_location(clean_text)
-    return {
-        "Nom": extract_name(clean_text),
-        "Relation": extract_relation(clean_text),
-        "Titre": extract_title(clean_text),
-        "Localisation": location,
-        "Pays": extract_country(location),
-        "Lien": extract_link(clean_text),
-        "Abonnés": extract_followers(clean_text),
-        "Relations": extract_connections(clean_text),
-    }
+# Profils enregistrés dans la base SQLite de la collecte (voir sqlite_store et app_ui) : ils
+# survivent au rafraîchissement, et seule la page affichée est relue
+store = collection()
+conn = store["conn"]
 
 with st.form("form_profile"):
     input_text = st.text_area("Collez un profil LinkedIn (en-tête)", height=300)
@@ -116,25 +24,50 @@ with st.form("form_profile"):
 
 if submitted:
     if input_text.strip():
-        profile_data = parse_one_profile(input_text)
-        st.session_state["profiles"].append(profile_data)
-        st.success("Profil ajouté !")
+        with instrument.stage("analyse"):
+            profile_data = parse_one_profile(input_text)
+        # Liens et noms déjà collectés (voir dedup), cherchés sur les index de la base
+        with instrument.stage("doublons"):
+            match = lookup_profile(conn, HEADER_SOURCE, profile_data["Lien"], profile_data["Nom"])
+        if match["link"] is not None:
+            # Même lien : c'est le même profil, déjà dans le tableau
+            st.info(f"Profil déjà collecté (même lien, n°{match['link']}) : il n'est pas ajouté une seconde fois.")
+        else:
+            with instrument.stage("stockage"):
+                profile_id = add_profile(conn, HEADER_SOURCE, profile_data)
+                warnings = record_duplicates(conn, profile_id, match)
+            for warning in warnings:
+                st.warning(f"Doublon possible ({warning['Motif']}) : « {warning['Nom']} » ressemble au n°{warning['Doublon de']} « {warning['Nom existant']} ».")
+            st.success("Profil ajouté !")
     else:
         st.warning("Merci de coller un profil valide.")
 
-if st.session_state["profiles"]:
+nb_profiles = count_rows(conn, PROFILES_QUERY, (HEADER_SOURCE,))
+if nb_profiles:
     st.write("### Profils ajoutés jusqu'à présent :")
-    df = pd.DataFrame(st.session_state["profiles"])
-    st.dataframe(df)
-
-    def convert_df_to_excel(df):
-        import io
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False)
-        return output.getvalue()
-
-    excel_data = convert_df_to_excel(df)
-    st.download_button("📥 Télécharger tous les profils au format Excel", excel_data, file_name="linkedin_profiles.xlsx")
+    with instrument.stage("affichage"):
+        paged_table(conn, PROFILES_QUERY, (HEADER_SOURCE,), key="profiles_page", total=nb_profiles)
+
+    nb_duplicates = count_rows(conn, DUPLICATES_QUERY, (HEADER_SOURCE,))
+    if nb_duplicates:
+        with st.expander(f"⚠️ Doublons possibles ({nb_duplicates})"):
+            paged_table(conn, DUPLICATES_QUERY, (HEADER_SOURCE,), key="duplicates_page", total=nb_duplicates)
+
+    def build_profiles():
+        # Au clic, hors du rerun : connexion propre à l'export
+        export_conn = connect(store["path"])
+        try:
+            return stream_xlsx_bytes(lambda: [("Sheet1", ["N°"] + PROFILE_COLUMNS, iter_query(export_conn, PROFILES_QUERY, (HEADER_SOURCE,)))])
+        finally:
+            export_conn.close()
+
+    st.download_button(
+        "📥 Télécharger tous les profils au format Excel",
+        instrument.bind(build_profiles),
+        file_name="linkedin_profiles.xlsx",
+        mime=XLSX_MIME
+    )
 else:
     st.info("Collez un profil et cliquez sur Ajouter pour commencer.")
+
+instrument_panel(report)
@@ -1,100 +1,50 @@
 import streamlit as st
 import pandas as pd
-import re
-from io import BytesIO
-from datetime import datetime, timedelta
+from linkedin_tools import instrument
+from linkedin_tools.posts import new_post_slot, refresh_post_slot, reaction_rows, reaction_frame
+from linkedin_tools.exports import xlsx_bytes, stream_xlsx_bytes, XLSX_MIME
+from linkedin_tools.export_jobs import new_worker, counted
+from linkedin_tools.dates import resolve_relative_dates
+from linkedin_tools.sqlite_store import (
+    connect, save_post, delete_post, replace_reaction_rows, reaction_counts, iter_query, count_rows, data_version,
+    POSTS_SCOPE, POST_COLUMNS, REACTION_COLUMNS, POSTS_QUERY, REACTIONS_QUERY, REACTIONS_BY_TYPE_QUERY,
+)
+from app_ui import collection, paged_table, export_button, instrument_toggle, instrument_panel
 
 st.set_page_config(page_title="LinkedIn Posts & Reactions Analyzer")
 
-# Fonction pour parser la date relative (ex: "Il y a 3 jours") en date absolue
-def parse_relative_date(text):
-    # Exemples de formats possibles en français
-    # "Il y a 3 jours", "Il y a 5 h", "Il y a 1 semaine", "Il y a 2 mois"
-    match = re.search(r"Il y a (\d+)\s*(jour|jours|h|heure|heures|semaine|semaines|mois)", text.lower())
-    if not match:
-        return None
-    value = int(match.group(1))
-    unit = match.group(2)
-    now = datetime.now()
-
-    if unit.startswith('jour'):
-        delta = timedelta(days=value)
-    elif unit.startswith('h'):
-        delta = timedelta(hours=value)
-    elif unit.startswith('heure'):
-        delta = timedelta(hours=value)
-    elif unit.startswith('semaine'):
-        delta = timedelta(weeks=value)
-    elif unit.startswith('mois'):
-        delta = timedelta(days=30*value)  # approximation
-    else:
-        return None
-
-    date = now - delta
-    return date.strftime("%Y-%m-%d %H:%M:%S")
-
-# Extraction du post : 
-# on retire la partie "Il y a X • Visible..." du début
-def clean_post_text(text):
-    # Supprime la partie "Il y a ... • Visible de tous sur LinkedIn et en dehors"
-    text = re.sub(r"^Il y a [^•]+\s*•\s*Visible de tous sur LinkedIn et en dehors\s*", "", text, flags=re.I)
-    return text.strip()
-
-# Extraction des réactions
-def parse_reactions(raw_text):
-    lines = raw_text.strip().split('\n')
-    reactions = []
-    reaction_types = {"like", "love", "celebrate", "funny", "support", "insightful"}  # support & insightful sont d'autres réactions possibles sur LinkedIn
-    idx = 0
-    while idx < len(lines):
-        line = lines[idx].strip().lower()
-        if line in reaction_types:
-            reaction = line
-            idx += 1
-            if idx >= len(lines):
-                break
-            # Le nom est sur la ligne suivante, enlever "Voir le profil de" si présent
-            name_line = lines[idx].strip()
-            name = re.sub(r"Voir le profil de .*", "", name_line).strip()
-            idx += 1
-            if idx >= len(lines):
-                break
-            # Position / réseau
-            position = lines[idx].strip()
-            idx += 1
-            if idx >= len(lines):
-                break
-            # Info supplémentaire (souvent une ligne, peut être vide)
-            info = lines[idx].strip()
-            idx += 1
-            reactions.append({
-                "Reaction": reaction.capitalize(),
-                "Name": name,
-                "Position": position,
-                "Info": info
-            })
-        else:
-            idx += 1
-    return reactions
+# Mesures par étape, à la demande (case dans la barre latérale)
+report = instrument_toggle()
+
+# Posts et réactions enregistrés au fil de la saisie dans la base SQLite de la collecte (voir
+# sqlite_store et app_ui)
+store = collection()
+conn = store["conn"]
+
+@st.cache_resource
+def get_export_worker():
+    # Pool d'exports partagé par toutes les sessions (voir export_jobs)
+    return new_worker()
+
+def exact_date(date_relative):
+    # Date absolue figée au moment de l'enregistrement ("" si illisible)
+    resolved = resolve_relative_dates([date_relative])[0]
+    return "" if pd.isna(resolved) else resolved.isoformat(sep=" ", timespec="seconds")
 
 # Fonction pour transformer en fichier Excel
 def to_excel(posts, reactions_by_post):
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df_posts = pd.DataFrame(posts)
-        df_posts.to_excel(writer, index=False, sheet_name='Posts')
-
-        reactions_rows = []
-        for idx, reactions in enumerate(reactions_by_post):
-            for r in reactions:
-                r_copy = r.copy()
-                r_copy["Post n°"] = idx + 1
-                reactions_rows.append(r_copy)
-        df_reactions = pd.DataFrame(reactions_rows)
-        df_reactions.to_excel(writer, index=False, sheet_name='Reactions')
-
-    data = output.getvalue()
-    return data
+    with instrument.stage("DataFrame posts"):
+        df_posts = pd.DataFrame(posts, columns=["Auteur", "Date relative", "Post"])
+    # Toutes les dates relatives du lot sont résolues d'un coup, contre le même instant
+    with instrument.stage("dates exactes"):
+        df_posts.insert(2, "Date exacte", resolve_relative_dates(df_posts["Date relative"]))
+
+    # Réactions déjà en colonnes (numéro de post, type et position codés) : seuls les codes
+    # sont mis bout à bout, aucun dict par réaction
+    with instrument.stage("DataFrame réactions"):
+        df_reactions = reaction_frame(reactions_by_post)
+
+    return xlsx_bytes({'Posts': df_posts, 'Reactions': df_reactions})
 
 # Interface Streamlit
 
@@ -107,6 +57,9 @@ if 'posts_raw' not in st.session_state:
 if 'reactions_raw' not in st.session_state:
     st.session_state.reactions_raw = ["" for _ in range(nb_posts)]
 
+if 'parsed' not in st.session_state:
+    st.session_state.parsed = []
+
 # Ajuster les listes si l'utilisateur modifie nb_posts
 if len(st.session_state.posts_raw) != nb_posts:
     if len(st.session_state.posts_raw) < nb_posts:
@@ -120,6 +73,8 @@ if len(st.session_state.reactions_raw) != nb_posts:
     else:
         st.session_state.reactions_raw = st.session_state.reactions_raw[:nb_posts]
 
+del st.session_state.parsed[nb_posts:]
+
 posts_clean = []
 reactions_clean = []
 
@@ -139,52 +94,85 @@ for i in range(nb_posts):
         key=f"reactions_{i}"
     )
 
-    # Extraction infos post
+    # Extraction infos post et réactions : seul un texte modifié depuis le dernier rerun est
+    # réanalysé, les autres résultats sont repris du cache de session (clé = empreinte du texte)
     raw_post = st.session_state.posts_raw[i].strip()
-    if raw_post:
-        # Extraction auteur = première ligne sans "Lien graphique..."
-        lines = raw_post.split('\n')
-        # Auteur : on récupère la 2e ligne (car la 1ère est souvent "Lien graphique pour ...")
-        author = ""
-        for line in lines:
-            if line.strip() and not line.lower().startswith("lien graphique"):
-                author = line.strip()
-                break
-
-        # Extraction date relative (ex: "Il y a 3 jours • Visible de tous ...") on cherche la 1ère ligne contenant "Il y a"
-        date_relative = None
-        for line in lines:
-            if "il y a" in line.lower():
-                date_relative = line.strip()
-                break
-        date_exacte = parse_relative_date(date_relative) if date_relative else ""
-
-        # Nettoyer le texte du post
-        post_text = clean_post_text(raw_post)
-
-        posts_clean.append({
-            "Auteur": author,
-            "Date relative": date_relative if date_relative else "",
-            "Date exacte": date_exacte,
-            "Post": post_text
-        })
-    else:
-        posts_clean.append({
-            "Auteur": "",
-            "Date relative": "",
-            "Date exacte": "",
-            "Post": ""
-        })
-
-    # Extraction réactions
     raw_reac = st.session_state.reactions_raw[i].strip()
-    reactions_clean.append(parse_reactions(raw_reac) if raw_reac else [])
-
-if st.button("Télécharger Excel"):
-    excel_data = to_excel(posts_clean, reactions_clean)
-    st.download_button(
-        label="Télécharger le fichier Excel",
-        data=excel_data,
-        file_name="linkedin_posts_reactions.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    if i == len(st.session_state.parsed):
+        st.session_state.parsed.append(new_post_slot())
+    slot = st.session_state.parsed[i]
+    changed = refresh_post_slot(slot, raw_post, raw_reac, i + 1)
+
+    # Un post (identifié par l'empreinte de son texte) est enregistré dès qu'il est collé, et
+    # ses réactions remplacées à chaque modification. Un texte retouché remplace la ligne déjà
+    # enregistrée pour cette saisie, sauf si une autre saisie pointe sur la même ligne (même texte) ;
+    # un texte effacé la retire de l'historique, aux mêmes conditions
+    if changed and (raw_post or slot["post_id"] is not None):
+        shared = any(other is not slot and other["post_id"] == slot["post_id"] for other in st.session_state.parsed)
+        with instrument.stage("stockage"):
+            if raw_post:
+                slot["post_id"] = save_post(
+                    conn, slot["post_key"], slot["post"], exact_date(slot["post"]["Date relative"]),
+                    replaces=None if shared else slot["post_id"],
+                )
+                replace_reaction_rows(conn, slot["post_id"], reaction_rows(slot["reactions"]))
+            else:
+                if not shared:
+                    delete_post(conn, slot["post_id"])
+                slot["post_id"] = None
+
+    posts_clean.append(slot["post"])
+    reactions_clean.append(slot["reactions"])
+
+# Le classeur est construit en arrière-plan à la demande ; les mêmes textes collés (mêmes
+# empreintes) reprennent le travail déjà lancé
+export_button(
+    get_export_worker(),
+    ("posts saisis", tuple((slot["post_key"], slot["reac_key"]) for slot in st.session_state.parsed)),
+    lambda progress: to_excel(posts_clean, reactions_clean),
+    label="Télécharger le fichier Excel",
+    prepare_label="Préparer le fichier Excel",
+    file_name="linkedin_posts_reactions.xlsx",
+    mime=XLSX_MIME
+)
+
+# Historique : tout ce qui a été enregistré, relu page par page
+nb_saved_posts = count_rows(conn, POSTS_QUERY)
+if nb_saved_posts:
+    st.header("📚 Historique enregistré")
+    counts = reaction_counts(conn)
+    st.write(f"{nb_saved_posts} posts, {sum(counts.values())} réactions.")
+    with instrument.stage("affichage historique"):
+        st.subheader("Posts")
+        paged_table(conn, POSTS_QUERY, key="posts_page", total=nb_saved_posts)
+        st.subheader("Réactions")
+        reaction_type = st.selectbox(
+            "Type de réaction", [None] + list(counts),
+            format_func=lambda t: f"Toutes ({sum(counts.values())})" if t is None else f"{t} ({counts[t]})"
+        )
+        if reaction_type is None:
+            paged_table(conn, REACTIONS_QUERY, key="reactions_page", total=sum(counts.values()))
+        else:
+            paged_table(conn, REACTIONS_BY_TYPE_QUERY, (reaction_type,), key="reactions_page", total=counts[reaction_type])
+
+    def build_history(progress):
+        # Dans un thread du pool : connexion propre au travail
+        export_conn = connect(store["path"])
+        try:
+            progress(0, total=count_rows(export_conn, POSTS_QUERY) + sum(reaction_counts(export_conn).values()))
+            return stream_xlsx_bytes(lambda: [
+                ("Posts", ["Post n°"] + POST_COLUMNS, counted(iter_query(export_conn, POSTS_QUERY), progress)),
+                ("Reactions", ["Post n°"] + REACTION_COLUMNS, counted(iter_query(export_conn, REACTIONS_QUERY), progress)),
+            ])
+        finally:
+            export_conn.close()
+
+    export_button(
+        get_export_worker(), ("historique", store["id"], data_version(conn, POSTS_SCOPE)), build_history,
+        label="Télécharger tout l'historique (Excel)",
+        prepare_label="Préparer l'export de tout l'historique (Excel)",
+        file_name="linkedin_posts_reactions_historique.xlsx",
+        mime=XLSX_MIME
     )
+
+instrument_panel(report)
@@ -1,90 +1,99 @@
 import streamlit as st
 import pandas as pd
-import re
+import io
+from collections import Counter
+from linkedin_tools import instrument
+from linkedin_tools.reactions import REACTION_TYPES, COLUMNS, iter_lines, iter_reactions, parse_reactions
+from linkedin_tools.exports import lazy_xlsx, lazy_file, XLSX_MIME
+from linkedin_tools.xlsx_stream import write_rows_xlsx
+from app_ui import instrument_toggle, instrument_panel, session_export_path
 
 st.title("Analyseur de réactions LinkedIn")
 
-REACTION_TYPES = ["like", "celebrate", "love", "funny", "insightful"]  # types courants de réactions LinkedIn
+# Mesures par étape, à la demande (case dans la barre latérale)
+report = instrument_toggle()
 
-def parse_reactions(raw_text):
-    lines = [line.strip() for line in raw_text.splitlines() if line.strip() != ""]
-    
-    results = []
-    i = 0
-    while i < len(lines):
-        # 1) type de réaction
-        reaction = lines[i].lower()
-        if reaction not in REACTION_TYPES:
-            i += 1
-            continue
-        i += 1
-        
-        # 2) nom (nettoyage pour enlever "Voir le profil de ...")
-        if i >= len(lines):
-            break
-        name_line = lines[i]
-        name = name_line.split("Voir le profil de")[0].strip()
-        i += 1
-        
-        # 3) position réseau (ex: Out of network · 3e et +)
-        if i >= len(lines):
-            position = ""
-        else:
-            position = lines[i]
-            if not re.search(r"(network|niveau|et|\d+)", position, re.IGNORECASE):
-                position = ""
-            else:
-                i += 1
-        
-        # 4) infos complémentaires (jusqu'à la prochaine réaction ou fin)
-        info_lines = []
-        while i < len(lines) and lines[i].lower() not in REACTION_TYPES:
-            info_lines.append(lines[i])
-            i += 1
-        
-        info = " || ".join(info_lines)
-        
-        results.append({
-            "Réaction": reaction,
-            "Nom": name,
-            "Position réseau": position,
-            "Infos complémentaires": info
-        })
-    
-    return results
+PREVIEW_ROWS = 1000
+
+def show_counts(counts):
+    st.write("### Ventilation du nombre de réactions par type")
+    st.bar_chart(pd.Series(counts, dtype="int64").reindex(REACTION_TYPES, fill_value=0))
 
 with st.form("form_reactions"):
     raw_text = st.text_area("Collez les réactions LinkedIn (texte brut)", height=400)
     submitted = st.form_submit_button("Analyser")
 
 if submitted and raw_text.strip():
-    parsed = parse_reactions(raw_text)
+    with instrument.stage("analyse"):
+        parsed = parse_reactions(raw_text)
     if parsed:
-        df = pd.DataFrame(parsed)
+        with instrument.stage("DataFrame"):
+            df = pd.DataFrame(parsed)
         
-        st.write("### Ventilation du nombre de réactions par type")
-        counts = df["Réaction"].value_counts().reindex(REACTION_TYPES, fill_value=0)
-        st.bar_chart(counts)
+        show_counts(df["Réaction"].value_counts())
         
         st.write("### Tableau détaillé")
-        st.dataframe(df)
-        
-        # Export Excel
-        def to_excel(df):
-            import io
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                df.to_excel(writer, index=False)
-            return output.getvalue()
+        with instrument.stage("affichage"):
+            st.dataframe(df)
         
-        excel_data = to_excel(df)
+        # Export Excel (généré au clic)
         st.download_button(
             label="📥 Télécharger les données en Excel",
-            data=excel_data,
+            data=lazy_xlsx({"Sheet1": df}),
             file_name="linkedin_reactions.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            mime=XLSX_MIME
         )
     else:
         st.warning("Aucune réaction détectée, vérifie le format du texte collé.")
 else:
     st.info("Colle le texte brut des réactions LinkedIn puis clique sur Analyser.")
+
+# Gros exports (posts viraux) : le fichier est lu ligne à ligne et chaque réaction est écrite
+# directement dans le classeur de sortie, sans jamais charger tout le texte ni toutes les lignes
+st.write("### Ou téléverse un fichier texte de réactions")
+uploaded_file = st.file_uploader("📂 Fichier texte (.txt) des réactions", type=["txt"])
+
+if uploaded_file and st.button("Analyser le fichier"):
+    counts = Counter()
+    preview = []
+    progress = st.empty()
+
+    def reaction_rows():
+        uploaded_file.seek(0)
+        stream = io.TextIOWrapper(uploaded_file, encoding="utf-8", errors="replace")
+        try:
+            for record in iter_reactions(iter_lines(stream)):
+                counts[record["Réaction"]] += 1
+                if len(preview) < PREVIEW_ROWS:
+                    preview.append(record)
+                if counts.total() % 10_000 == 0:
+                    progress.write(f"⏳ {counts.total()} réactions analysées…")
+                yield tuple(record.values())
+        finally:
+            # Rend le fichier téléversé sans le fermer (il sert aux reruns suivants)
+            stream.detach()
+
+    # Classeur écrit sur disque et lu seulement au clic, comme l'export de app5
+    out_path = session_export_path("linkedin_reactions.xlsx")
+    # Lecture, analyse et écriture sont entrelacées : une seule étape mesurée
+    with instrument.stage("analyse + export xlsx (fichier)"):
+        write_rows_xlsx(out_path, COLUMNS, reaction_rows())
+    progress.empty()
+
+    if counts:
+        show_counts(counts)
+
+        st.write(f"### Tableau détaillé (aperçu des {len(preview)} premières réactions sur {counts.total()})")
+        with instrument.stage("affichage"):
+            st.dataframe(pd.DataFrame(preview, columns=COLUMNS))
+
+        st.download_button(
+            label="📥 Télécharger toutes les réactions en Excel",
+            data=lazy_file(out_path),
+            file_name="linkedin_reactions.xlsx",
+            mime=XLSX_MIME
+        )
+    else:
+        st.warning("Aucune réaction détectée, vérifie le format du fichier.")
+
+instrument_panel(report)
@@ -1,76 +1,15 @@
 import streamlit as st
 import pandas as pd
-import re
-import io
-
-def extract_name(text):
-    # Cherche un nom répété deux fois côte à côte (ex : Asmir KhanAsmir Khan)
-    lines = [l.strip() for l in text.split('\n') if l.strip()]
-    for i in range(len(lines) - 1):
-        if lines[i] == lines[i+1]:
-            return lines[i]
-    return "Nom inconnu"
-
-def extract_experience_section(text):
-    # Isole la section entre "ExpérienceExpérience" et "FormationFormation"
-    match = re.search(r'ExpérienceExpérience(.*?)FormationFormation', text, re.DOTALL)
-    return match.group(1) if match else ""
-
-def clean_double_text(text):
-    """Supprime les répétitions exactes collées ex: 'InternIntern' → 'Intern'"""
-    half = len(text) // 2
-    return text[:half] if len(text) % 2 == 0 and text[:half] == text[half:] else text
-
-def parse_experiences(section_text):
-    experiences = []
-    blocs = re.split(r'Logo de ', section_text)
-    
-    for bloc in blocs[1:]:  # Skip the first empty split
-        lines = [l.strip() for l in bloc.strip().split('\n') if l.strip()]
-        entreprise = lines[0] if lines else ""
-
-        # Poste : ligne suivante, avec doublon probable
-        poste = clean_double_text(lines[1]) if len(lines) > 1 else ""
-
-        # Contrat + dates : ligne suivante
-        type_contrat = ""
-        date_debut = ""
-        date_fin = ""
-        duree = ""
-        if len(lines) > 2:
-            contrat_line = lines[2]
-            contrat_match = re.search(r'·\s*(Stage|Temps plein|Temps partiel|CDI|CDD)', contrat_line, re.I)
-            type_contrat = contrat_match.group(1) if contrat_match else ""
-
-            # Dates
-            date_match = re.search(r'(\w+\.? \d{4})\s*-\s*(aujourd’hui|\w+\.? \d{4})', contrat_line, re.I)
-            if date_match:
-                date_debut = date_match.group(1)
-                date_fin = date_match.group(2)
-
-            # Durée
-            duree_match = re.search(r'·\s*(\d+.*)$', contrat_line)
-            if duree_match:
-                duree = duree_match.group(1)
-
-        # Description (lignes suivantes commençant par un tiret)
-        description_lines = [l.strip('- ').strip() for l in lines[3:] if l.startswith('-')]
-        description = " | ".join(description_lines) if description_lines else ""
-
-        experiences.append({
-            "Entreprise": entreprise,
-            "Poste": poste,
-            "Type de contrat": type_contrat,
-            "Date début": date_debut,
-            "Date fin": date_fin,
-            "Durée": duree,
-            "Description": description
-        })
-
-    return experiences
+from linkedin_tools import instrument
+from linkedin_tools.profile_page import extract_name, parse_experiences
+from linkedin_tools.sections import index_sections
+from linkedin_tools.dates import add_tenure, total_tenure
+from linkedin_tools.exports import lazy_csv, lazy_xlsx, CSV_MIME, XLSX_MIME
+from app_ui import instrument_toggle, instrument_panel
 
 # STREAMLIT UI
 st.title("🔍 Parser de profil LinkedIn (copié/collé complet)")
+report = instrument_toggle()
 
 text_input = st.text_area("Collez ici tout le texte LinkedIn (Ctrl+A → Ctrl+C → Ctrl+V)", height=400)
 
@@ -81,31 +20,46 @@ if st.button("Analyser le profil"):
         nom = extract_name(text_input)
         st.markdown(f"### 👤 Profil détecté : **{nom}**")
 
-        section_experience = extract_experience_section(text_input)
-        if not section_experience:
+        # Un seul parcours du texte repère toutes les sections (Expérience, Formation, Langues…)
+        with instrument.stage("sections"):
+            sections = index_sections(text_input)
+        if "Expérience" not in sections:
             st.error("Section Expérience introuvable.")
         else:
-            data = parse_experiences(section_experience)
-            df = pd.DataFrame(data)
+            start, end = sections["Expérience"]
+            with instrument.stage("analyse"):
+                data = parse_experiences(text_input[start:end])
+            with instrument.stage("DataFrame"):
+                df = pd.DataFrame(data)
+            tenure = None
+            if data:
+                # Dates normalisées en mois sur toute la colonne : durée de chaque expérience et
+                # ancienneté par entreprise (postes simultanés comptés une fois)
+                with instrument.stage("durées"):
+                    dated = add_tenure(df)
+                    tenure = total_tenure(dated, ["Entreprise"])
+                    df = dated.drop(columns=["Début", "Fin"])
             st.markdown("### 🧾 Expériences extraites :")
-            st.dataframe(df)
+            with instrument.stage("affichage"):
+                st.dataframe(df)
+                if tenure is not None:
+                    st.markdown("### ⏳ Ancienneté par entreprise :")
+                    st.dataframe(tenure, hide_index=True)
 
             # Export CSV
-            csv = df.to_csv(index=False).encode('utf-8')
             st.download_button(
                 label="📥 Télécharger en CSV",
-                data=csv,
+                data=lazy_csv(df),
                 file_name="experiences_linkedin.csv",
-                mime="text/csv"
+                mime=CSV_MIME
             )
 
             # Export XLSX
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                df.to_excel(writer, index=False, sheet_name='Experiences')
             st.download_button(
                 label="📥 Télécharger en XLSX",
-                data=buffer.getvalue(),
+                data=lazy_xlsx({"Experiences": df}),
                 file_name="experiences_linkedin.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                mime=XLSX_MIME
             )
+
+instrument_panel(report)
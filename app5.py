@@ -1,77 +1,132 @@
 import streamlit as st
 import pandas as pd
+from contextlib import closing
+from linkedin_tools import instrument
+from linkedin_tools.tagging import (
+    TAGS_KEYWORDS, SHORT_KEYWORD_LEN, build_automaton, tag_column, tag_chunks,
+    keywords_digest, tag_cache_path, load_tag_cache, save_tag_cache,
+)
+from linkedin_tools.exports import lazy_xlsx, lazy_file, XLSX_MIME
+from linkedin_tools.xlsx_stream import content_digest, iter_xlsx_chunks, iter_cached_chunks, write_rows_xlsx, write_rows_csv
+from app_ui import instrument_toggle, instrument_panel, session_export_path
 
-# ========== TAGS & MOTS-CLÉS ==========
-tags_keywords = {
-    "Management": [
-        "responsable", "chef de projet", "chief of staff", "coordinateur", "bras droit", "directeur", "manager",
-        "program manager", "project manager", "pm", "gestion", "organisational development", "référent pédagogique",
-        "chef·fe de service", "chef de projets", "operations", "product owner", "strategy"
-    ],
-    "Commercial / Vente": [
-        "commercial", "business developer", "développement commercial", "affaires", "vente", "biz dev",
-        "partenariats", "business development", "conseiller", "chargé d'affaires", "responsable commercial",
-        "price manager", "partnership manager", "business manager", "sales"
-    ],
-    "Marketing / Communication": [
-        "communication", "marketing", "fidélisation", "événementiel", "digital", "contenu", "promotion",
-        "responsable communication", "campagne", "publicité"
-    ],
-    "Support / Administration": [
-        "assistant", "administration", "admissions", "gestion", "support", "ressources humaines", "rh",
-        "coordination", "secrétariat", "chargé d'accompagnement", "chargé de mission", "chargé de scolarité",
-        "chargé de service client"
-    ],
-    "Technique / Ingénierie": [
-        "consultant", "ingénieur", "technique", "data", "analyse", "innovation", "digital", "ia", "erp", "r&d",
-        "product owner", "chef de projet digital", "chef de projet data"
-    ],
-    "Création / Design": [
-        "design", "création", "animateur", "créatif", "rédaction", "ux", "ui", "animation"
-    ]
-}
-
-def find_tags(title):
-    if pd.isna(title):
-        return "Autre"
-    title_low = str(title).lower()
-    found_tags = set()
-    for tag, keywords in tags_keywords.items():
-        for kw in keywords:
-            if kw in title_low:
-                found_tags.add(tag)
-    return ", ".join(found_tags) if found_tags else "Autre"
+@st.cache_resource
+def get_automaton(whole_word_max_len):
+    # Compilé une seule fois par processus et par réglage
+    return build_automaton(TAGS_KEYWORDS, whole_word_max_len)
+
+@st.cache_resource
+def get_tag_cache(whole_word_max_len):
+    # Cache intitulé -> tags partagé par les sessions, relu depuis le disque une fois par processus
+    path = tag_cache_path(keywords_digest(TAGS_KEYWORDS, whole_word_max_len))
+    return path, load_tag_cache(path)
+
+@st.cache_data(max_entries=4)
+def load_excel(digest, _uploaded_file):
+    # Indexé par l'empreinte du contenu : un fichier re-téléversé n'est pas redécodé
+    return pd.read_excel(_uploaded_file)
+
+@st.cache_data(max_entries=4)
+def load_preview(digest, _uploaded_file, nb_rows=5):
+    # Ouvrir le classeur, même en read-only, relit toute la table des chaînes partagées : l'aperçu
+    # n'est lu qu'une fois par contenu, et non à chaque rerun (changement de colonne, de format…)
+    with closing(iter_xlsx_chunks(_uploaded_file, chunk_rows=nb_rows)) as chunks:
+        return next(chunks, ([], []))
+
+def show_cache_metrics(nb_rows, nb_distinct, nb_hits):
+    col_rows, col_distinct, col_hits = st.columns(3)
+    col_rows.metric("Lignes", nb_rows)
+    col_distinct.metric("Intitulés distincts", nb_distinct)
+    col_hits.metric("Cache (hits)", f"{nb_hits / nb_distinct:.0%}" if nb_distinct else "—", f"{nb_hits}/{nb_distinct}", delta_color="off")
 
 # ========== STREAMLIT UI ==========
 st.title("🧠 Taggage automatique des intitulés de postes (.xlsx)")
+report = instrument_toggle()
+
+# Au-delà de cette taille, le fichier est traité par blocs sans jamais être chargé en entier
+STREAMING_THRESHOLD = 20 * 1024 * 1024
+PREVIEW_ROWS = 1000
 
 uploaded_file = st.file_uploader("📂 Upload un fichier Excel (.xlsx)", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
-    st.success("✅ Fichier chargé avec succès.")
-    st.write("Aperçu des données :", df.head())
+    streaming = st.checkbox(
+        "🌊 Mode streaming (gros fichiers : lecture et écriture par blocs, mémoire constante)",
+        value=uploaded_file.size > STREAMING_THRESHOLD
+    )
+
+    if streaming:
+        header, first_rows = load_preview(content_digest(uploaded_file), uploaded_file)
+        st.write("Aperçu des données :", pd.DataFrame(first_rows, columns=header))
+        col_options = header
+    else:
+        with instrument.stage("lecture Excel"):
+            df = load_excel(content_digest(uploaded_file), uploaded_file)
+        st.success("✅ Fichier chargé avec succès.")
+        st.write("Aperçu des données :", df.head())
+        col_options = df.columns.tolist()
 
-    col_options = df.columns.tolist()
     selected_col = st.selectbox("📌 Sélectionne la colonne contenant les intitulés de postes :", col_options)
 
+    whole_words = st.checkbox("🔤 Mots-clés courts (pm, ia, rh…) uniquement comme mots entiers", value=True)
+
+    output_format = "xlsx"
+    if streaming:
+        output_format = st.radio("Format de sortie", ["xlsx", "csv"], horizontal=True)
+
     if st.button("🏷️ Générer les tags"):
-        df["Tags"] = df[selected_col].apply(find_tags)
-        st.write("✅ Tags générés :")
-        st.dataframe(df[[selected_col, "Tags"]])
+        whole_word_max_len = SHORT_KEYWORD_LEN if whole_words else 0
+        automaton = get_automaton(whole_word_max_len)
+        cache_path, tag_cache = get_tag_cache(whole_word_max_len)
 
-        # Fichier téléchargeable
-        @st.cache_data
-        def convert_df_to_excel(df):
-            from io import BytesIO
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                df.to_excel(writer, index=False)
-            return output.getvalue()
+        if streaming:
+            col_index = col_options.index(selected_col)
+            seen = {}
+            preview = []
+            progress = st.empty()
+
+            def tagged_rows():
+                nb_rows = 0
+                for _, rows in tag_chunks(iter_cached_chunks(uploaded_file), col_index, automaton, tag_cache, seen):
+                    if len(preview) < PREVIEW_ROWS:
+                        preview.extend((row[col_index], row[-1]) for row in rows[:PREVIEW_ROWS - len(preview)])
+                    nb_rows += len(rows)
+                    progress.write(f"⏳ {nb_rows} lignes traitées…")
+                    yield from rows
+
+            # Le classeur reste sur disque jusqu'au clic : il n'est jamais entièrement en mémoire
+            # pendant le rerun
+            out_path = session_export_path(f"fichier_taggué.{output_format}")
+            write_rows = write_rows_xlsx if output_format == "xlsx" else write_rows_csv
+            with instrument.stage(f"taggage + export {output_format} (fichier)"):
+                nb_rows = write_rows(out_path, col_options + ["Tags"], tagged_rows())
+            output_data = lazy_file(out_path)
+            progress.empty()
 
+            nb_hits = sum(seen.values())
+            # Des intitulés manquaient au cache : ils y ont été ajoutés
+            if nb_hits < len(seen):
+                save_tag_cache(cache_path, tag_cache)
+            show_cache_metrics(nb_rows, len(seen), nb_hits)
+            st.write(f"✅ Tags générés (aperçu des {len(preview)} premières lignes) :")
+            st.dataframe(pd.DataFrame(preview, columns=[selected_col, "Tags"]))
+        else:
+            with instrument.stage("taggage"):
+                df["Tags"], nb_distinct, nb_hits = tag_column(df[selected_col], automaton, tag_cache)
+            if nb_hits < nb_distinct:
+                save_tag_cache(cache_path, tag_cache)
+            show_cache_metrics(len(df), nb_distinct, nb_hits)
+            st.write("✅ Tags générés :")
+            with instrument.stage("affichage"):
+                st.dataframe(df[[selected_col, "Tags"]])
+            output_data = lazy_xlsx({"Sheet1": df})
+
+        # Fichier téléchargeable
         st.download_button(
             label="📥 Télécharger le fichier avec tags",
-            data=convert_df_to_excel(df),
-            file_name="fichier_taggué.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            data=output_data,
+            file_name=f"fichier_taggué.{output_format}",
+            mime="text/csv" if output_format == "csv" else XLSX_MIME
         )
+
+instrument_panel(report)
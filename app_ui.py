@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+import time
+import streamlit as st
+from linkedin_tools import instrument, export_jobs
+from linkedin_tools.sqlite_store import (
+    connect, count_rows, fetch_page, new_collection_id, is_collection_id, collection_path, touch_collection,
+    prune_collections, PAGE_ROWS,
+)
+
+# Éléments d'interface Streamlit communs aux apps, hors du paquet linkedin_tools (qui reste sans
+# Streamlit) : base SQLite de la session, tableaux paginés sur les requêtes de sqlite_store,
+# boutons des exports construits en arrière-plan (export_jobs) et panneau des mesures d'instrument.
+
+# Paramètre d'URL qui porte l'identifiant de la collecte : un rafraîchissement de la page garde
+# l'URL, donc retrouve la même base
+COLLECTION_PARAM = "collecte"
+
+@st.cache_resource(scope="session", on_release=lambda conn: conn.close(), show_spinner=False)
+def session_connection(path):
+    # Ouverte une fois par session et reprise par tous ses reruns, fermée quand la session se
+    # déconnecte. Les exports construits hors du rerun ouvrent leur propre connexion.
+    return connect(path)
+
+@st.cache_resource(scope="session", on_release=lambda tmp_dir: shutil.rmtree(tmp_dir, ignore_errors=True), show_spinner=False)
+def session_export_dir():
+    # Répertoire des exports écrits sur disque par la session, supprimé quand elle se déconnecte
+    return tempfile.mkdtemp(prefix="linkedin-tools-")
+
+def session_export_path(file_name):
+    # Chemin d'un export en flux, lu au clic (exports.lazy_file) : un nouvel export du même nom
+    # remplace le précédent, si bien que la session garde au plus un fichier par export
+    return os.path.join(session_export_dir(), file_name)
+
+def collection():
+    """Collecte de la session : {"id", "path", "conn"}, créée au premier rerun.
+
+    Une base SQLite par collecte (voir sqlite_store.collection_path), lue et écrite par les
+    reruns de la session sur session_connection. À l'ouverture d'une session, les collectes
+    abandonnées depuis plus de COLLECTION_MAX_AGE_DAYS jours sont supprimées.
+    """
+    if "collecte" not in st.session_state:
+        collection_id = st.query_params.get(COLLECTION_PARAM, "")
+        if not is_collection_id(collection_id):
+            collection_id = new_collection_id()
+            st.query_params[COLLECTION_PARAM] = collection_id
+        touch_collection(collection_id)
+        prune_collections(keep=collection_id)
+        st.session_state["collecte"] = {"id": collection_id, "path": collection_path(collection_id)}
+    store = st.session_state["collecte"]
+    return {**store, "conn": session_connection(store["path"])}
+
+def current_page(key, total, page_rows=PAGE_ROWS):
+    # Page affichée (à partir de 0), ramenée dans les bornes avant la création du sélecteur
+    # (la liste a pu rétrécir depuis le dernier rerun)
+    pages = max(1, -(-total // page_rows))
+    if not 1 <= st.session_state.get(key, 0) <= pages:
+        st.session_state[key] = 1
+    return st.session_state[key] - 1
+
+def page_selector(key, total, page_rows=PAGE_ROWS):
+    pages = max(1, -(-total // page_rows))
+    if pages > 1:
+        st.number_input(f"Page (sur {pages}, {total} lignes)", min_value=1, max_value=pages, step=1, key=key)
+
+def paged_table(conn, query, params=(), key="page", page_rows=PAGE_ROWS, total=None):
+    """Tableau Streamlit d'une requête, une page à la fois (sélecteur de page sous le tableau)."""
+    if total is None:
+        total = count_rows(conn, query, params)
+    columns, rows = fetch_page(conn, query, params, current_page(key, total, page_rows), page_rows)
+    st.dataframe([dict(zip(columns, row)) for row in rows], hide_index=True)
+    page_selector(key, total, page_rows)
+    return total
+
+def instrument_toggle(key="instrument_report"):
+    """Case "Mesurer" dans la barre latérale ; à appeler en tête de script.
+
+    Cochée, le rapport de la session (cumulé d'un rerun à l'autre) est activé pour ce rerun et
+    renvoyé ; sinon les mesures sont désactivées et la fonction renvoie None.
+    """
+    if not st.sidebar.checkbox("⏱️ Mesurer les étapes", key=f"{key}_enabled"):
+        instrument.activate(None)
+        return None
+    if key not in st.session_state or st.sidebar.button("Remettre les mesures à zéro"):
+        st.session_state[key] = instrument.new_report()
+    report = st.session_state[key]
+    instrument.activate(report)
+    return report
+
+def instrument_panel(report):
+    # Tableau des mesures et export JSON, à appeler en fin de script (les exports générés au
+    # clic apparaissent au rerun suivant)
+    if report is None:
+        return
+    st.sidebar.markdown("### ⏱️ Mesures")
+    st.sidebar.dataframe(instrument.to_rows(report), hide_index=True)
+    st.sidebar.download_button("📥 Mesures (JSON)", instrument.to_json(report), file_name="mesures.json", mime="application/json")
+
+def export_button(worker, key, build, label, file_name, mime, prepare_label=None, total=None):
+    """Bouton `prepare_label` puis, une fois le fichier construit en arrière-plan, bouton de
+    téléchargement `label`. L'avancement est rafraîchi dans un fragment, sans relancer toute la page."""
+    prepare_label = prepare_label or f"⚙️ Préparer : {label}"
+    job = export_jobs.find_job(worker, key)
+    if not export_jobs.reusable(job):
+        if job is not None:
+            st.error(f"Échec de l'export ({job['future'].exception()}).")
+        placeholder = st.empty()
+        if not placeholder.button(prepare_label if job is None else f"🔁 {prepare_label} (nouvel essai)", key=f"export {label}"):
+            return
+        placeholder.empty()
+        job = export_jobs.submit_job(worker, key, build, total)
+
+    if job["future"].done() and job["future"].exception() is None:
+        st.download_button(label, data=job["future"].result(), file_name=file_name, mime=mime)
+        st.caption(f"Fichier préparé en {job['seconds']:.1f} s.")
+        return
+
+    @st.fragment(run_every=export_jobs.PROGRESS_INTERVAL)
+    def watch():
+        if job["future"].done():
+            # Rerun complet : le bouton de téléchargement (ou l'erreur) remplace la barre d'avancement
+            st.rerun()
+        fraction = export_jobs.job_fraction(job)
+        elapsed = time.monotonic() - job["started"]
+        if fraction is None:
+            st.progress(0.0, text=f"⏳ {label} : en préparation ({elapsed:.0f} s)…")
+        else:
+            st.progress(fraction, text=f"⏳ {label} : {job['rows']}/{job['total']} lignes ({elapsed:.0f} s)…")
+
+    watch()
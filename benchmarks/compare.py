@@ -0,0 +1,376 @@
+"""Chaque parser de linkedin_tools face à sa version d'origine, celle des apps Streamlit avant
+le paquet (legacy), sur les collages synthétiques de linkedin_tools.corpus.
+
+    python -m benchmarks.compare [-n 50000] [--only NOM] [--repeat 3]
+    python -m benchmarks.compare --adversarial [--bytes 1048576] [--only NOM]
+
+À lancer depuis la racine du dépôt. Pour chaque parser et chaque taille : temps de l'ancienne et
+de la nouvelle version sur la même entrée, accélération, et sortie identique ou non. Une sortie
+qui diffère fait échouer la comparaison, sauf si l'écart est voulu (correction de bug) et
+expliqué dans l'entrée : c'est ce contrôle qui garantit que golden.json fige la sortie
+d'origine. --adversarial fait de même sur des collages hostiles d'environ 1 Mo.
+"""
+import argparse
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+from linkedin_tools import bench, corpus, dates, header, reactions, posts, org_people, profile_page, experiences, tagging, sqlite_store
+from linkedin_tools.sections import index_sections
+
+from . import legacy
+
+COMPARE_SIZES = [1000, 50_000]
+
+def run_legacy_experiences(pastes):
+    rows = []
+    for text in pastes:
+        rows += legacy.app_4_2_parse_experiences(legacy.app_4_2_extract_full_experience_section(text))
+    return rows
+
+def run_legacy_full_profiles(pastes):
+    # Ancien app-4-2, pour chaque collage : nom (répété dans la section, sinon première ligne qui
+    # ressemble à un nom) et expériences, rien sans section Expérience
+    profiles = []
+    for text in pastes:
+        section = legacy.app_4_2_extract_full_experience_section(text)
+        if not section:
+            profiles.append(None)
+            continue
+        name = legacy.app_4_2_extract_name_from_experience(section)
+        if name == "Nom inconnu":
+            name = legacy.app_4_2_extract_name_general(text)
+        profiles.append((name, legacy.app_4_2_parse_experiences(section)))
+    return profiles
+
+def run_legacy_profile_pages(pastes):
+    # Ancien app4, pour chaque collage : nom et expériences de la section
+    return [
+        (legacy.app4_extract_name(text), legacy.app4_parse_experiences(legacy.app4_extract_experience_section(text)))
+        for text in pastes
+    ]
+
+def run_profile_pages(pastes):
+    profiles = []
+    for text in pastes:
+        sections = index_sections(text)
+        rows = profile_page.parse_experiences(text[slice(*sections["Expérience"])]) if "Expérience" in sections else []
+        profiles.append((profile_page.extract_name(text), rows))
+    return profiles
+
+def without_country(rows):
+    # Le pays vient désormais du gazetteer, plus riche que la liste de 22 pays d'origine : il est
+    # comparé à part, le reste de l'en-tête doit être identique
+    return [{column: value for column, value in row.items() if column != "Pays"} for row in rows]
+
+def tag_column_input(n, seed):
+    # Colonne d'intitulés et automate sans mots entiers (l'ancien find_tags cherchait des
+    # sous-chaînes : même résultat attendu), compilé hors chronométrage
+    import pandas as pd
+
+    automaton = tagging.build_automaton(tagging.TAGS_KEYWORDS, whole_word_max_len=0)
+    return pd.Series(list(corpus.iter_job_title_cells(n, seed, distinct=max(1, n // 20))), dtype=object), automaton
+
+def sorted_tags(values):
+    # L'ancien find_tags joignait un set : ordre des tags variable d'un processus à l'autre
+    return [", ".join(sorted(value.split(", "))) for value in values]
+
+def profile_table_input(n, seed):
+    # n en-têtes analysés, en liste (l'ancien st.session_state["profiles"]) et dans une base en
+    # mémoire (la collecte SQLite d'app.py), remplie hors chronométrage
+    profiles = [header.parse_one_profile(text) for text in corpus.iter_header_pastes(n, seed)]
+    conn = sqlite_store.connect(":memory:")
+    for profile in profiles:
+        sqlite_store.add_profile(conn, sqlite_store.HEADER_SOURCE, profile)
+    return profiles, conn
+
+def run_legacy_profile_table(data):
+    # Ancien app.py, à chaque rerun : DataFrame reconstruit depuis toute la liste (puis envoyé en
+    # entier au navigateur, non compté ici) ; on garde le total et la première page
+    import pandas as pd
+
+    frame = pd.DataFrame(data[0])
+    return len(frame), frame.head(sqlite_store.PAGE_ROWS).to_dict("records")
+
+def run_profile_table(data):
+    # app.py : total et première page lus dans la base (voir app_ui.paged_table)
+    conn = data[1]
+    params = (sqlite_store.HEADER_SOURCE,)
+    total = sqlite_store.count_rows(conn, sqlite_store.PROFILES_QUERY, params)
+    columns, rows = sqlite_store.fetch_page(conn, sqlite_store.PROFILES_QUERY, params, 0)
+    return total, [{c: v for c, v in zip(columns, row) if c != "N°"} for row in rows]
+
+# Saisies d'app2-2 : le nombre maximal de posts du formulaire, n réactions réparties entre eux
+FORM_POSTS = 50
+
+def edited_form_input(n, seed):
+    # Les FORM_POSTS saisies analysées au rerun précédent (cases de posts.new_post_slot), puis les
+    # mêmes textes dont un seul post a été retouché
+    entries = list(corpus.iter_post_entries(FORM_POSTS, max(1, n // FORM_POSTS), seed))
+    slots = [posts.new_post_slot() for _ in entries]
+    for number, (slot, (raw_post, raw_reac)) in enumerate(zip(slots, entries), 1):
+        posts.refresh_post_slot(slot, raw_post, raw_reac, number)
+    # Au rerun suivant les textes reviennent du navigateur : mêmes contenus, nouveaux objets
+    entries = [tuple(text.encode("utf-8").decode("utf-8") for text in entry) for entry in entries]
+    edited = FORM_POSTS // 2
+    entries[edited] = (entries[edited][0] + "\nModifié", entries[edited][1])
+    return entries, slots
+
+def run_legacy_form(data):
+    # Ancien app2-2 : chaque rerun réanalyse les FORM_POSTS saisies
+    return [legacy.app2_2_parse_entry(raw_post, raw_reac) for raw_post, raw_reac in data[0]]
+
+def run_form(data):
+    # app2-2 : cases du rerun précédent (copiées, pour que chaque répétition trouve le même état)
+    # mises à jour par posts.refresh_post_slot
+    slots = [dict(slot) for slot in data[1]]
+    for number, (slot, (raw_post, raw_reac)) in enumerate(zip(slots, data[0]), 1):
+        posts.refresh_post_slot(slot, raw_post, raw_reac, number)
+    return slots
+
+def legacy_form_rows(parsed):
+    # Sans la date exacte, calculée par l'ancien code contre l'heure courante
+    return [
+        ({k: v for k, v in post.items() if k != "Date exacte"}, [list(r.values()) for r in reactions])
+        for post, reactions in parsed
+    ]
+
+def form_rows(slots):
+    return [(slot["post"], [list(row) for row in posts.reaction_rows(slot["reactions"])]) for slot in slots]
+
+# Sorties ramenées à une même forme avant comparaison, hors chronométrage : nom -> (forme de
+# l'ancienne sortie, forme de la nouvelle)
+COMPARISON_OUTPUTS = {
+    "posts.edit_one_post": (legacy_form_rows, form_rows),
+    "dates.resolve_relative_dates": (list, bench.date_strings),
+}
+
+def legacy_relative_date(text, now):
+    # legacy.app2_2_parse_relative_date, corrigé pour être comparable : le motif "Il y a"
+    # cherché dans le texte mis en minuscules ne trouvait jamais rien (toutes les dates exactes
+    # restaient vides), l'instant de référence est fixé et une durée hors de portée de
+    # timedelta donne None au lieu de lever OverflowError
+    match = re.search(r"il y a (\d+)\s*(jour|jours|h|heure|heures|semaine|semaines|mois)", text.lower())
+    if not match:
+        return None
+    value = int(match.group(1))
+    unit = match.group(2)
+
+    try:
+        if unit.startswith('jour'):
+            delta = timedelta(days=value)
+        elif unit.startswith('h'):
+            delta = timedelta(hours=value)
+        elif unit.startswith('semaine'):
+            delta = timedelta(weeks=value)
+        else:
+            delta = timedelta(days=30*value)  # approximation
+        date = now - delta
+    except OverflowError:
+        return None
+    return date.strftime("%Y-%m-%d %H:%M:%S")
+
+def run_legacy_relative_dates(texts):
+    # Ancien app2-2 : une date analysée ligne par ligne
+    now = datetime.strptime(bench.GOLDEN_NOW, "%Y-%m-%d %H:%M")
+    return [legacy_relative_date(text, now) for text in texts]
+
+# Nom -> (construction de l'entrée pour n enregistrements, ancienne analyse, nouvelle analyse,
+# None si les sorties doivent être identiques, sinon l'explication de l'écart)
+COMPARISONS = {
+    "header.parse_one_profile": (
+        lambda n, seed: list(corpus.iter_header_pastes(n, seed)),
+        lambda pastes: without_country([legacy.app_parse_one_profile(p) for p in pastes]),
+        lambda pastes: without_country([header.parse_one_profile(p) for p in pastes]),
+        None,
+    ),
+    "header.extract_country": (
+        lambda n, seed: list(corpus.iter_locations(n, seed)),
+        lambda locations: [legacy.app_extract_country(location) for location in locations],
+        lambda locations: [header.extract_country(location) for location in locations],
+        "noms anglais, villes, régions et casse libre reconnus (avant : 22 noms de pays français seulement)",
+    ),
+    "sqlite_store.profile_page": (
+        profile_table_input,
+        run_legacy_profile_table,
+        run_profile_table,
+        None,
+    ),
+    "posts.edit_one_post": (
+        edited_form_input,
+        run_legacy_form,
+        run_form,
+        None,
+    ),
+    "dates.resolve_relative_dates": (
+        lambda n, seed: list(corpus.iter_relative_dates(n, seed)),
+        run_legacy_relative_dates,
+        lambda texts: dates.resolve_relative_dates(texts, now=bench.GOLDEN_NOW),
+        (
+            "formats courts et anglais (« 3 j », « 2 sem », « 5h », « 3d », « 2mo ») et années "
+            "lus (avant : seulement « Il y a N jours/h/semaines/mois »)"
+        ),
+    ),
+    "reactions.parse_reactions": (
+        corpus.reactions_paste,
+        legacy.app2_parse_reactions,
+        reactions.parse_reactions,
+        None,
+    ),
+    "tagging.tag_column": (
+        tag_column_input,
+        lambda data: sorted_tags(data[0].apply(legacy.app5_find_tags)),
+        lambda data: sorted_tags(tagging.tag_column(data[0], data[1], {})[0]),
+        None,
+    ),
+    # Intitulés tous distincts : l'automate seul face aux 80 recherches de sous-chaînes, sans le
+    # gain de la déduplication
+    "tagging.find_tags": (
+        lambda n, seed: (list(corpus.iter_job_titles(n, seed)), tagging.build_automaton(tagging.TAGS_KEYWORDS, whole_word_max_len=0)),
+        lambda data: sorted_tags([legacy.app5_find_tags(title) for title in data[0]]),
+        lambda data: sorted_tags([tagging.find_tags(title, data[1]) for title in data[0]]),
+        None,
+    ),
+    "org_people.extract_profiles": (
+        corpus.org_page_paste,
+        legacy.app3_extract_profiles,
+        org_people.extract_profiles,
+        None,
+    ),
+    "profile_page.parse_experiences": (
+        lambda n, seed: list(corpus.iter_full_profile_pastes(n, seed)),
+        run_legacy_profile_pages,
+        run_profile_pages,
+        None,
+    ),
+    "experiences.parse_full_profile": (
+        lambda n, seed: list(corpus.iter_full_profile_pastes(n, seed)),
+        run_legacy_full_profiles,
+        lambda pastes: [experiences.parse_full_profile(text) for text in pastes],
+        None,
+    ),
+}
+
+# ========== ENTRÉES HOSTILES ==========
+# Collages jusqu'à 1 Mo construits pour le pire cas des anciens motifs (ancre absente,
+# longues plages de caractères que le motif accepte) : le nouveau parser doit rester linéaire,
+# sous ADVERSARIAL_MAX_SECONDS_PER_MB. L'ancien n'est lancé que jusqu'à la taille indiquée dans
+# son entrée (au-delà, les anciens motifs quadratiques se comptent en minutes).
+ADVERSARIAL_SIZES = [16 * 1024, 256 * 1024, 1024 * 1024]
+ADVERSARIAL_MAX_SECONDS_PER_MB = 1.0
+
+# Nom -> (construction de l'entrée pour une taille en caractères, ancienne analyse, nouvelle
+# analyse, écart de sortie comme dans COMPARISONS, taille maximale pour l'ancienne analyse)
+ADVERSARIAL = {
+    "header.extract_location": (
+        corpus.anchorless_location_paste,
+        legacy.app_extract_location,
+        header.extract_location,
+        None,
+        16 * 1024,
+    ),
+    "header.extract_followers": (
+        corpus.anchorless_followers_paste,
+        legacy.app_extract_followers,
+        header.extract_followers,
+        None,
+        16 * 1024,
+    ),
+    "reactions.no_reaction_types": (
+        corpus.reactionless_paste,
+        legacy.app2_parse_reactions,
+        reactions.parse_reactions,
+        None,
+        1024 * 1024,
+    ),
+    "org_people.long_capitalized_lines": (
+        corpus.long_capitalized_lines_paste,
+        legacy.app3_extract_profiles,
+        org_people.extract_profiles,
+        None,
+        1024 * 1024,
+    ),
+    "experiences.unclosed_sections": (
+        corpus.unclosed_sections_paste,
+        lambda text: run_legacy_experiences([text]),
+        lambda text: bench.run_experiences([text]),
+        "sans « FormationFormation » l'ancien parser ne trouve aucune section",
+        256 * 1024,
+    ),
+}
+
+def best_time(run, data, repeat):
+    best = float("inf")
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = run(data)
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+def compare(registry, name, size, seed=0, repeat=3, run_old=True):
+    # Temps de l'ancienne et de la nouvelle analyse (None si l'ancienne n'est pas lancée) et
+    # statut de la sortie : "identique", "DIFFÉRENT", "voulu : …" ou "—"
+    make_input, old, new, expected_gap = registry[name][:4]
+    data = make_input(size, seed)
+    new_seconds, new_output = best_time(new, data, repeat)
+    if not run_old:
+        return None, new_seconds, "—"
+    old_seconds, old_output = best_time(old, data, repeat)
+    old_form, new_form = COMPARISON_OUTPUTS.get(name, (None, None))
+    if old_form:
+        old_output, new_output = old_form(old_output), new_form(new_output)
+    if bench.output_digest(old_output) == bench.output_digest(new_output):
+        status = "identique"
+    else:
+        status = "DIFFÉRENT" if expected_gap is None else f"voulu : {expected_gap}"
+    return old_seconds, new_seconds, status
+
+def print_comparison(name, size, old_seconds, new_seconds, status):
+    old_text = f"{old_seconds:>9.3f}" if old_seconds is not None else f"{'—':>9}"
+    speedup = f"{old_seconds / new_seconds:>8.1f}x" if old_seconds is not None and new_seconds else f"{'—':>9}"
+    rate = f"{size / new_seconds:>11.0f}" if new_seconds else f"{'—':>11}"
+    print(f"{name:<34} {size:>9} {old_text} {new_seconds:>9.3f} {speedup} {rate}  {status}")
+
+def run_comparisons(names, sizes, seed, repeat):
+    failed = False
+    print(f"{'ancien / nouveau':<34} {'n':>9} {'ancien s':>9} {'nouveau s':>9} {'gain':>9} {'nouveau /s':>11}  sortie")
+    for size in sizes:
+        for name in names:
+            result = compare(COMPARISONS, name, size, seed, repeat)
+            failed |= result[2] == "DIFFÉRENT"
+            print_comparison(name, size, *result)
+    return 1 if failed else 0
+
+def run_adversarial(names, sizes, seed, repeat):
+    failed = False
+    print(f"{'entrée hostile':<34} {'octets':>9} {'ancien s':>9} {'nouveau s':>9} {'gain':>9} {'nouveau /s':>11}  sortie")
+    for size in sizes:
+        for name in names:
+            result = compare(ADVERSARIAL, name, size, seed, repeat, run_old=size <= ADVERSARIAL[name][4])
+            slow = result[1] > ADVERSARIAL_MAX_SECONDS_PER_MB * max(1.0, size / (1024 * 1024))
+            failed |= slow or result[2] == "DIFFÉRENT"
+            print_comparison(name, size, *result)
+            if slow:
+                print(f"{'':<34} TROP LENT : plus de {ADVERSARIAL_MAX_SECONDS_PER_MB} s par Mo")
+    return 1 if failed else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description="Parsers de linkedin_tools face à leur version d'origine (temps et sortie).")
+    parser.add_argument("-n", "--records", type=int, action="append", help=f"nombre d'enregistrements (répétable, défaut : {COMPARE_SIZES})")
+    parser.add_argument("--bytes", type=int, action="append", help=f"taille des entrées hostiles en caractères (répétable, défaut : {ADVERSARIAL_SIZES})")
+    parser.add_argument("--only", action="append", choices=sorted({*COMPARISONS, *ADVERSARIAL}), help="ne lancer que cette comparaison (répétable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="passages chronométrés, le meilleur est gardé (défaut : 3)")
+    parser.add_argument("--adversarial", action="store_true", help="entrées hostiles d'environ 1 Mo au lieu du corpus")
+    args = parser.parse_args(argv)
+
+    if args.adversarial:
+        names = [name for name in args.only or ADVERSARIAL if name in ADVERSARIAL]
+        return run_adversarial(names, args.bytes or ADVERSARIAL_SIZES, args.seed, args.repeat)
+    names = [name for name in args.only or COMPARISONS if name in COMPARISONS]
+    return run_comparisons(names, args.records or COMPARE_SIZES, args.seed, args.repeat)
+
+if __name__ == "__main__":
+    sys.exit(main())
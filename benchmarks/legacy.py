@@ -0,0 +1,530 @@
+import re
+from datetime import datetime, timedelta
+
+# Versions d'origine des parsers, telles qu'elles étaient dans les apps Streamlit avant le
+# paquet linkedin_tools (Streamlit en moins). Elles ne servent qu'aux comparaisons ancien/nouveau
+# de benchmarks.compare : ne pas les corriger ni les importer ailleurs, une comparaison ne vaut
+# que contre le code réellement remplacé.
+
+# ========== app.py : en-tête de profil ==========
+def app_extract_name(text):
+    match = re.search(r"^([A-ZÀ-Ÿ][a-zà-ÿ]+\s+[A-ZÀ-Ÿ][a-zà-ÿ]+)", text)
+    return match.group(1).strip() if match else ""
+
+def app_extract_relation(text):
+    match = re.search(r"(relation de \d+[e|ᵉ])", text, re.IGNORECASE)
+    return match.group(1).strip() if match else ""
+
+def app_extract_title(text):
+    relation_pattern = r"(relation de \d+[e|ᵉ])"
+    title_match = None
+
+    relation_search = re.search(relation_pattern, text, re.IGNORECASE)
+    if relation_search:
+        start_pos = relation_search.end()
+        substring = text[start_pos:].strip()
+
+        coord_pos = substring.find("Coordonnées")
+        if coord_pos != -1:
+            substring = substring[:coord_pos].strip()
+
+        if "|" in substring:
+            substring = substring.rsplit("|", 1)[0].strip()
+
+        substring = re.sub(r"^niveau \d+[e|ᵉ]\s*", "", substring, flags=re.IGNORECASE)
+
+        title_match = substring.strip()
+    else:
+        title_match = ""
+
+    return title_match
+
+def app_extract_location(text):
+    relation_pattern = r"(relation de \d+[e|ᵉ])"
+    relation_search = re.search(relation_pattern, text, re.IGNORECASE)
+
+    if relation_search:
+        start_pos = relation_search.end()
+        substring = text[start_pos:].strip()
+
+        coord_pos = substring.find("Coordonnées")
+        if coord_pos != -1:
+            before_coord = substring[:coord_pos].strip()
+
+            if "|" in before_coord:
+                loc_candidate = before_coord.rsplit("|", 1)[-1].strip()
+                if len(loc_candidate.split()) <= 6:
+                    return loc_candidate
+
+            parts = re.split(r"\s{2,}", before_coord)
+            if len(parts) > 1:
+                loc_candidate = parts[-1].strip()
+                if len(loc_candidate.split()) <= 6:
+                    return loc_candidate
+
+            if len(before_coord.split()) <= 6:
+                return before_coord
+
+    loc_match = re.search(r"([A-Za-zÀ-ÿ\s,.\-]{2,})Coordonnées", text)
+    if loc_match:
+        return loc_match.group(1).strip()
+
+    return ""
+
+def app_extract_country(text):
+    countries = [
+        "Finlande", "France", "États-Unis", "Japon", "Allemagne", "Canada",
+        "Royaume-Uni", "Espagne", "Italie", "Belgique", "Suisse", "Suède",
+        "Norvège", "Danemark", "Pays-Bas", "Australie", "Chine", "Inde",
+        "Brésil", "Mexique", "Russie", "Turquie"
+    ]
+    for country in countries:
+        if country.lower() in text.lower():
+            return country
+    return ""
+
+def app_extract_link(text):
+    match = re.search(r"(https?://[^\s]+)", text)
+    return match.group(1).strip() if match else ""
+
+def app_extract_followers(text):
+    match = re.search(r"(\d[\d\s]* abonnés)", text)
+    return match.group(1).strip() if match else ""
+
+def app_extract_connections(text):
+    match = re.search(r"(Plus de \d+ relations)", text)
+    return match.group(1).strip() if match else ""
+
+def app_parse_one_profile(text):
+    clean_text = text.replace("\n", " ").strip()
+    location = app_extract_location(clean_text)
+    return {
+        "Nom": app_extract_name(clean_text),
+        "Relation": app_extract_relation(clean_text),
+        "Titre": app_extract_title(clean_text),
+        "Localisation": location,
+        "Pays": app_extract_country(location),
+        "Lien": app_extract_link(clean_text),
+        "Abonnés": app_extract_followers(clean_text),
+        "Relations": app_extract_connections(clean_text),
+    }
+
+# ========== app2.py : réactions brutes ==========
+APP2_REACTION_TYPES = ["like", "celebrate", "love", "funny", "insightful"]  # types courants de réactions LinkedIn
+
+def app2_parse_reactions(raw_text):
+    lines = [line.strip() for line in raw_text.splitlines() if line.strip() != ""]
+
+    results = []
+    i = 0
+    while i < len(lines):
+        # 1) type de réaction
+        reaction = lines[i].lower()
+        if reaction not in APP2_REACTION_TYPES:
+            i += 1
+            continue
+        i += 1
+
+        # 2) nom (nettoyage pour enlever "Voir le profil de ...")
+        if i >= len(lines):
+            break
+        name_line = lines[i]
+        name = name_line.split("Voir le profil de")[0].strip()
+        i += 1
+
+        # 3) position réseau (ex: Out of network · 3e et +)
+        if i >= len(lines):
+            position = ""
+        else:
+            position = lines[i]
+            if not re.search(r"(network|niveau|et|\d+)", position, re.IGNORECASE):
+                position = ""
+            else:
+                i += 1
+
+        # 4) infos complémentaires (jusqu'à la prochaine réaction ou fin)
+        info_lines = []
+        while i < len(lines) and lines[i].lower() not in APP2_REACTION_TYPES:
+            info_lines.append(lines[i])
+            i += 1
+
+        info = " || ".join(info_lines)
+
+        results.append({
+            "Réaction": reaction,
+            "Nom": name,
+            "Position réseau": position,
+            "Infos complémentaires": info
+        })
+
+    return results
+
+# ========== app2-2.py : posts et réactions saisis ==========
+def app2_2_parse_relative_date(text):
+    # Exemples de formats possibles en français
+    # "Il y a 3 jours", "Il y a 5 h", "Il y a 1 semaine", "Il y a 2 mois"
+    match = re.search(r"Il y a (\d+)\s*(jour|jours|h|heure|heures|semaine|semaines|mois)", text.lower())
+    if not match:
+        return None
+    value = int(match.group(1))
+    unit = match.group(2)
+    now = datetime.now()
+
+    if unit.startswith('jour'):
+        delta = timedelta(days=value)
+    elif unit.startswith('h'):
+        delta = timedelta(hours=value)
+    elif unit.startswith('heure'):
+        delta = timedelta(hours=value)
+    elif unit.startswith('semaine'):
+        delta = timedelta(weeks=value)
+    elif unit.startswith('mois'):
+        delta = timedelta(days=30*value)  # approximation
+    else:
+        return None
+
+    date = now - delta
+    return date.strftime("%Y-%m-%d %H:%M:%S")
+
+def app2_2_clean_post_text(text):
+    # Supprime la partie "Il y a ... • Visible de tous sur LinkedIn et en dehors"
+    text = re.sub(r"^Il y a [^•]+\s*•\s*Visible de tous sur LinkedIn et en dehors\s*", "", text, flags=re.I)
+    return text.strip()
+
+def app2_2_parse_reactions(raw_text):
+    lines = raw_text.strip().split('\n')
+    reactions = []
+    reaction_types = {"like", "love", "celebrate", "funny", "support", "insightful"}  # support & insightful sont d'autres réactions possibles sur LinkedIn
+    idx = 0
+    while idx < len(lines):
+        line = lines[idx].strip().lower()
+        if line in reaction_types:
+            reaction = line
+            idx += 1
+            if idx >= len(lines):
+                break
+            # Le nom est sur la ligne suivante, enlever "Voir le profil de" si présent
+            name_line = lines[idx].strip()
+            name = re.sub(r"Voir le profil de .*", "", name_line).strip()
+            idx += 1
+            if idx >= len(lines):
+                break
+            # Position / réseau
+            position = lines[idx].strip()
+            idx += 1
+            if idx >= len(lines):
+                break
+            # Info supplémentaire (souvent une ligne, peut être vide)
+            info = lines[idx].strip()
+            idx += 1
+            reactions.append({
+                "Reaction": reaction.capitalize(),
+                "Name": name,
+                "Position": position,
+                "Info": info
+            })
+        else:
+            idx += 1
+    return reactions
+
+def app2_2_parse_entry(raw_post, raw_reac):
+    # Corps de la boucle d'origine, pour une saisie : refait pour chaque post à chaque rerun
+    raw_post = raw_post.strip()
+    if raw_post:
+        # Extraction auteur = première ligne sans "Lien graphique..."
+        lines = raw_post.split('\n')
+        # Auteur : on récupère la 2e ligne (car la 1ère est souvent "Lien graphique pour ...")
+        author = ""
+        for line in lines:
+            if line.strip() and not line.lower().startswith("lien graphique"):
+                author = line.strip()
+                break
+
+        # Extraction date relative (ex: "Il y a 3 jours • Visible de tous ...") on cherche la 1ère ligne contenant "Il y a"
+        date_relative = None
+        for line in lines:
+            if "il y a" in line.lower():
+                date_relative = line.strip()
+                break
+        date_exacte = app2_2_parse_relative_date(date_relative) if date_relative else ""
+
+        # Nettoyer le texte du post
+        post_text = app2_2_clean_post_text(raw_post)
+
+        post = {
+            "Auteur": author,
+            "Date relative": date_relative if date_relative else "",
+            "Date exacte": date_exacte,
+            "Post": post_text
+        }
+    else:
+        post = {
+            "Auteur": "",
+            "Date relative": "",
+            "Date exacte": "",
+            "Post": ""
+        }
+
+    # Extraction réactions
+    raw_reac = raw_reac.strip()
+    return post, app2_2_parse_reactions(raw_reac) if raw_reac else []
+
+# ========== app3.py : page "Personnes" d'une organisation ==========
+def app3_is_name(line):
+    # Détecte si une ligne ressemble à un nom complet (2+ mots commençant par majuscule)
+    # Exemple simple : "Ieva Gaigala"
+    return bool(re.match(r"^[A-ZÀ-Ÿ][a-zà-ÿA-ZÀ-Ÿ\-']+( [A-ZÀ-Ÿ][a-zà-ÿA-ZÀ-Ÿ\-']+)+$", line.strip()))
+
+def app3_extract_profiles(text):
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    profiles = []
+    i = 0
+    n = len(lines)
+    while i < n:
+        line = lines[i]
+
+        # Ignore explicit "Utilisateur LinkedIn" profils
+        if line == "Utilisateur LinkedIn":
+            i += 1
+            # On traite "Utilisateur LinkedIn" comme nom de profil (tu peux changer ici si besoin)
+            name = line
+            desc_lines = []
+            # Collecte jusqu'au prochain nom ou fin
+            i_start = i
+            while i < n and not app3_is_name(lines[i]):
+                desc_lines.append(lines[i])
+                i += 1
+            profiles.append({"Profil": name, "Description": " | ".join(desc_lines)})
+            continue
+
+        if app3_is_name(line):
+            name = line
+
+            # Si ligne suivante est la même => doublon immédiat, on saute la suivante
+            if i + 1 < n and lines[i + 1] == line:
+                i += 2
+            else:
+                i += 1
+
+            desc_lines = []
+            while i < n:
+                if app3_is_name(lines[i]) or lines[i] == "Utilisateur LinkedIn":
+                    break
+                desc_lines.append(lines[i])
+                i += 1
+
+            description = " | ".join(desc_lines)
+            profiles.append({"Profil": name, "Description": description})
+        else:
+            i += 1
+    return profiles
+
+# ========== app5.py : tags des intitulés de postes ==========
+# (mêmes mots-clés que tagging.TAGS_KEYWORDS)
+app5_tags_keywords = {
+    "Management": [
+        "responsable", "chef de projet", "chief of staff", "coordinateur", "bras droit", "directeur", "manager",
+        "program manager", "project manager", "pm", "gestion", "organisational development", "référent pédagogique",
+        "chef·fe de service", "chef de projets", "operations", "product owner", "strategy"
+    ],
+    "Commercial / Vente": [
+        "commercial", "business developer", "développement commercial", "affaires", "vente", "biz dev",
+        "partenariats", "business development", "conseiller", "chargé d'affaires", "responsable commercial",
+        "price manager", "partnership manager", "business manager", "sales"
+    ],
+    "Marketing / Communication": [
+        "communication", "marketing", "fidélisation", "événementiel", "digital", "contenu", "promotion",
+        "responsable communication", "campagne", "publicité"
+    ],
+    "Support / Administration": [
+        "assistant", "administration", "admissions", "gestion", "support", "ressources humaines", "rh",
+        "coordination", "secrétariat", "chargé d'accompagnement", "chargé de mission", "chargé de scolarité",
+        "chargé de service client"
+    ],
+    "Technique / Ingénierie": [
+        "consultant", "ingénieur", "technique", "data", "analyse", "innovation", "digital", "ia", "erp", "r&d",
+        "product owner", "chef de projet digital", "chef de projet data"
+    ],
+    "Création / Design": [
+        "design", "création", "animateur", "créatif", "rédaction", "ux", "ui", "animation"
+    ]
+}
+
+def app5_find_tags(title):
+    # pandas importé ici plutôt qu'en tête du module, comme dans le reste du paquet
+    import pandas as pd
+
+    if pd.isna(title):
+        return "Autre"
+    title_low = str(title).lower()
+    found_tags = set()
+    for tag, keywords in app5_tags_keywords.items():
+        for kw in keywords:
+            if kw in title_low:
+                found_tags.add(tag)
+    return ", ".join(found_tags) if found_tags else "Autre"
+
+# ========== app4.py : expériences détaillées d'un profil complet ==========
+def app4_extract_name(text):
+    # Cherche un nom répété deux fois côte à côte (ex : Asmir KhanAsmir Khan)
+    lines = [l.strip() for l in text.split('\n') if l.strip()]
+    for i in range(len(lines) - 1):
+        if lines[i] == lines[i+1]:
+            return lines[i]
+    return "Nom inconnu"
+
+def app4_extract_experience_section(text):
+    # Isole la section entre "ExpérienceExpérience" et "FormationFormation"
+    match = re.search(r'ExpérienceExpérience(.*?)FormationFormation', text, re.DOTALL)
+    return match.group(1) if match else ""
+
+def app4_clean_double_text(text):
+    """Supprime les répétitions exactes collées ex: 'InternIntern' → 'Intern'"""
+    half = len(text) // 2
+    return text[:half] if len(text) % 2 == 0 and text[:half] == text[half:] else text
+
+def app4_parse_experiences(section_text):
+    experiences = []
+    blocs = re.split(r'Logo de ', section_text)
+    
+    for bloc in blocs[1:]:  # Skip the first empty split
+        lines = [l.strip() for l in bloc.strip().split('\n') if l.strip()]
+        entreprise = lines[0] if lines else ""
+
+        # Poste : ligne suivante, avec doublon probable
+        poste = app4_clean_double_text(lines[1]) if len(lines) > 1 else ""
+
+        # Contrat + dates : ligne suivante
+        type_contrat = ""
+        date_debut = ""
+        date_fin = ""
+        duree = ""
+        if len(lines) > 2:
+            contrat_line = lines[2]
+            contrat_match = re.search(r'·\s*(Stage|Temps plein|Temps partiel|CDI|CDD)', contrat_line, re.I)
+            type_contrat = contrat_match.group(1) if contrat_match else ""
+
+            # Dates
+            date_match = re.search(r'(\w+\.? \d{4})\s*-\s*(aujourd’hui|\w+\.? \d{4})', contrat_line, re.I)
+            if date_match:
+                date_debut = date_match.group(1)
+                date_fin = date_match.group(2)
+
+            # Durée
+            duree_match = re.search(r'·\s*(\d+.*)$', contrat_line)
+            if duree_match:
+                duree = duree_match.group(1)
+
+        # Description (lignes suivantes commençant par un tiret)
+        description_lines = [l.strip('- ').strip() for l in lines[3:] if l.startswith('-')]
+        description = " | ".join(description_lines) if description_lines else ""
+
+        experiences.append({
+            "Entreprise": entreprise,
+            "Poste": poste,
+            "Type de contrat": type_contrat,
+            "Date début": date_debut,
+            "Date fin": date_fin,
+            "Durée": duree,
+            "Description": description
+        })
+
+    return experiences
+
+# ========== app-4-2.py : expériences datées d'un profil complet ==========
+def app_4_2_extract_full_experience_section(text):
+    match = re.search(r'ExpérienceExpérience(.*?)FormationFormation', text, re.DOTALL)
+    return match.group(1) if match else ""
+
+def app_4_2_extract_name_from_experience(section_text):
+    lines = [l.strip() for l in section_text.split('\n') if l.strip()]
+    for i in range(len(lines) - 1):
+        if lines[i] == lines[i+1]:
+            return lines[i]
+    return "Nom inconnu"
+
+def app_4_2_looks_like_name(line):
+    words = line.strip().split()
+    if len(words) < 2 or len(words) > 3:
+        return False
+    for w in words:
+        if not w[0].isupper() or not w.isalpha():
+            return False
+    return True
+
+def app_4_2_extract_name_general(text):
+    lines = [l.strip() for l in text.split('\n') if l.strip()]
+    for line in lines:
+        if app_4_2_looks_like_name(line):
+            return line
+    return "Nom inconnu"
+
+def app_4_2_clean_double_text(text):
+    half = len(text) // 2
+    return text[:half] if len(text) % 2 == 0 and text[:half] == text[half:] else text
+
+def app_4_2_extract_year(date_str):
+    match = re.search(r'(\d{4})', date_str)
+    return match.group(1) if match else ""
+
+def app_4_2_is_valid_poste(poste):
+    if len(poste) > 50:
+        return False
+    if re.search(r'[.!?]', poste):
+        return False
+    if re.search(r'\b(selected|managed|developed|designed|served|created|led)\b', poste, re.I):
+        return False
+    return True
+
+def app_4_2_is_valid_date_line(date_line):
+    return bool(re.search(r'(\w+\.? \d{4})\s*-\s*(aujourd’hui|\w+\.? \d{4})', date_line, re.I))
+
+def app_4_2_parse_experiences(section_text):
+    experiences = []
+    blocs = re.split(r'Logo de ', section_text)
+    for bloc in blocs[1:]:
+        lines = [l.strip() for l in bloc.strip().split('\n') if l.strip()]
+        if not lines:
+            continue
+        entreprise = lines[0]
+        if len(lines) > 1 and lines[1] == entreprise + entreprise:
+            start_line = 2
+        else:
+            start_line = 1
+
+        i = start_line
+        while i + 1 < len(lines):
+            poste = app_4_2_clean_double_text(lines[i])
+            date_line = lines[i+1]
+
+            if not (app_4_2_is_valid_poste(poste) and app_4_2_is_valid_date_line(date_line)):
+                i += 1  # avancer d’une ligne pour ne pas rester bloqué
+                continue
+
+            type_contrat = ""
+            date_debut = ""
+            date_fin = ""
+            contrat_match = re.search(r'·\s*(Stage|Temps plein|Temps partiel|CDI|CDD)', date_line, re.I)
+            if contrat_match:
+                type_contrat = contrat_match.group(1)
+            date_match = re.search(r'(\w+\.? \d{4})\s*-\s*(aujourd’hui|\w+\.? \d{4})', date_line, re.I)
+            if date_match:
+                date_debut = date_match.group(1)
+                date_fin = date_match.group(2)
+
+            experiences.append({
+                "Entreprise": entreprise,
+                "Poste": poste,
+                "Type de contrat": type_contrat,
+                "Date début": date_debut,
+                "Date fin": date_fin,
+                "Année début": app_4_2_extract_year(date_debut),
+                "Année fin": app_4_2_extract_year(date_fin)
+            })
+
+            i += 2
+            # Ignorer les lignes descriptions qui commencent par '-'
+            while i < len(lines) and lines[i].startswith('-'):
+                i += 1
+
+    return experiences
@@ -0,0 +1,16 @@
+"""Parsers des copier-coller LinkedIn, sans Streamlit.
+
+Un module par type de collage : header (en-tête de profil), reactions (réactions brutes),
+posts (post et ses réactions), org_people (page "Personnes" d'une organisation),
+profile_page et experiences (profil complet, profile_zip pour une archive de profils),
+tagging (intitulés de postes). dedup repère les profils collectés en double, sqlite_store les
+enregistre (avec posts et réactions) dans une base SQLite locale, export_jobs construit les
+gros exports en arrière-plan. Les modules partagés normalize, sections, gazetteer et dates
+(dates relatives des posts, mois et durées des expériences) sont en Python pur ; pandas, numpy,
+openpyxl et xlsxwriter ne sont importés qu'à l'usage (exports, xlsx_stream,
+sqlite_store.experiences_frame, dates.resolve_relative_dates, dates.add_tenure, tagging.tag_column).
+
+En ligne de commande : python -m linkedin_tools (voir cli). Benchmarks et contrôle de sortie
+des parsers sur des collages synthétiques : python -m linkedin_tools.bench (voir corpus) ; leur
+comparaison aux versions d'origine des apps est hors du paquet, dans benchmarks/compare.py.
+"""
@@ -0,0 +1,252 @@
+"""Benchmarks des parsers sur les collages synthétiques de corpus, et contrôle de leur sortie.
+
+    python -m linkedin_tools.bench [-n 1000 -n 100000] [--only NOM] [--repeat 3] [--json FICHIER]
+    python -m linkedin_tools.bench --check-golden
+    python -m linkedin_tools.bench --update-golden
+
+Pour chaque parser et chaque taille : meilleur temps sur --repeat passages, enregistrements par
+seconde et pic mémoire pendant l'analyse (tracemalloc, passage séparé). --check-golden compare
+l'empreinte de la sortie de chaque parser, sur un corpus fixe, à celle enregistrée dans
+golden.json : une version plus rapide d'un parser doit produire exactement les mêmes lignes.
+--update-golden réenregistre ces empreintes, à faire seulement quand un changement de sortie
+est voulu (ou quand le générateur de corpus change). La justesse de ces sorties se vérifie
+contre les versions d'origine des apps : voir benchmarks/compare.py à la racine du dépôt.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from . import corpus, dates, header, reactions, posts, org_people, profile_page, experiences, profile_zip, tagging, sqlite_store
+from .sections import index_sections
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden.json")
+GOLDEN_RECORDS = 2000
+GOLDEN_SEED = 0
+GOLDEN_NOW = "2025-01-15 12:00"
+DEFAULT_SIZES = [1000, 100_000]
+
+def run_profile_page(pastes):
+    rows = []
+    for text in pastes:
+        sections = index_sections(text)
+        if "Expérience" in sections:
+            start, end = sections["Expérience"]
+            rows += profile_page.parse_experiences(text[start:end])
+    return rows
+
+def run_experiences(pastes):
+    rows = []
+    for text in pastes:
+        section = experiences.extract_full_experience_section(text)
+        if section is not None:
+            rows += experiences.parse_experiences(section)
+    return rows
+
+def run_sqlite_store(reactions_list):
+    # Réactions enregistrées par posts de 1000 dans une base en mémoire, puis relues par lots
+    conn = sqlite_store.connect(":memory:")
+    for start in range(0, len(reactions_list), 1000):
+        post_id = sqlite_store.save_post(conn, start.to_bytes(8, "big"), {"Auteur": "", "Date relative": "", "Post": ""})
+        sqlite_store.replace_reactions(conn, post_id, reactions_list[start:start + 1000])
+    rows = list(sqlite_store.iter_query(conn, sqlite_store.REACTIONS_QUERY))
+    conn.close()
+    return rows
+
+def run_profile_store(records):
+    # Chemin des apps (app.py, app-4-2) : doublons cherchés en base, puis profil ajouté et doublons
+    # enregistrés, une transaction par profil, dans une base sur disque comme une collecte
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = sqlite_store.connect(os.path.join(tmp_dir, "bench.sqlite3"))
+        for record in records:
+            match = sqlite_store.lookup_profile(conn, sqlite_store.HEADER_SOURCE, record["Lien"], record["Nom"])
+            if match["link"] is not None:
+                # Même lien : le profil n'est pas ajouté une seconde fois
+                rows.append({"Doublon de": match["link"], "Motif": "même lien"})
+                continue
+            profile_id = sqlite_store.add_profile(conn, sqlite_store.HEADER_SOURCE, record)
+            rows += sqlite_store.record_duplicates(conn, profile_id, match)
+        conn.close()
+    return rows
+
+def run_reaction_columns(text):
+    # Réactions analysées en colonnes (voir posts.add_reactions), à comparer à posts.parse_reactions
+    columns = posts.new_reaction_columns()
+    posts.add_reactions(columns, text, 1)
+    return columns
+
+def date_strings(resolved):
+    return [None if value is None else str(value) for value in resolved.astype(object).where(resolved.notna(), None)]
+
+def run_relative_dates(texts):
+    # Contre un instant de référence fixe, pour une empreinte golden stable
+    return date_strings(dates.resolve_relative_dates(texts, now=GOLDEN_NOW))
+
+def tenure_input(n, seed):
+    import pandas as pd
+
+    frame = pd.DataFrame(corpus.experience_dates(n, seed))
+    frame["Entreprise"] = frame["Entreprise"].astype("category")
+    return frame
+
+def run_tenure(frame):
+    # Dates normalisées, durées et ancienneté par profil et entreprise, contre un mois de
+    # référence fixe ("aujourd’hui" ne doit pas changer l'empreinte golden)
+    frame = dates.add_tenure(frame, now="2025-01-15")
+    totals = dates.total_tenure(frame, ["N°", "Entreprise"])
+    return {
+        "Durée (mois)": frame[dates.TENURE_COLUMN].tolist(),
+        "Ancienneté": totals.astype({"Entreprise": object}).to_numpy().tolist(),
+    }
+
+def tagging_input(n, seed):
+    # L'automate est compilé hors chronométrage, comme dans l'app (st.cache_resource)
+    automaton = tagging.build_automaton(tagging.TAGS_KEYWORDS, tagging.SHORT_KEYWORD_LEN)
+    return list(corpus.iter_job_titles(n, seed, distinct=max(1, n // 20))), automaton
+
+# Nom -> (construction de l'entrée pour n enregistrements, analyse de cette entrée)
+BENCHMARKS = {
+    "header.parse_one_profile": (
+        lambda n, seed: list(corpus.iter_header_pastes(n, seed)),
+        lambda pastes: [header.parse_one_profile(p) for p in pastes],
+    ),
+    "header.extract_location": (
+        lambda n, seed: list(corpus.iter_header_pastes(n, seed)),
+        lambda pastes: [header.extract_location(p.replace("\n", " ")) for p in pastes],
+    ),
+    "header.extract_country": (
+        lambda n, seed: list(corpus.iter_locations(n, seed)),
+        lambda locations: [header.extract_country(location) for location in locations],
+    ),
+    "reactions.parse_reactions": (
+        corpus.reactions_paste,
+        reactions.parse_reactions,
+    ),
+    "posts.parse_reactions": (
+        corpus.reactions_paste,
+        posts.parse_reactions,
+    ),
+    "posts.add_reactions": (
+        corpus.reactions_paste,
+        run_reaction_columns,
+    ),
+    "org_people.extract_profiles": (
+        corpus.org_page_paste,
+        org_people.extract_profiles,
+    ),
+    "profile_page.parse_experiences": (
+        lambda n, seed: list(corpus.iter_full_profile_pastes(n, seed)),
+        run_profile_page,
+    ),
+    "experiences.parse_experiences": (
+        lambda n, seed: list(corpus.iter_full_profile_pastes(n, seed)),
+        run_experiences,
+    ),
+    "profile_zip.iter_profiles": (
+        corpus.full_profiles_zip,
+        lambda data: list(profile_zip.iter_profiles(io.BytesIO(data))),
+    ),
+    "sqlite_store.add_profile": (
+        lambda n, seed: list(corpus.iter_profile_records(n, seed)),
+        run_profile_store,
+    ),
+    "sqlite_store.replace_reactions": (
+        lambda n, seed: posts.parse_reactions(corpus.reactions_paste(n, seed)),
+        run_sqlite_store,
+    ),
+    "dates.resolve_relative_dates": (
+        lambda n, seed: list(corpus.iter_relative_dates(n, seed)),
+        run_relative_dates,
+    ),
+    "dates.add_tenure": (
+        tenure_input,
+        run_tenure,
+    ),
+    "tagging.tag_titles": (
+        tagging_input,
+        lambda data: tagging.tag_titles(data[0], data[1], {})[0],
+    ),
+}
+
+def output_digest(rows):
+    payload = json.dumps(rows, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def measure(name, n, seed=0, repeat=3):
+    make_input, run = BENCHMARKS[name]
+    data = make_input(n, seed)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(data)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run(data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"benchmark": name, "records": n, "seconds": best, "records_per_s": n / best if best else float("inf"), "peak_mb": peak / 1e6}
+
+def golden_digests(names):
+    return {name: output_digest(BENCHMARKS[name][1](BENCHMARKS[name][0](GOLDEN_RECORDS, GOLDEN_SEED))) for name in names}
+
+def check_golden(names):
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        expected = json.load(f)["digests"]
+    failed = False
+    for name, digest in golden_digests(names).items():
+        status = "ok" if expected.get(name) == digest else ("absent" if name not in expected else "DIFFÉRENT")
+        failed |= status != "ok"
+        print(f"{name:<34} {status}")
+    return 1 if failed else 0
+
+def update_golden(names):
+    digests = {}
+    if os.path.exists(GOLDEN_PATH):
+        with open(GOLDEN_PATH, encoding="utf-8") as f:
+            digests = json.load(f)["digests"]
+    digests.update(golden_digests(names))
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        json.dump({"records": GOLDEN_RECORDS, "seed": GOLDEN_SEED, "digests": digests}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"{len(names)} empreintes enregistrées dans {GOLDEN_PATH}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m linkedin_tools.bench", description="Benchmarks et contrôle de sortie des parsers.")
+    parser.add_argument("-n", "--records", type=int, action="append", help=f"nombre d'enregistrements (répétable, défaut : {DEFAULT_SIZES})")
+    parser.add_argument("--only", action="append", choices=list(BENCHMARKS), help="ne lancer que ce benchmark (répétable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="passages chronométrés, le meilleur est gardé (défaut : 3)")
+    parser.add_argument("--json", help="écrire aussi les résultats dans ce fichier JSON")
+    parser.add_argument("--check-golden", action="store_true", help="comparer la sortie des parsers à golden.json")
+    parser.add_argument("--update-golden", action="store_true", help="réenregistrer golden.json à partir des parsers actuels")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    if args.check_golden:
+        return check_golden(names)
+    if args.update_golden:
+        return update_golden(names)
+
+    results = []
+    print(f"{'benchmark':<34} {'n':>9} {'s':>9} {'enr./s':>12} {'pic Mo':>9}")
+    for n in args.records or DEFAULT_SIZES:
+        for name in names:
+            result = measure(name, n, args.seed, args.repeat)
+            results.append(result)
+            print(f"{name:<34} {n:>9} {result['seconds']:>9.3f} {result['records_per_s']:>12.0f} {result['peak_mb']:>9.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Analyse en ligne de commande de collages LinkedIn enregistrés, sans navigateur.
+
+    python -m linkedin_tools MODE [FICHIER|DOSSIER ...] [--format jsonl|csv] [-o SORTIE] [--workers N]
+
+Chaque fichier est un collage (un dossier vaut tous ses fichiers, sans fichier : l'entrée
+standard). Les lignes sortent au fil de l'analyse, précédées du fichier d'origine. Avec
+--workers, les fichiers sont répartis sur un pool de processus ; au plus deux fichiers par
+processus sont en cours à la fois, et l'ordre des fichiers est conservé en sortie.
+"""
+import csv
+import json
+import os
+import sys
+from collections import deque
+
+from . import header, reactions, org_people, experiences, tagging
+
+SOURCE_COLUMN = "Fichier"
+
+# Colonnes de sortie de chaque mode (ordre des colonnes CSV)
+MODES = {
+    "header": header.COLUMNS,
+    "reactions": reactions.COLUMNS,
+    "org": ["Profil", "Description"],
+    "experiences": ["Nom", "Entreprise", "Poste", "Type de contrat", "Date début", "Date fin", "Année début", "Année fin"],
+    "tags": ["Intitulé", "Tags"],
+}
+IN_FLIGHT_PER_WORKER = 2
+
+_automata = {}
+_tag_cache = {}
+
+def get_automaton(whole_word_max_len):
+    # Compilé une fois par processus (le processus principal ou chaque processus du pool)
+    if whole_word_max_len not in _automata:
+        _automata[whole_word_max_len] = tagging.build_automaton(tagging.TAGS_KEYWORDS, whole_word_max_len)
+    return _automata[whole_word_max_len]
+
+def iter_tags(lines, whole_word_max_len):
+    # Un intitulé par ligne ; les intitulés déjà vus ne repassent pas par l'automate
+    automaton = get_automaton(whole_word_max_len)
+    cache = _tag_cache.setdefault(whole_word_max_len, {})
+    for line in lines:
+        title = line.strip()
+        if title:
+            tags, _ = tagging.tag_titles([title], automaton, cache)
+            yield {"Intitulé": title, "Tags": tags[0]}
+
+def iter_experiences(text):
+    profile = experiences.parse_full_profile(text)
+    if profile is None:
+        return
+    name, records = profile
+    for record in records:
+        yield {"Nom": name, **record}
+
+def iter_records(mode, stream, whole_word_max_len=tagging.SHORT_KEYWORD_LEN):
+    # Réactions et intitulés sont lus ligne à ligne ; les autres modes ont besoin du collage entier
+    if mode == "reactions":
+        return reactions.iter_reactions(reactions.iter_lines(stream))
+    if mode == "tags":
+        return iter_tags(reactions.iter_lines(stream), whole_word_max_len)
+    text = stream.read()
+    if mode == "header":
+        return iter([header.parse_one_profile(text)] if text.strip() else [])
+    if mode == "org":
+        return iter(org_people.extract_profiles(text))
+    if mode == "experiences":
+        return iter_experiences(text)
+    raise ValueError(f"Mode inconnu : {mode}")
+
+def iter_file_records(mode, path, whole_word_max_len=tagging.SHORT_KEYWORD_LEN):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        yield from iter_records(mode, f, whole_word_max_len)
+
+def parse_file(mode, path, whole_word_max_len):
+    # Tâche d'un processus du pool : toutes les lignes d'un fichier, renvoyées d'un bloc
+    return list(iter_file_records(mode, path, whole_word_max_len))
+
+def expand_paths(paths):
+    # Fichiers tels quels, dossiers remplacés par leurs fichiers (récursivement, triés)
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+
+def iter_rows(mode, paths, workers=1, whole_word_max_len=tagging.SHORT_KEYWORD_LEN):
+    # (fichier, ligne) dans l'ordre des fichiers
+    if workers <= 1:
+        for path in paths:
+            for record in iter_file_records(mode, path, whole_word_max_len):
+                yield path, record
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for path in paths:
+            pending.append((path, pool.submit(parse_file, mode, path, whole_word_max_len)))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done_path, future = pending.popleft()
+                for record in future.result():
+                    yield done_path, record
+        while pending:
+            done_path, future = pending.popleft()
+            for record in future.result():
+                yield done_path, record
+
+def write_rows(rows, out, output_format, columns):
+    fieldnames = [SOURCE_COLUMN] + columns
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        for source, record in rows:
+            writer.writerow({SOURCE_COLUMN: source, **record})
+    else:
+        for source, record in rows:
+            out.write(json.dumps({SOURCE_COLUMN: source, **record}, ensure_ascii=False))
+            out.write("\n")
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m linkedin_tools", description="Analyse de collages LinkedIn enregistrés.")
+    parser.add_argument("mode", choices=list(MODES), help="type de collage : en-tête de profil, réactions, page Personnes, profil complet, intitulés de postes")
+    parser.add_argument("paths", nargs="*", help="fichiers ou dossiers de collages (défaut : entrée standard)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="format de sortie (défaut : jsonl)")
+    parser.add_argument("-o", "--output", help="fichier de sortie (défaut : sortie standard)")
+    parser.add_argument("--workers", type=int, default=1, help="nombre de processus d'analyse (défaut : 1)")
+    parser.add_argument("--all-substrings", action="store_true", help="mode tags : mots-clés courts (pm, ia, rh…) comptés aussi à l'intérieur des mots")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    whole_word_max_len = 0 if args.all_substrings else tagging.SHORT_KEYWORD_LEN
+    if args.paths:
+        rows = iter_rows(args.mode, expand_paths(args.paths), args.workers, whole_word_max_len)
+    else:
+        rows = (("-", record) for record in iter_records(args.mode, sys.stdin, whole_word_max_len))
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        write_rows(rows, out, args.format, MODES[args.mode])
+    except BrokenPipeError:
+        # Sortie coupée par le lecteur (ex : | head) : on s'arrête sans trace d'erreur
+        sys.stderr.close()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
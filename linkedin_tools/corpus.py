@@ -0,0 +1,369 @@
+import random
+
+# Collages LinkedIn synthétiques, déterministes (même graine -> même texte) et de taille libre,
+# de 1 à 1M enregistrements : en-têtes de profil, réactions, page "Personnes", profils complets
+# (aussi en archive zip) et intitulés de postes. Les libellés sont doublés comme dans un vrai copier-coller
+# ("Data ScientistData Scientist"). Sert aux benchmarks et aux contrôles de sortie (voir bench).
+
+FIRST_NAMES = [
+    "Jean", "Marie", "Élodie", "Asmir", "Ieva", "Lucas", "Chloé", "Ömer", "Anna", "Paul", "Léa", "Hugo",
+    "Camille", "Mathis", "Inès", "Karim", "Sofia", "Jonas", "Aino", "Mikko", "Laura", "Thomas", "Nadia", "Yann",
+]
+LAST_NAMES = [
+    "Dupont", "Khan", "Gaigala", "Martin", "Lefèvre", "Virtanen", "Müller", "Rossi", "Bernard", "Moreau",
+    "Nieminen", "Garcia", "Dubois", "Laurent", "Korhonen", "Fontaine", "Benali", "Schmidt", "Rousseau", "Petit",
+]
+COMPANIES = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Nokia", "Capgemini", "Orange",
+    "BNP Paribas", "Decathlon", "Doctolib", "Wolt", "Supercell", "Airbus", "Ubisoft",
+]
+JOB_TITLES = [
+    "Data Scientist", "Chef de projet", "Product Owner", "Consultant senior", "Ingénieur R&D",
+    "Responsable commercial", "Business Developer", "Chargé de mission", "UX Designer", "Office Manager",
+    "Directeur marketing", "Stagiaire RH", "Développeur Python", "Chief of Staff", "Assistante de direction",
+]
+HEADLINE_EXTRAS = ["IA", "Agile", "Growth", "SaaS", "Data & Analytics", "Transformation digitale"]
+LOCATIONS = [
+    "Paris, Île-de-France, France", "Helsinki, Uusimaa, Finlande", "Région de Paris", "Lyon",
+    "Montréal, Québec, Canada", "San Francisco Bay Area", "Bruxelles, Région de Bruxelles-Capitale, Belgique",
+    "Genève, Suisse", "Berlin, Allemagne", "Londres, Angleterre, Royaume-Uni", "Tampere, Pirkanmaa, Finlande",
+]
+# Localisations seules, pour la résolution des pays : celles des en-têtes plus des formes
+# anglaises, en minuscules ou sans pays
+COUNTRY_LOCATIONS = LOCATIONS + [
+    "Munich, Bavaria, Germany", "Greater Boston", "Tokyo, Japan", "Barcelona, Catalonia, Spain",
+    "Montreal, Quebec, Canada", "Espoo, Finland", "Amsterdam, North Holland, Netherlands", "Zürich, Switzerland",
+    "Toronto, Ontario", "Lausanne, Vaud, Suisse", "paris, ile-de-france", "London Area, United Kingdom",
+    "Remote", "Télétravail",
+]
+MONTHS = ["janv.", "févr.", "mars", "avr.", "mai", "juin", "juil.", "août", "sept.", "oct.", "nov.", "déc."]
+EN_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+CONTRACTS = ["CDI", "CDD", "Stage", "Temps plein", "Temps partiel", "Freelance"]
+BULLETS = [
+    "Développement de modèles de prévision", "Managed a team of 5 engineers.", "Pilotage du budget",
+    "Selected for the leadership program", "Refonte du parcours client", "Animation des ateliers utilisateurs",
+]
+REACTIONS = ["like", "celebrate", "love", "funny", "insightful", "support"]
+TITLE_WORDS = [
+    "responsable", "chef de projet", "data", "analyste", "commercial", "business developer", "chargé de mission",
+    "ingénieur", "UX designer", "assistante", "RH", "stagiaire", "product owner", "directeur", "marketing",
+    "développeur", "Python", "PM", "IA", "chief of staff", "sales", "support", "communication", "r&d",
+    "comptable", "juriste", "gestionnaire", "Head of", "senior", "junior", "chargé d'affaires",
+]
+
+def doubled(label):
+    return label + label
+
+def fake_name(r):
+    return f"{r.choice(FIRST_NAMES)} {r.choice(LAST_NAMES)}"
+
+def profile_url(name, r):
+    return f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}-{r.randint(1, 99999)}"
+
+def header_paste(r):
+    # En-tête de profil tel que collé depuis la page (nom doublé, relation, titre, lieu…)
+    name = fake_name(r)
+    parts = [name, name]
+    if r.random() < 0.9:
+        parts.append(f"· relation de {r.randint(1, 3)}{r.choice(['e', 'ᵉ'])}")
+    if r.random() < 0.3:
+        parts.append(f"niveau {r.randint(1, 3)}e")
+    headline = r.choice(JOB_TITLES)
+    if r.random() < 0.5:
+        headline += f" chez {r.choice(COMPANIES)}"
+    if r.random() < 0.4:
+        headline += f" | {r.choice(HEADLINE_EXTRAS)}"
+    parts.append(headline + r.choice([" | ", "  ", "\n", " "]) + r.choice(LOCATIONS))
+    if r.random() < 0.85:
+        parts.append("Coordonnées")
+    if r.random() < 0.8:
+        parts.append(profile_url(name, r))
+    if r.random() < 0.8:
+        parts.append(f"{r.randint(1, 9)} {r.randint(100, 999)} abonnés")
+    if r.random() < 0.7:
+        parts.append(f"Plus de {r.choice([100, 500])} relations")
+    return "\n".join(parts)
+
+def iter_header_pastes(n, seed=0):
+    r = random.Random(seed)
+    for _ in range(n):
+        yield header_paste(r)
+
+def iter_locations(n, seed=0):
+    r = random.Random(seed)
+    for _ in range(n):
+        yield r.choice(COUNTRY_LOCATIONS)
+
+def reaction_lines(r):
+    # Une réaction de la liste d'un post : type, nom suivi du lien "Voir le profil de …" sur la
+    # même ligne, position réseau, titre (ligne vide sans titre)
+    name = fake_name(r)
+    reaction = r.choice(REACTIONS)
+    position = r.choice(["2e", "3e et +", "1er", "Out of network · 3e et +"])
+    info = f"{r.choice(JOB_TITLES)} chez {r.choice(COMPANIES)}" if r.random() < 0.9 else ""
+    return [reaction, f"{name}Voir le profil de {name}", position, info]
+
+def iter_reaction_lines(n, seed=0):
+    r = random.Random(seed)
+    for _ in range(n):
+        yield from reaction_lines(r)
+
+def reactions_paste(n, seed=0):
+    return "\n".join(iter_reaction_lines(n, seed))
+
+def org_member_lines(r):
+    # Un membre de la page "Personnes" : nom doublé, ou anonyme
+    if r.random() < 0.05:
+        return ["Utilisateur LinkedIn", f"{r.choice(JOB_TITLES)} chez {r.choice(COMPANIES)}"]
+    name = fake_name(r)
+    lines = [name, name, r.choice(["· 2e", "· 3e et +", "· 1er"]), f"{r.choice(JOB_TITLES)} | {r.choice(HEADLINE_EXTRAS)}", r.choice(LOCATIONS)]
+    if r.random() < 0.6:
+        lines.append(f"{r.randint(1, 50)} relations en commun")
+    lines.append(r.choice(["Se connecter", "Suivre", "Message"]))
+    return lines
+
+def iter_org_page_lines(n, seed=0):
+    # Page "Personnes" d'une organisation : n membres, nom doublé, quelques anonymes
+    r = random.Random(seed)
+    for _ in range(n):
+        yield from org_member_lines(r)
+
+def org_page_paste(n, seed=0):
+    return "\n".join(iter_org_page_lines(n, seed))
+
+def post_paste(r, body_lines=60):
+    # Post collé depuis le fil (lien graphique, auteur, titre, date, texte), en français
+    name = fake_name(r)
+    value, unit = r.randint(1, 11), r.choice(["jours", "h", "semaines", "mois"])
+    body = [" ".join(r.choice(TITLE_WORDS) for _ in range(r.randint(5, 20))) for _ in range(body_lines)]
+    return "\n".join([
+        f"Lien graphique pour {name}", name, r.choice(JOB_TITLES),
+        f"Il y a {value} {unit} • Visible de tous sur LinkedIn et en dehors", *body,
+    ])
+
+def iter_post_entries(n_posts, reactions_per_post, seed=0):
+    # Saisies d'app2-2 : (post collé, réactions collées) de chaque post
+    r = random.Random(seed)
+    for i in range(n_posts):
+        yield post_paste(r), reactions_paste(reactions_per_post, seed * 1000 + i)
+
+def iter_relative_dates(n, seed=0):
+    # Dates relatives d'en-tête de post, françaises et anglaises ; environ une sur cent est une
+    # ligne de texte qui ressemble à une date mais déborde de la plage des dates pandas
+    # ("Il y a 500 ans, Gutenberg…") et doit donner NaT
+    r = random.Random(seed)
+    for _ in range(n):
+        if r.random() < 0.01:
+            yield r.choice([f"Il y a {r.randint(400, 900)} ans, Gutenberg inventait l'imprimerie", f"Il y a {10 ** r.randint(12, 30)} jours"])
+        elif r.random() < 0.5:
+            value, unit = r.randint(1, 23), r.choice(["j", "jours", "h", "sem", "mois", "an", "min"])
+            yield f"Il y a {value} {unit} • Visible de tous sur LinkedIn et en dehors" if r.random() < 0.5 else f"{value} {unit} •"
+        else:
+            yield f"{r.randint(1, 23)}{r.choice(['d', 'h', 'w', 'mo', 'yr', 'm'])} • Edited"
+
+def date_range(r):
+    year = r.randint(2005, 2023)
+    start = f"{r.choice(MONTHS)} {year}"
+    end = "aujourd’hui" if r.random() < 0.3 else f"{r.choice(MONTHS)} {min(year + r.randint(0, 4), 2024)}"
+    return f"{start} - {end} · {r.randint(1, 11)} mois" if r.random() < 0.5 else f"{start} - {end} · {r.randint(1, 9)} ans {r.randint(1, 11)} mois"
+
+def experience_lines(r):
+    company = r.choice(COMPANIES)
+    lines = [f"Logo de {company}"]
+    if r.random() < 0.3:
+        # Plusieurs postes dans la même entreprise : entreprise puis durée totale, puis les postes
+        lines += [doubled(company), doubled(f"{r.randint(2, 9)} ans")]
+        for _ in range(r.randint(2, 3)):
+            lines += [doubled(r.choice(JOB_TITLES)), doubled(r.choice(CONTRACTS)), doubled(date_range(r))]
+    else:
+        lines += [
+            doubled(r.choice(JOB_TITLES)),
+            doubled(f"{company} · {r.choice(CONTRACTS)}"),
+            doubled(date_range(r)),
+            doubled(r.choice(LOCATIONS)),
+        ]
+    lines += [f"- {r.choice(BULLETS)}" for _ in range(r.randint(0, 3))]
+    return lines
+
+def full_profile_paste(r, n_experiences=None):
+    # Profil complet (Ctrl+A sur la page) : en-tête, sections aux titres doublés, expériences
+    name = fake_name(r)
+    lines = [name, name, f"{r.choice(JOB_TITLES)} | {r.choice(HEADLINE_EXTRAS)}", r.choice(LOCATIONS), "Coordonnées"]
+    lines += [f"{r.randint(1, 9)} {r.randint(100, 999)} abonnés", f"Plus de {r.choice([100, 500])} relations"]
+    lines += [doubled("Infos"), "Passionné par la donnée et les produits."]
+    lines += [doubled("Activité"), f"{r.randint(100, 9999)} abonnés", "Aucun post récent"]
+    lines.append(doubled("Expérience"))
+    for _ in range(r.randint(1, 6) if n_experiences is None else n_experiences):
+        lines += experience_lines(r)
+    lines += [doubled("Formation"), "Logo de Université Paris", doubled("Université Paris"), doubled("Master, Informatique")]
+    lines += [doubled("Compétences"), doubled("Python"), doubled("SQL")]
+    lines += [doubled("Langues"), doubled("Anglais"), doubled("Français")]
+    return "\n".join(lines)
+
+def iter_full_profile_pastes(n, seed=0):
+    r = random.Random(seed)
+    for _ in range(n):
+        yield full_profile_paste(r)
+
+# Collages hostiles d'environ `size` caractères pour les extracteurs d'en-tête, de réactions et
+# de page "Personnes" : de longues plages de caractères que les anciens motifs acceptent, sans
+# l'ancre qui les terminerait, que ces motifs reprenaient depuis chaque position (temps
+# quadratique). L'ancre n'apparaît qu'une fois, isolée à la fin : les versions actuelles ne
+# peuvent pas s'arrêter à son absence et doivent vraiment parcourir le texte.
+def long_run(r, size, alphabet):
+    return "".join(r.choice(alphabet) for _ in range(size))
+
+def anchorless_location_paste(size, seed=0):
+    # Lettres, espaces, virgules… puis "Coordonnées" collé à un chiffre : aucune localisation
+    r = random.Random(seed)
+    return long_run(r, size, "abcdeéèÀ ,.-") + "9Coordonnées"
+
+def anchorless_followers_paste(size, seed=0):
+    # Chiffres et espaces, puis " abonnés" après une lettre : aucun nombre d'abonnés
+    r = random.Random(seed)
+    return long_run(r, size, "0123456789 ") + "x abonnés"
+
+def reactionless_paste(size, seed=0):
+    # Texte de post collé à la place des réactions : aucune ligne n'est un type de réaction,
+    # une ligne sur dix fait plusieurs kilo-octets
+    r = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        line = " ".join(r.choice(TITLE_WORDS) for _ in range(r.randint(200, 800) if r.random() < 0.1 else r.randint(1, 12)))
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+def long_capitalized_lines_paste(size, seed=0):
+    # Page "Personnes" dont les descriptions sont de très longues lignes de mots capitalisés
+    # terminées par un chiffre : presque des noms, refusés seulement au dernier caractère
+    r = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        if r.random() < 0.5:
+            block = org_member_lines(r)
+        else:
+            block = [" ".join(r.choice(LAST_NAMES) for _ in range(r.randint(100, 400))) + " 1"]
+        lines += block
+        length += sum(len(line) + 1 for line in block)
+    return "\n".join(lines)
+
+def unclosed_sections_paste(size, seed=0):
+    # Collage hostile d'environ `size` caractères : des titres "ExpérienceExpérience" répétés,
+    # chacun suivi d'une expérience, sans jamais de titre "FormationFormation" qui ferme la
+    # section (le motif d'origine 'ExpérienceExpérience(.*?)FormationFormation' relit alors
+    # tout le reste du texte depuis chaque titre)
+    r = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        block = "\n".join([doubled("Expérience")] + experience_lines(r))
+        parts.append(block)
+        length += len(block) + 1
+    return "\n".join(parts)
+
+def full_profiles_zip(n, seed=0):
+    # Archive zip (octets) de n profils complets, un fichier par profil, l'URL d'un profil sur
+    # trois dans un fichier .url du même nom (voir profile_zip)
+    import io
+    import zipfile
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i, text in enumerate(iter_full_profile_pastes(n, seed)):
+            zf.writestr(f"profils/{i:06d}.txt", text)
+            if i % 3 == 0:
+                zf.writestr(f"profils/{i:06d}.url", f"[InternetShortcut]\nURL=https://www.linkedin.com/in/profil-{seed}-{i}\n")
+    return buffer.getvalue()
+
+def experience_dates(n, seed=0):
+    # n expériences en colonnes, comme sqlite_store.experiences_frame ("N°", "Entreprise",
+    # "Date début", "Date fin") : 1 à 6 par profil, dates en français, en anglais pour un profil
+    # sur cinq ("Sep 2019 - Present"), parfois l'année seule
+    r = random.Random(seed)
+    columns = {"N°": [], "Entreprise": [], "Date début": [], "Date fin": []}
+    profile = 0
+    while len(columns["N°"]) < n:
+        profile += 1
+        months, present = (EN_MONTHS, "Present") if profile % 5 == 0 else (MONTHS, "aujourd’hui")
+        for _ in range(min(r.randint(1, 6), n - len(columns["N°"]))):
+            year = r.randint(2005, 2023)
+            end_year = min(year + r.randint(0, 4), 2024)
+            year_only = r.random() < 0.05
+            columns["N°"].append(profile)
+            columns["Entreprise"].append(r.choice(COMPANIES))
+            columns["Date début"].append(str(year) if year_only else f"{r.choice(months)} {year}")
+            columns["Date fin"].append(
+                present if r.random() < 0.3 else str(end_year) if year_only else f"{r.choice(months)} {end_year}"
+            )
+    return columns
+
+def iter_job_titles(n, seed=0, distinct=None):
+    # Intitulés de postes ; avec distinct, tirés dans un vivier de `distinct` intitulés (fichiers
+    # réels : beaucoup de répétitions)
+    r = random.Random(seed)
+
+    def title():
+        return " ".join(r.choice(TITLE_WORDS) for _ in range(r.randint(1, 4))).capitalize()
+
+    pool = [title() for _ in range(distinct)] if distinct else None
+    for _ in range(n):
+        yield r.choice(pool) if pool else title()
+
+def iter_job_title_cells(n, seed=0, distinct=None, missing_rate=0.02):
+    # Colonne d'intitulés d'un fichier Excel : comme iter_job_titles, avec des cellules vides
+    r = random.Random(seed + 1)
+    for title in iter_job_titles(n, seed, distinct):
+        yield None if r.random() < missing_rate else title
+
+NAME_SYLLABLES = [
+    "ber", "na", "mou", "lin", "dal", "ko", "vi", "ran", "te", "sa", "lo", "mar", "gu", "el", "tou",
+    "pe", "ri", "an", "do", "cha", "fon", "mi", "sen", "ka", "bru", "ta", "vel", "nor", "ji", "ste",
+    "quin", "zo", "haf", "bel", "cor", "wa", "dri", "ux", "pol", "ges", "fa", "lau", "tri", "ven", "sol",
+    "hu", "kar", "mo", "nes", "pi", "rou", "sch", "ty", "vo", "gar", "lé", "mé", "dou", "yo", "ark",
+]
+
+def distinct_name(r):
+    # Nom tiré dans un vivier de ~300 millions de combinaisons (fake_name n'en a que 480)
+    last = "".join(r.choice(NAME_SYLLABLES) for _ in range(r.randint(3, 4)))
+    return f"{r.choice(FIRST_NAMES)} {last.capitalize()}"
+
+def name_variant(name, r):
+    # Même personne, nom saisi autrement : ordre inversé, sans accents / en minuscules, faute de frappe
+    choice = r.randrange(3)
+    if choice == 0:
+        first, last = name.split(" ", 1)
+        return f"{last} {first}"
+    if choice == 1:
+        return name.lower()
+    i = r.randrange(1, len(name))
+    return name[:i] + r.choice("aeiourstnl") + name[i + 1:]
+
+def link_variant(link, r):
+    # Même profil, lien copié autrement (sous-domaine, barre finale, paramètres, casse)
+    slug = link.rsplit("/", 1)[1]
+    return r.choice([
+        f"https://fr.linkedin.com/in/{slug}/",
+        f"http://www.linkedin.com/in/{slug}?originalSubdomain=fr",
+        f"https://www.linkedin.com/in/{slug.upper()}",
+    ])
+
+def iter_profile_records(n, seed=0, duplicate_rate=0.1):
+    # Profils {"Nom", "Lien"} dont environ `duplicate_rate` reprennent un profil déjà émis : même
+    # lien écrit autrement, ou lien absent et nom écrit autrement
+    r = random.Random(seed)
+    emitted = []
+    for _ in range(n):
+        if emitted and r.random() < duplicate_rate:
+            name, link = r.choice(emitted)
+            if r.random() < 0.5:
+                yield {"Nom": name, "Lien": link_variant(link, r)}
+            else:
+                yield {"Nom": name_variant(name, r), "Lien": ""}
+            continue
+        name = distinct_name(r)
+        link = profile_url(name, r)
+        emitted.append((name, link))
+        yield {"Nom": name, "Lien": link if r.random() < 0.8 else ""}
@@ -0,0 +1,159 @@
+import re
+
+# Dates relatives LinkedIn ("Il y a 3 jours", "3 j", "1 sem", "2 mois", "5h", "3d", "2mo",
+# "1 week ago"…) résolues en lot, par extraction vectorisée pandas, contre une seule date de
+# référence : tous les posts d'un même lot sont datés par rapport au même instant.
+
+# Unité -> durée en secondes ; un mois vaut 30 jours et une année 365 jours (approximation)
+UNIT_SECONDS = {
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+
+# Abréviations françaises et anglaises ; les formes longues passent avant leurs préfixes
+UNIT_ALIASES = {
+    "minutes": "minute", "minute": "minute", "mins": "minute", "min": "minute", "mn": "minute", "m": "minute",
+    "heures": "hour", "heure": "hour", "hours": "hour", "hour": "hour", "hrs": "hour", "hr": "hour", "h": "hour",
+    "jours": "day", "jour": "day", "days": "day", "day": "day", "j": "day", "d": "day",
+    "semaines": "week", "semaine": "week", "sem": "week", "weeks": "week", "week": "week", "wk": "week", "w": "week",
+    "mois": "month", "months": "month", "month": "month", "mo": "month",
+    "années": "year", "année": "year", "ans": "year", "an": "year", "years": "year", "year": "year", "yrs": "year", "yr": "year", "y": "year",
+}
+
+RELATIVE_DATE_PATTERN = (
+    r"(?:il y a\s*)?(?P<value>\d+)\s*(?P<unit>"
+    + "|".join(sorted(UNIT_ALIASES, key=len, reverse=True))
+    + r")(?![^\W\d_])"
+)
+
+# Ligne d'en-tête de post portant la date : "Il y a 3 jours • …" ou, en anglais, "3d • …"
+DATE_LINE_RE = re.compile(r"il y a\s*\d|^\s*\d+\s*[^\W\d_]+\s*(?:•|ago\b)", re.IGNORECASE)
+
+def resolve_relative_dates(texts, now=None):
+    """Convertit des dates relatives en dates absolues (Series datetime64, NaT si illisible).
+
+    Toutes les valeurs sont résolues par rapport au même instant `now` (maintenant par défaut).
+    """
+    import numpy as np
+    import pandas as pd
+
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    # Les libellés se répètent beaucoup ("Il y a 2 j • …") : extraction sur les valeurs
+    # distinctes seulement, puis rediffusion par les codes de factorize (le code -1 des valeurs
+    # manquantes pointe sur le NaT ajouté en fin de tableau)
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object))
+    parts = pd.Series(uniques, dtype=object).str.extract(RELATIVE_DATE_PATTERN, flags=re.IGNORECASE)
+    seconds = parts["unit"].str.lower().map(UNIT_ALIASES).map(UNIT_SECONDS)
+    # En flottants directement : un nombre trop long pour un entier 64 bits ("Il y a 10^20
+    # jours") donne 1e20, écarté plus bas, là où pd.to_numeric échoue avant pandas 3
+    delta_seconds = parts["value"].astype(float) * seconds
+    # Une durée lisible mais hors de la plage des dates pandas ("Il y a 500 ans" tombe avant
+    # 1677) donne NaT, comme un libellé illisible ; un jour de marge pour les arrondis
+    max_seconds = (now.as_unit("ns").value - pd.Timestamp.min.value) / 1e9 - UNIT_SECONDS["day"]
+    delta = pd.to_timedelta(delta_seconds.where(delta_seconds <= max_seconds), unit="s")
+    resolved = np.append((now - delta).astype("datetime64[ns]").to_numpy(), np.datetime64("NaT", "ns"))
+    return pd.Series(resolved[codes], dtype="datetime64[ns]")
+
+def is_date_line(line):
+    return bool(DATE_LINE_RE.search(line))
+
+# Dates d'expérience LinkedIn ("janv. 2021", "Sep 2019", "2018", "aujourd’hui", "Present")
+# converties en mois typés (period[M]) colonne par colonne, comme resolve_relative_dates : une
+# extraction sur les valeurs distinctes, rediffusée sur toutes les lignes. Les durées se
+# calculent ensuite en entiers, sur les numéros de mois.
+
+# Mois français et anglais, formes longues et abréviations LinkedIn (le point final est ôté)
+MONTH_ALIASES = {
+    "janvier": 1, "janv": 1, "january": 1, "jan": 1,
+    "février": 2, "fevrier": 2, "févr": 2, "fevr": 2, "fév": 2, "fev": 2, "february": 2, "feb": 2,
+    "mars": 3, "march": 3, "mar": 3,
+    "avril": 4, "avr": 4, "april": 4, "apr": 4,
+    "mai": 5, "may": 5,
+    "juin": 6, "june": 6, "jun": 6,
+    "juillet": 7, "juil": 7, "july": 7, "jul": 7,
+    "août": 8, "aout": 8, "august": 8, "aug": 8,
+    "septembre": 9, "sept": 9, "september": 9, "sep": 9,
+    "octobre": 10, "october": 10, "oct": 10,
+    "novembre": 11, "november": 11, "nov": 11,
+    "décembre": 12, "decembre": 12, "déc": 12, "dec": 12, "december": 12,
+}
+# Poste en cours : la date de fin vaut le mois de référence
+PRESENT_ALIASES = ["aujourd’hui", "aujourd'hui", "présent", "present", "actuel", "now"]
+
+MONTH_DATE_PATTERN = r"^\s*(?:(?P<month>[^\W\d_]+)\.?\s+)?(?P<year>\d{4})\s*$"
+
+TENURE_COLUMN = "Durée (mois)"
+
+def month_periods(texts, now=None, default_month=1):
+    """Convertit des dates d'expérience en mois (Series period[M], NaT si illisible).
+
+    "aujourd’hui"/"Present" valent le mois de `now` (maintenant par défaut) ; une année seule
+    ("2018") prend le mois `default_month`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object))
+    labels = pd.Series(uniques, dtype=object).str.strip().str.lower()
+    parts = labels.str.extract(MONTH_DATE_PATTERN)
+    month = parts["month"].map(MONTH_ALIASES).where(parts["month"].notna(), default_month)
+    # Numéro de mois depuis janvier 1970 (l'ordinal des périodes mensuelles pandas)
+    ordinals = (pd.to_numeric(parts["year"]) - 1970) * 12 + month - 1
+    ordinals = ordinals.where(~labels.isin(PRESENT_ALIASES), pd.Period(now, "M").ordinal)
+    nat = np.iinfo(np.int64).min
+    # Le code -1 des valeurs manquantes pointe sur le NaT ajouté en fin de tableau
+    resolved = np.append(ordinals.fillna(nat).to_numpy(dtype=np.int64), nat)
+    # PeriodArray sur les ordinaux (PeriodIndex.from_ordinals n'existe qu'à partir de pandas 2.2)
+    return pd.Series(pd.arrays.PeriodArray(resolved[codes], dtype=pd.PeriodDtype("M")))
+
+def _ordinals(periods):
+    # Numéros de mois d'une Series period[M], en flottants (NaN pour NaT)
+    import numpy as np
+
+    values = periods.array.asi8.astype(float)
+    values[periods.isna().to_numpy()] = np.nan
+    return values
+
+def add_tenure(frame, now=None):
+    """Ajoute à une table d'expériences ("Date début", "Date fin") les colonnes "Début" et "Fin"
+    (mois typés) et "Durée (mois)", bornes comprises comme sur LinkedIn ("janv. 2020 - mars 2020"
+    : 3 mois ; vide si une date manque ou si la fin précède le début).
+
+    Une année seule vaut janvier en début et décembre en fin d'expérience.
+    """
+    import pandas as pd
+
+    start = month_periods(frame["Date début"].to_numpy(), now, default_month=1)
+    end = month_periods(frame["Date fin"].to_numpy(), now, default_month=12)
+    months = pd.Series(_ordinals(end) - _ordinals(start) + 1, index=frame.index)
+    return frame.assign(**{
+        "Début": start.array,
+        "Fin": end.array,
+        TENURE_COLUMN: months.where(months > 0).astype("Int64"),
+    })
+
+def total_tenure(frame, keys):
+    """Mois passés par groupe `keys` (par exemple ["N°", "Entreprise"] : ancienneté de chaque
+    profil dans chaque entreprise), sur une table passée par add_tenure.
+
+    Les expériences qui se chevauchent (deux postes en même temps dans la même entreprise) ne
+    comptent qu'une fois : chaque expérience n'ajoute que ses mois postérieurs à la fin la plus
+    tardive des expériences du groupe commencées avant elle.
+    """
+    import numpy as np
+    import pandas as pd
+
+    spans = frame[keys].assign(start=_ordinals(frame["Début"]), end=_ordinals(frame["Fin"]))
+    spans = spans[spans["end"] >= spans["start"]].sort_values(keys + ["start"], kind="stable")
+    groups = spans.groupby(keys, observed=True, sort=False)
+    spans["reach"] = groups["end"].cummax()
+    # Fin la plus tardive des expériences précédentes du groupe (début - 1 pour la première)
+    previous = spans.groupby(keys, observed=True, sort=False)["reach"].shift().fillna(spans["start"] - 1)
+    covered = (spans["end"] - np.maximum(spans["start"], previous + 1) + 1).clip(lower=0)
+    totals = covered.groupby([spans[k] for k in keys], observed=True).sum()
+    return totals.astype("int64").rename("Mois").reset_index()
@@ -0,0 +1,185 @@
+import random
+import re
+import unicodedata
+import zlib
+from urllib.parse import unquote, urlsplit
+
+# Index des profils collectés, pour repérer les doublons au moment de l'ajout sans jamais
+# comparer les profils deux à deux :
+# - exact : lien normalisé et clé de nom (casse, accents et ordre des mots ignorés), deux dicts,
+#   donc une recherche en O(1) ;
+# - approché : signature MinHash des trigrammes de la clé de nom, découpée en bandes (LSH). Seules
+#   les clés qui partagent une bande entière sont comparées, si bien que le nombre de paires
+#   candidates croît à peu près linéairement avec le nombre de profils.
+# L'index ne contient que les clés et des numéros de ligne : les profils restent là où l'appelant
+# les garde (liste en mémoire pour find_duplicates ; sqlite_store reprend les mêmes clés et
+# bandes, indexées en base).
+
+PROFILE_PATH_RE = re.compile(r"/in/([^/?#\s]+)", re.IGNORECASE)
+NAME_TOKEN_RE = re.compile(r"[^\W_]+")
+# Noms de remplacement des parsers : jamais considérés comme une identité
+PLACEHOLDER_NAMES = ["Nom inconnu", "Utilisateur LinkedIn"]
+
+SHINGLE_SIZE = 3
+# 16 bandes de 4 valeurs : deux noms à 0,6 de Jaccard partagent au moins une bande dans 9 cas
+# sur 10, à 0,7 dans 99 cas sur 100 ; deux noms sans rapport (0,1) dans 2 cas sur 1000
+BANDS = 16
+ROWS_PER_BAND = 4
+# Jaccard minimal des trigrammes pour signaler deux noms proches : une faute de frappe dans un nom
+# court coûte déjà beaucoup ("Jean Dupont" / "Jean Dupond" : 0,57)
+FUZZY_THRESHOLD = 0.55
+# Une bande partagée par plus de clés que cela n'apporte plus d'information (prénom très courant) :
+# elle n'accueille plus de nouvelles clés, pour garder un coût borné par ajout
+MAX_BUCKET = 16
+
+_PRIME = (1 << 61) - 1
+_params = random.Random(20240607)
+# Une permutation (a·h + b mod p) par ligne de signature, tirée une fois pour toutes : les signatures
+# restent comparables d'un processus à l'autre
+HASH_PARAMS = [(_params.randrange(1, _PRIME), _params.randrange(_PRIME)) for _ in range(BANDS * ROWS_PER_BAND)]
+
+def normalize_link(link):
+    # "https://fr.linkedin.com/in/Jean-Dupont-1a2b/?originalSubdomain=fr" -> "in/jean-dupont-1a2b"
+    link = (link or "").strip()
+    if not link:
+        return ""
+    match = PROFILE_PATH_RE.search(link)
+    if match:
+        return "in/" + unquote(match.group(1)).lower()
+    parts = urlsplit(link if "//" in link else "//" + link)
+    host = parts.netloc.lower().removeprefix("www.")
+    return host + parts.path.rstrip("/").lower()
+
+def name_key(name):
+    # "Élodie  Lefèvre-Martin" et "lefevre martin elodie" -> "elodie lefevre martin"
+    text = unicodedata.normalize("NFKD", (name or "").casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(sorted(NAME_TOKEN_RE.findall(text)))
+
+_PLACEHOLDER_KEYS = {name_key(name) for name in PLACEHOLDER_NAMES}
+
+def shingles(key):
+    padded = f" {key} "
+    return {padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+# Valeurs permutées de chaque n-gramme déjà rencontré : les n-grammes de noms sont peu nombreux
+# (quelques milliers), et la signature d'une clé devient un minimum colonne par colonne
+_shingle_hashes = {}
+
+def _permuted(shingle):
+    values = _shingle_hashes.get(shingle)
+    if values is None:
+        h = zlib.crc32(shingle.encode("utf-8"))
+        values = _shingle_hashes[shingle] = tuple((a * h + b) % _PRIME for a, b in HASH_PARAMS)
+    return values
+
+def band_hashes(key):
+    # Une clé d'un caractère n'a qu'un trigramme, une clé vide aucun (et donc aucune bande)
+    signature = list(map(min, zip(*[_permuted(s) for s in shingles(key)])))
+    return [hash(tuple(signature[i:i + ROWS_PER_BAND])) for i in range(0, len(signature), ROWS_PER_BAND)]
+
+def new_index():
+    return {
+        "links": {},     # lien normalisé -> première ligne
+        "names": {},     # clé de nom -> première ligne
+        "keys": [],      # clés de nom distinctes, dans l'ordre d'arrivée (rangs stockés dans les bandes)
+        # par bande : empreinte -> rang de clé, ou liste de rangs dès la deuxième clé (la plupart
+        # des empreintes ne sont vues qu'une fois : pas de liste d'un élément par empreinte)
+        "buckets": [{} for _ in range(BANDS)],
+        "size": 0,
+    }
+
+def _similar(index, key, bands):
+    # Lignes dont le nom est proche de `key`, vérifiées sur les trigrammes : [(ligne, score)]
+    candidates = set()
+    for buckets, band in zip(index["buckets"], bands):
+        ranks = buckets.get(band)
+        if ranks is None:
+            continue
+        if type(ranks) is int:
+            candidates.add(ranks)
+        else:
+            candidates.update(ranks)
+    if not candidates:
+        return []
+    key_shingles = shingles(key)
+    similar = []
+    for rank in candidates:
+        other = index["keys"][rank]
+        score = jaccard(key_shingles, shingles(other))
+        if score >= FUZZY_THRESHOLD:
+            similar.append((index["names"][other], round(score, 3)))
+    similar.sort(key=lambda item: (-item[1], item[0]))
+    return similar
+
+def _match(index, link_key, key, bands):
+    return {
+        "link": index["links"].get(link_key) if link_key else None,
+        "name": index["names"].get(key) if key else None,
+        "similar": _similar(index, key, bands) if bands is not None else [],
+    }
+
+def profile_keys(link, name):
+    # (lien normalisé, clé de nom), vides quand ils ne peuvent pas identifier le profil
+    key = name_key(name)
+    return normalize_link(link), "" if key in _PLACEHOLDER_KEYS else key
+
+def _keys(index, link, name):
+    link_key, key = profile_keys(link, name)
+    # Les bandes ne servent qu'à une clé encore inconnue (sinon le doublon exact suffit)
+    bands = band_hashes(key) if key and key not in index["names"] else None
+    return link_key, key, bands
+
+def lookup(index, link, name):
+    """Doublons d'un profil parmi ceux déjà indexés, sans l'ajouter.
+
+    Renvoie {"link": ligne ou None, "name": ligne ou None, "similar": [(ligne, score), ...]} :
+    même lien, même clé de nom, noms proches (seulement si la clé de nom est nouvelle).
+    """
+    return _match(index, *_keys(index, link, name))
+
+def add(index, row, link, name):
+    # Indexe le profil de la ligne `row` et renvoie ses doublons parmi les profils déjà indexés
+    # (comme lookup). Un lien ou un nom déjà connu garde sa première ligne.
+    link_key, key, bands = _keys(index, link, name)
+    match = _match(index, link_key, key, bands)
+    if link_key:
+        index["links"].setdefault(link_key, row)
+    if bands is not None:
+        index["names"][key] = row
+        rank = len(index["keys"])
+        index["keys"].append(key)
+        for buckets, band in zip(index["buckets"], bands):
+            ranks = buckets.get(band)
+            if ranks is None:
+                buckets[band] = rank
+            elif type(ranks) is int:
+                buckets[band] = [ranks, rank]
+            elif len(ranks) < MAX_BUCKET:
+                ranks.append(rank)
+    index["size"] += 1
+    return match
+
+def is_duplicate(match):
+    return match["link"] is not None or match["name"] is not None or bool(match["similar"])
+
+def match_rows(row, match):
+    # Lignes d'avertissement à afficher : (ligne, doublon de, motif, score)
+    rows = []
+    if match["link"] is not None:
+        rows.append({"Ligne": row, "Doublon de": match["link"], "Motif": "même lien", "Score": 1.0})
+    if match["name"] is not None and match["name"] != match["link"]:
+        rows.append({"Ligne": row, "Doublon de": match["name"], "Motif": "même nom", "Score": 1.0})
+    rows += [{"Ligne": row, "Doublon de": other, "Motif": "nom proche", "Score": score} for other, score in match["similar"]]
+    return rows
+
+def find_duplicates(records, link_column="Lien", name_column="Nom"):
+    # Passe complète sur une liste de profils : (ligne, doublons) pour chaque profil qui en a
+    index = new_index()
+    for row, record in enumerate(records):
+        match = add(index, row, record.get(link_column, ""), record.get(name_column, ""))
+        if is_duplicate(match):
+            yield row, match
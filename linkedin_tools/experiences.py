@@ -0,0 +1,121 @@
+import re
+
+from . import instrument
+from .sections import index_sections
+from .normalize import iter_blocs, pasted_line, repeated_line, search_pasted
+
+# Expériences datées d'un profil LinkedIn complet collé (poste validé, dates, années), pour
+# comparer plusieurs profils. Les blocs de la section Expérience sont lus dédoublés (voir
+# normalize.iter_blocs).
+
+def extract_full_experience_section(text, sections=None):
+    # Texte de la section Expérience, ou None si elle est absente (voir sections.py)
+    if sections is None:
+        sections = index_sections(text)
+    if "Expérience" not in sections:
+        return None
+    start, end = sections["Expérience"]
+    return text[start:end]
+
+def extract_name_from_experience(section_text):
+    # Nom répété deux fois côte à côte dans la section
+    name = repeated_line(section_text)
+    return "Nom inconnu" if name is None else name
+
+def looks_like_name(line):
+    words = line.strip().split()
+    if len(words) < 2 or len(words) > 3:
+        return False
+    for w in words:
+        if not w[0].isupper() or not w.isalpha():
+            return False
+    return True
+
+def extract_name_general(text):
+    # Première ligne du collage qui ressemble à un nom, lue telle que collée
+    for line in map(str.strip, text.split("\n")):
+        if line and looks_like_name(line):
+            return line
+    return "Nom inconnu"
+
+YEAR_RE = re.compile(r'(\d{4})')
+SENTENCE_PUNCT_RE = re.compile(r'[.!?]')
+DESCRIPTION_VERB_RE = re.compile(r'\b(selected|managed|developed|designed|served|created|led)\b', re.I)
+CONTRAT_RE = re.compile(r'·\s*(Stage|Temps plein|Temps partiel|CDI|CDD)', re.I)
+DATE_RANGE_RE = re.compile(r'(\w+\.? \d{4})\s*-\s*(aujourd’hui|\w+\.? \d{4})', re.I)
+
+def extract_year(date_str):
+    match = YEAR_RE.search(date_str)
+    return match.group(1) if match else ""
+
+def is_valid_poste(poste):
+    if len(poste) > 50:
+        return False
+    if SENTENCE_PUNCT_RE.search(poste):
+        return False
+    if DESCRIPTION_VERB_RE.search(poste):
+        return False
+    return True
+
+def parse_experiences(section_text):
+    experiences = []
+    for lines, doubled in iter_blocs(section_text):
+        if not lines:
+            continue
+        entreprise = pasted_line(lines, doubled, 0)
+        # Nom de l'entreprise répété doublé ("AcmeAcme") sur la ligne suivante
+        if len(lines) > 1 and doubled[1] and lines[1] == entreprise:
+            instrument.count("expériences : entreprise répétée sautée")
+            start_line = 2
+        else:
+            start_line = 1
+
+        i = start_line
+        while i + 1 < len(lines):
+            poste = lines[i]
+            date_line, date_doubled = lines[i + 1], doubled[i + 1]
+
+            # La ligne de dates valide le poste, et sa correspondance sert ensuite telle quelle
+            date_match = search_pasted(DATE_RANGE_RE, date_line, date_doubled, "-") if is_valid_poste(poste) else None
+            if date_match is None:
+                instrument.count("expériences : ligne écartée (poste ou dates invalides)")
+                i += 1  # avancer d’une ligne pour ne pas rester bloqué
+                continue
+
+            type_contrat = ""
+            contrat_match = search_pasted(CONTRAT_RE, date_line, date_doubled, "·")
+            if contrat_match:
+                type_contrat = contrat_match.group(1)
+            date_debut = date_match.group(1)
+            date_fin = date_match.group(2)
+
+            experiences.append({
+                "Entreprise": entreprise,
+                "Poste": poste,
+                "Type de contrat": type_contrat,
+                "Date début": date_debut,
+                "Date fin": date_fin,
+                "Année début": extract_year(date_debut),
+                "Année fin": extract_year(date_fin)
+            })
+
+            i += 2
+            # Ignorer les lignes descriptions qui commencent par '-'
+            while i < len(lines) and lines[i].startswith('-'):
+                i += 1
+
+    return experiences
+
+def parse_full_profile(text):
+    """(nom, expériences) d'un profil complet collé, ou None sans section Expérience.
+
+    Enchaîne repérage des sections, nom (répété dans la section Expérience, sinon première ligne
+    qui ressemble à un nom) et parse_experiences, comme app-4-2 pour un collage.
+    """
+    section = extract_full_experience_section(text)
+    if section is None or not section.strip():
+        return None
+    name = extract_name_from_experience(section)
+    if name == "Nom inconnu":
+        name = extract_name_general(text)
+    return name, parse_experiences(section)
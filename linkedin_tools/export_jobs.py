@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+from . import instrument
+
+# Exports construits en arrière-plan, hors du rerun Streamlit : le script soumet la construction
+# du fichier à un pool de threads partagé par toutes les sessions (st.cache_resource dans les
+# apps), affiche l'avancement, et le bouton de téléchargement n'apparaît qu'une fois les octets
+# prêts (app_ui.export_button). Un travail est identifié par une clé décrivant son contenu (nom de l'export et version
+# des données) : deux demandes identiques, même venues de sessions différentes, partagent le
+# même travail au lieu d'encoder deux fois le même classeur.
+# Des threads plutôt que des processus : les exports lisent la base SQLite et les tampons de la
+# session, qu'il faudrait sinon sérialiser vers un autre processus.
+
+MAX_WORKERS = 2
+# Travaux terminés gardés (avec leurs octets) pour les sessions qui ne les ont pas encore téléchargés
+MAX_FINISHED = 8
+PROGRESS_EVERY = 1000
+PROGRESS_INTERVAL = 0.5
+
+def new_worker(max_workers=MAX_WORKERS):
+    from concurrent.futures import ThreadPoolExecutor
+
+    return {
+        "executor": ThreadPoolExecutor(max_workers, thread_name_prefix="export"),
+        "jobs": OrderedDict(),   # clé -> travail, du plus ancien au plus récent
+        "lock": threading.Lock(),
+    }
+
+def _run(job, build):
+    def progress(rows=1, total=None):
+        # total : nombre de lignes attendu, quand la construction le calcule elle-même
+        if total is not None:
+            job["total"] = total
+        job["rows"] += rows
+    try:
+        return build(progress)
+    finally:
+        job["seconds"] = time.monotonic() - job["started"]
+
+def _evict(worker):
+    finished = [key for key, job in worker["jobs"].items() if job["future"].done()]
+    for key in finished[:max(0, len(finished) - MAX_FINISHED)]:
+        del worker["jobs"][key]
+
+def reusable(job):
+    # Travail en cours ou réussi : un travail en échec est relancé à la demande suivante
+    return job is not None and not (job["future"].done() and job["future"].exception() is not None)
+
+def find_job(worker, key):
+    # Travail de cette clé, quel que soit son état (None s'il n'y en a pas)
+    with worker["lock"]:
+        job = worker["jobs"].get(key)
+        if job is not None:
+            worker["jobs"].move_to_end(key)
+        return job
+
+def submit_job(worker, key, build, total=None):
+    """Travail de clé `key`, lancé s'il n'existe pas déjà : build(progress) renvoie les octets du
+    fichier et appelle progress(n) au fil des lignes écrites (sur `total`, si connu ; sinon
+    progress(0, total=…) le fixe depuis la construction)."""
+    with worker["lock"]:
+        job = worker["jobs"].get(key)
+        if reusable(job):
+            instrument.count("export : demande rattachée à un travail existant")
+            worker["jobs"].move_to_end(key)
+            return job
+        job = {"key": key, "rows": 0, "total": total, "started": time.monotonic(), "seconds": None}
+        job["future"] = worker["executor"].submit(instrument.bind(_run, job, build))
+        worker["jobs"][key] = job
+        worker["jobs"].move_to_end(key)
+        _evict(worker)
+    return job
+
+def counted(rows, progress, every=PROGRESS_EVERY):
+    # Lignes transmises telles quelles, l'avancement signalé toutes les `every` lignes
+    n = 0
+    for n, row in enumerate(rows, 1):
+        if n % every == 0:
+            progress(every)
+        yield row
+    progress(n % every)
+
+def job_fraction(job):
+    # Avancement entre 0 et 1, None quand le nombre total de lignes n'est pas connu
+    if not job["total"]:
+        return None
+    return min(1.0, job["rows"] / job["total"])
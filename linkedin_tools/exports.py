@@ -0,0 +1,106 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from . import instrument
+
+# Export Excel/CSV commun à toutes les apps. Les octets ne sont produits qu'au clic sur le
+# bouton de téléchargement (st.download_button accepte une fonction sans argument), puis
+# mémorisés selon une empreinte du contenu des DataFrames, avec éviction LRU bornée.
+# Les exports "en flux" lisent plutôt leurs lignes au fil de l'eau (curseur SQLite…) : ils ne
+# sont pas mémorisés, la source pouvant changer entre deux clics.
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MIME = "text/csv"
+
+MAX_ENTRIES = 32
+MAX_BYTES = 256 * 1024 * 1024
+
+_cache = OrderedDict()
+_cache_bytes = 0
+_lock = threading.Lock()
+
+def frame_digest(df):
+    # Empreinte du contenu : colonnes, types et valeurs (hachage vectorisé de pandas)
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(repr((list(df.columns), [str(t) for t in df.dtypes], df.shape)).encode("utf-8"))
+    if len(df.columns):
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _memoize(key, build):
+    global _cache_bytes
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            instrument.count(f"export {key[0]} : déjà en cache")
+            return _cache[key]
+    with instrument.stage(f"export {key[0]}"):
+        data = build()
+    with _lock:
+        if key not in _cache:
+            _cache[key] = data
+            _cache_bytes += len(data)
+            while _cache and (len(_cache) > MAX_ENTRIES or _cache_bytes > MAX_BYTES):
+                _, evicted = _cache.popitem(last=False)
+                _cache_bytes -= len(evicted)
+    return data
+
+def xlsx_bytes(sheets):
+    """Classeur xlsx (xlsxwriter) à partir de {nom de feuille: DataFrame}, mémorisé."""
+    key = ("xlsx",) + tuple((name, frame_digest(df)) for name, df in sheets.items())
+
+    def build():
+        import pandas as pd
+
+        output = BytesIO()
+        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+            for name, df in sheets.items():
+                df.to_excel(writer, index=False, sheet_name=name)
+        return output.getvalue()
+
+    return _memoize(key, build)
+
+def csv_bytes(df):
+    key = ("csv", frame_digest(df))
+    return _memoize(key, lambda: df.to_csv(index=False).encode("utf-8"))
+
+def lazy_xlsx(sheets):
+    # À passer tel quel en data= de st.download_button : rien n'est encodé avant le clic
+    return instrument.bind(xlsx_bytes, sheets)
+
+def lazy_csv(df):
+    return instrument.bind(csv_bytes, df)
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def lazy_file(path):
+    # Export déjà écrit sur disque (flux) : comme lazy_xlsx, le fichier n'est lu qu'au clic. Il
+    # doit donc survivre au rerun qui l'a écrit (voir app_ui.session_export_path)
+    return instrument.bind(read_file, path)
+
+def stream_xlsx_bytes(make_sheets):
+    """Classeur xlsx écrit ligne à ligne à partir de make_sheets() -> [(feuille, en-tête, lignes)]."""
+    from .xlsx_stream import write_sheets_xlsx
+
+    with instrument.stage("export xlsx (flux)"), tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "export.xlsx")
+        write_sheets_xlsx(path, make_sheets())
+        with open(path, "rb") as f:
+            return f.read()
+
+def stream_csv_bytes(header, make_rows):
+    from .xlsx_stream import write_rows_csv
+
+    with instrument.stage("export csv (flux)"), tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "export.csv")
+        write_rows_csv(path, header, make_rows())
+        with open(path, "rb") as f:
+            return f.read()
@@ -0,0 +1,285 @@
+import re
+import unicodedata
+
+# Pays (nom renvoyé) -> alias, régions et grandes villes tels qu'ils apparaissent dans les
+# localisations LinkedIn (français et anglais). En cas d'homonymie, la première entrée gagne.
+GAZETTEER = {
+    "France": {
+        "aliases": ["France"],
+        "regions": [
+            "Île-de-France", "Région de Paris", "Greater Paris Metropolitan Region", "Auvergne-Rhône-Alpes",
+            "Provence-Alpes-Côte d'Azur", "Occitanie", "Nouvelle-Aquitaine", "Hauts-de-France", "Grand Est",
+            "Bretagne", "Brittany", "Normandie", "Normandy", "Pays de la Loire", "Centre-Val de Loire",
+            "Bourgogne-Franche-Comté", "Corse", "Corsica",
+        ],
+        "cities": [
+            "Paris", "Marseille", "Lyon", "Toulouse", "Nice", "Nantes", "Montpellier", "Strasbourg",
+            "Bordeaux", "Lille", "Rennes", "Reims", "Toulon", "Grenoble", "Dijon", "Angers", "Nîmes",
+            "Clermont-Ferrand", "Le Havre", "Rouen", "Brest", "Tours", "Limoges", "Amiens", "Metz",
+            "Besançon", "Perpignan", "Orléans", "Caen", "Mulhouse", "Nancy", "Saint-Étienne",
+            "Boulogne-Billancourt", "Nanterre", "Versailles", "La Défense", "Sophia Antipolis",
+        ],
+    },
+    "Finlande": {
+        "aliases": ["Finlande", "Finland", "Suomi"],
+        "regions": ["Uusimaa", "Pirkanmaa", "Varsinais-Suomi", "Pohjois-Pohjanmaa", "Lapland", "Laponie"],
+        "cities": ["Helsinki", "Espoo", "Tampere", "Vantaa", "Oulu", "Turku", "Jyväskylä", "Lahti", "Kuopio"],
+    },
+    "États-Unis": {
+        "aliases": ["États-Unis", "United States", "USA", "U.S.A.", "United States of America"],
+        "regions": [
+            "California", "Californie", "New York", "Texas", "Florida", "Floride", "Washington",
+            "Massachusetts", "Illinois", "Pennsylvania", "Colorado", "Oregon", "Virginia", "Virginie",
+            "North Carolina", "Caroline du Nord", "Michigan", "Ohio", "Arizona", "Nevada", "Utah",
+            "Minnesota", "New Jersey", "New Mexico", "Maryland", "San Francisco Bay Area", "Greater Boston",
+            "New York City Metropolitan Area", "Greater Seattle Area", "Los Angeles Metropolitan Area",
+        ],
+        "cities": [
+            "San Francisco", "Los Angeles", "Chicago", "Houston", "Boston", "Seattle", "Austin",
+            "San Diego", "San Jose", "Dallas", "Miami", "Atlanta", "Denver", "Philadelphia",
+            "Philadelphie", "Phoenix", "Portland", "Palo Alto", "Mountain View", "Cupertino",
+            "Menlo Park", "Brooklyn", "Manhattan", "Pittsburgh", "Detroit", "Minneapolis",
+            "Nouvelle-Orléans", "New Orleans", "Las Vegas", "Nashville",
+        ],
+    },
+    "Japon": {
+        "aliases": ["Japon", "Japan"],
+        "regions": ["Kanto", "Kansai", "Hokkaido"],
+        "cities": ["Tokyo", "Osaka", "Kyoto", "Yokohama", "Nagoya", "Sapporo", "Fukuoka", "Kobe"],
+    },
+    "Allemagne": {
+        "aliases": ["Allemagne", "Germany", "Deutschland"],
+        "regions": [
+            "Bavière", "Bavaria", "Bayern", "Berlin Metropolitan Area", "Hesse", "Hessen",
+            "Rhénanie-du-Nord-Westphalie", "North Rhine-Westphalia", "Nordrhein-Westfalen",
+            "Bade-Wurtemberg", "Baden-Württemberg", "Saxe", "Saxony", "Sachsen",
+        ],
+        "cities": [
+            "Berlin", "Munich", "München", "Hamburg", "Hambourg", "Francfort", "Frankfurt", "Cologne",
+            "Köln", "Stuttgart", "Düsseldorf", "Leipzig", "Dresde", "Dresden", "Hanovre", "Hannover",
+            "Nuremberg", "Nürnberg", "Brême", "Bremen", "Bonn", "Heidelberg",
+        ],
+    },
+    "Canada": {
+        "aliases": ["Canada"],
+        "regions": [
+            "Québec", "Quebec", "Ontario", "Colombie-Britannique", "British Columbia", "Alberta",
+            "Manitoba", "Nouvelle-Écosse", "Nova Scotia", "Nouveau-Brunswick", "New Brunswick",
+            "Saskatchewan", "Greater Toronto Area", "Grand Montréal",
+        ],
+        "cities": ["Montréal", "Montreal", "Toronto", "Vancouver", "Ottawa", "Calgary", "Edmonton", "Gatineau", "Winnipeg", "Halifax", "Sherbrooke"],
+    },
+    "Royaume-Uni": {
+        "aliases": ["Royaume-Uni", "United Kingdom", "UK", "Angleterre", "England", "Écosse", "Scotland", "Pays de Galles", "Wales"],
+        "regions": ["Greater London", "Grand Londres", "Greater Manchester"],
+        "cities": ["Londres", "London", "Manchester", "Birmingham", "Édimbourg", "Edinburgh", "Glasgow", "Liverpool", "Bristol", "Leeds", "Oxford", "Cambridge", "Cardiff", "Belfast"],
+    },
+    "Espagne": {
+        "aliases": ["Espagne", "Spain", "España"],
+        "regions": ["Catalogne", "Catalonia", "Cataluña", "Andalousie", "Andalusia", "Communauté de Madrid", "Community of Madrid", "Pays basque", "Basque Country"],
+        "cities": ["Madrid", "Barcelone", "Barcelona", "Valencia", "Séville", "Seville", "Sevilla", "Bilbao", "Malaga", "Málaga", "Saragosse", "Zaragoza"],
+    },
+    "Italie": {
+        "aliases": ["Italie", "Italy", "Italia"],
+        "regions": ["Lombardie", "Lombardy", "Lombardia", "Latium", "Lazio", "Toscane", "Tuscany", "Toscana", "Piémont", "Piedmont", "Piemonte", "Vénétie", "Veneto"],
+        "cities": ["Rome", "Roma", "Milan", "Milano", "Naples", "Napoli", "Turin", "Torino", "Florence", "Firenze", "Bologne", "Bologna", "Venise", "Venezia", "Gênes", "Genova"],
+    },
+    "Belgique": {
+        "aliases": ["Belgique", "Belgium", "België"],
+        "regions": ["Région de Bruxelles-Capitale", "Brussels Region", "Wallonie", "Wallonia", "Flandre", "Flanders"],
+        "cities": ["Bruxelles", "Brussels", "Anvers", "Antwerp", "Antwerpen", "Gand", "Ghent", "Gent", "Liège", "Namur", "Louvain", "Leuven", "Charleroi", "Mons"],
+    },
+    "Suisse": {
+        "aliases": ["Suisse", "Switzerland", "Schweiz", "Svizzera"],
+        "regions": ["Vaud", "Zurich", "Zürich", "Genève", "Geneva", "Tessin", "Ticino", "Valais"],
+        "cities": ["Lausanne", "Berne", "Bern", "Bâle", "Basel", "Lucerne", "Luzern", "Neuchâtel", "Fribourg", "Lugano"],
+    },
+    "Suède": {
+        "aliases": ["Suède", "Sweden", "Sverige"],
+        "regions": ["Stockholm County", "Skåne", "Västra Götaland"],
+        "cities": ["Stockholm", "Göteborg", "Gothenburg", "Malmö", "Uppsala", "Lund"],
+    },
+    "Norvège": {
+        "aliases": ["Norvège", "Norway", "Norge"],
+        "regions": ["Viken", "Vestland"],
+        "cities": ["Oslo", "Bergen", "Trondheim", "Stavanger"],
+    },
+    "Danemark": {
+        "aliases": ["Danemark", "Denmark", "Danmark"],
+        "regions": ["Capital Region of Denmark", "Région capitale du Danemark"],
+        "cities": ["Copenhague", "Copenhagen", "København", "Aarhus", "Odense"],
+    },
+    "Pays-Bas": {
+        "aliases": ["Pays-Bas", "Netherlands", "The Netherlands", "Nederland"],
+        "regions": ["Hollande-Septentrionale", "North Holland", "Noord-Holland", "Hollande-Méridionale", "South Holland", "Zuid-Holland"],
+        "cities": ["Amsterdam", "Rotterdam", "La Haye", "The Hague", "Den Haag", "Utrecht", "Eindhoven", "Delft", "Leyde", "Leiden"],
+    },
+    "Australie": {
+        "aliases": ["Australie", "Australia"],
+        "regions": ["New South Wales", "Nouvelle-Galles du Sud", "Victoria", "Queensland"],
+        "cities": ["Sydney", "Melbourne", "Brisbane", "Perth", "Adélaïde", "Adelaide", "Canberra"],
+    },
+    "Chine": {
+        "aliases": ["Chine", "China"],
+        "regions": ["Guangdong"],
+        "cities": ["Pékin", "Beijing", "Shanghai", "Shenzhen", "Guangzhou", "Hangzhou", "Hong Kong"],
+    },
+    "Inde": {
+        "aliases": ["Inde", "India"],
+        "regions": ["Karnataka", "Maharashtra", "Tamil Nadu"],
+        "cities": ["Bangalore", "Bengaluru", "Mumbai", "Bombay", "New Delhi", "Delhi", "Hyderabad", "Chennai", "Pune", "Calcutta", "Kolkata"],
+    },
+    "Brésil": {
+        "aliases": ["Brésil", "Brazil", "Brasil"],
+        "regions": ["São Paulo State", "État de São Paulo"],
+        "cities": ["São Paulo", "Rio de Janeiro", "Brasília", "Belo Horizonte", "Porto Alegre", "Curitiba"],
+    },
+    "Mexique": {
+        "aliases": ["Mexique", "Mexico", "México"],
+        "regions": [],
+        "cities": ["Mexico City", "Ciudad de México", "Guadalajara", "Monterrey"],
+    },
+    "Russie": {
+        "aliases": ["Russie", "Russia"],
+        "regions": [],
+        "cities": ["Moscou", "Moscow", "Saint-Pétersbourg", "Saint Petersburg"],
+    },
+    "Turquie": {
+        "aliases": ["Turquie", "Turkey", "Türkiye"],
+        "regions": [],
+        "cities": ["Istanbul", "Ankara", "Izmir", "İzmir"],
+    },
+    "Portugal": {
+        "aliases": ["Portugal"],
+        "regions": [],
+        "cities": ["Lisbonne", "Lisbon", "Lisboa", "Porto"],
+    },
+    "Irlande": {
+        "aliases": ["Irlande", "Ireland"],
+        "regions": ["County Dublin", "Comté de Dublin"],
+        "cities": ["Dublin", "Cork", "Galway"],
+    },
+    "Luxembourg": {
+        "aliases": ["Luxembourg"],
+        "regions": [],
+        "cities": [],
+    },
+    "Autriche": {
+        "aliases": ["Autriche", "Austria", "Österreich"],
+        "regions": [],
+        "cities": ["Vienne", "Vienna", "Wien", "Salzbourg", "Salzburg", "Graz", "Innsbruck"],
+    },
+    "Pologne": {
+        "aliases": ["Pologne", "Poland", "Polska"],
+        "regions": [],
+        "cities": ["Varsovie", "Warsaw", "Warszawa", "Cracovie", "Kraków", "Krakow", "Wrocław", "Gdańsk"],
+    },
+    "Estonie": {
+        "aliases": ["Estonie", "Estonia", "Eesti"],
+        "regions": ["Harju County", "Harjumaa"],
+        "cities": ["Tallinn", "Tartu"],
+    },
+    "Lettonie": {
+        "aliases": ["Lettonie", "Latvia", "Latvija"],
+        "regions": [],
+        "cities": ["Riga", "Rīga"],
+    },
+    "Lituanie": {
+        "aliases": ["Lituanie", "Lithuania", "Lietuva"],
+        "regions": [],
+        "cities": ["Vilnius", "Kaunas"],
+    },
+    "Maroc": {
+        "aliases": ["Maroc", "Morocco"],
+        "regions": ["Casablanca-Settat", "Rabat-Salé-Kénitra"],
+        "cities": ["Casablanca", "Rabat", "Marrakech", "Tanger", "Fès"],
+    },
+    "Tunisie": {
+        "aliases": ["Tunisie", "Tunisia"],
+        "regions": [],
+        "cities": ["Tunis", "Sfax", "Sousse"],
+    },
+    "Algérie": {
+        "aliases": ["Algérie", "Algeria"],
+        "regions": [],
+        "cities": ["Alger", "Algiers", "Oran", "Constantine"],
+    },
+    "Sénégal": {
+        "aliases": ["Sénégal", "Senegal"],
+        "regions": [],
+        "cities": ["Dakar"],
+    },
+    "Côte d'Ivoire": {
+        "aliases": ["Côte d'Ivoire", "Côte d’Ivoire", "Ivory Coast"],
+        "regions": [],
+        "cities": ["Abidjan"],
+    },
+    "Singapour": {
+        "aliases": ["Singapour", "Singapore"],
+        "regions": [],
+        "cities": [],
+    },
+    "Émirats arabes unis": {
+        "aliases": ["Émirats arabes unis", "United Arab Emirates", "UAE"],
+        "regions": [],
+        "cities": ["Dubaï", "Dubai", "Abou Dabi", "Abu Dhabi"],
+    },
+}
+
+# Rang de priorité : une mention explicite du pays l'emporte sur une région, elle-même sur une ville
+RANKS = {"aliases": 0, "regions": 1, "cities": 2}
+
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+def normalize(text):
+    # Minuscules, sans accents, ponctuation et tirets remplacés par des espaces
+    text = text.casefold()
+    if not text.isascii():
+        decomposed = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return NON_ALNUM_RE.sub(" ", text)
+
+def build_trie(gazetteer):
+    # Trie de mots : chaque noeud est un dict mot -> noeud, la clé None porte (rang, pays).
+    # Construit une seule fois par processus, à l'import du module.
+    trie = {}
+    for country, entries in gazetteer.items():
+        for kind, rank in RANKS.items():
+            for name in entries[kind]:
+                words = normalize(name).split()
+                if not words:
+                    continue
+                node = trie
+                for word in words:
+                    node = node.setdefault(word, {})
+                if None not in node or rank < node[None][0]:
+                    node[None] = (rank, country)
+    return trie
+
+TRIE = build_trie(GAZETTEER)
+
+def resolve_country(location):
+    # Une seule passe sur les mots de la localisation : à chaque position on descend le trie
+    # tant que les mots suivants prolongent une expression connue et on garde la plus longue.
+    # Le coût dépend de la longueur de la localisation, pas de la taille du gazetteer.
+    words = normalize(location).split()
+    best = None
+    i = 0
+    while i < len(words):
+        node = TRIE
+        entry = None
+        end = i + 1
+        j = i
+        while j < len(words) and words[j] in node:
+            node = node[words[j]]
+            j += 1
+            if None in node:
+                entry = node[None]
+                end = j
+        if entry is not None:
+            if entry[0] == 0:
+                return entry[1]
+            if best is None or entry[0] < best[0]:
+                best = entry
+        i = end
+    return best[1] if best else ""
@@ -0,0 +1,134 @@
+import re
+
+from . import instrument
+from .gazetteer import resolve_country
+
+# En-tête d'un profil LinkedIn collé (nom, relation, titre, localisation, pays, lien, abonnés,
+# relations) : un dict par profil, aux colonnes de COLUMNS.
+
+COLUMNS = ["Nom", "Relation", "Titre", "Localisation", "Pays", "Lien", "Abonnés", "Relations"]
+
+NAME_RE = re.compile(r"^([A-ZÀ-Ÿ][a-zà-ÿ]+\s+[A-ZÀ-Ÿ][a-zà-ÿ]+)")
+RELATION_RE = re.compile(r"(relation de \d+[e|ᵉ])", re.IGNORECASE)
+NIVEAU_RE = re.compile(r"^niveau \d+[e|ᵉ]\s*", re.IGNORECASE)
+MULTI_SPACE_RE = re.compile(r"\s{2,}")
+# Les motifs "([A-Za-zÀ-ÿ\s,.\-]{2,})Coordonnées" et "(\d[\d\s]* abonnés)" reculent en temps
+# quadratique sur un long collage sans l'ancre : on parcourt plutôt les plages maximales
+# de caractères autorisés (un seul passage) et on cherche l'ancre à l'intérieur de chacune.
+LOCATION_RUN_RE = re.compile(r"[A-Za-zÀ-ÿ\s,.\-]+")
+LINK_RE = re.compile(r"(https?://[^\s]+)")
+FOLLOWERS_RUN_RE = re.compile(r"\d[\d\s]*")
+FOLLOWERS_ANCHOR = " abonnés"
+CONNECTIONS_RE = re.compile(r"(Plus de \d+ relations)")
+
+def split_header(text):
+    # Repère une seule fois l'ancre "relation de Ne" et découpe la suite autour de "Coordonnées"
+    # Retourne (relation, texte après la relation, texte avant "Coordonnées" ou None)
+    relation_search = RELATION_RE.search(text)
+    if not relation_search:
+        return "", None, None
+    substring = text[relation_search.end():].strip()
+    coord_pos = substring.find("Coordonnées")
+    before_coord = substring[:coord_pos].strip() if coord_pos != -1 else None
+    return relation_search.group(1).strip(), substring, before_coord
+
+def extract_name(text):
+    match = NAME_RE.match(text)
+    return match.group(1).strip() if match else ""
+
+def extract_relation(text):
+    return split_header(text)[0]
+
+def title_from_header(substring, before_coord):
+    if substring is None:
+        return ""
+    if before_coord is not None:
+        substring = before_coord
+
+    if "|" in substring:
+        substring = substring.rsplit("|", 1)[0].strip()
+
+    substring = NIVEAU_RE.sub("", substring)
+    return substring.strip()
+
+def extract_title(text):
+    _, substring, before_coord = split_header(text)
+    return title_from_header(substring, before_coord)
+
+def location_from_header(text, before_coord):
+    if before_coord is not None:
+        if "|" in before_coord:
+            loc_candidate = before_coord.rsplit("|", 1)[-1].strip()
+            if len(loc_candidate.split()) <= 6:
+                instrument.count("localisation : après le dernier |")
+                return loc_candidate
+
+        parts = MULTI_SPACE_RE.split(before_coord)
+        if len(parts) > 1:
+            loc_candidate = parts[-1].strip()
+            if len(loc_candidate.split()) <= 6:
+                instrument.count("localisation : après un double espace")
+                return loc_candidate
+
+        if len(before_coord.split()) <= 6:
+            instrument.count("localisation : tout l'avant-Coordonnées")
+            return before_coord
+
+    instrument.count("localisation : repli sur le texte brut")
+    return location_before_coordonnees(text)
+
+def location_before_coordonnees(text):
+    # Équivaut à re.search(r"([A-Za-zÀ-ÿ\s,.\-]{2,})Coordonnées", text) en temps linéaire
+    if "Coordonnées" not in text:
+        return ""
+    for run in LOCATION_RUN_RE.finditer(text):
+        coord_pos = text.rfind("Coordonnées", run.start() + 2, run.end())
+        if coord_pos != -1:
+            return text[run.start():coord_pos].strip()
+    return ""
+
+def extract_location(text):
+    _, _, before_coord = split_header(text)
+    return location_from_header(text, before_coord)
+
+def extract_country(text):
+    country = resolve_country(text)
+    if not country:
+        instrument.count("pays : introuvable")
+    return country
+
+def extract_link(text):
+    match = LINK_RE.search(text)
+    return match.group(1).strip() if match else ""
+
+def extract_followers(text):
+    # Équivaut à re.search(r"(\d[\d\s]* abonnés)", text) en temps linéaire
+    if FOLLOWERS_ANCHOR not in text:
+        return ""
+    for run in FOLLOWERS_RUN_RE.finditer(text):
+        anchor_pos = text.rfind(FOLLOWERS_ANCHOR, run.start() + 1, run.end() - 1 + len(FOLLOWERS_ANCHOR))
+        if anchor_pos != -1:
+            return text[run.start():anchor_pos + len(FOLLOWERS_ANCHOR)].strip()
+    return ""
+
+def extract_connections(text):
+    match = CONNECTIONS_RE.search(text)
+    return match.group(1).strip() if match else ""
+
+def parse_one_profile(text):
+    clean_text = text.replace("\n", " ").strip()
+    # Une seule recherche de la relation, partagée entre titre et localisation
+    relation, substring, before_coord = split_header(clean_text)
+    location = location_from_header(clean_text, before_coord)
+    if not relation:
+        instrument.count("en-tête : relation introuvable")
+    return {
+        "Nom": extract_name(clean_text),
+        "Relation": relation,
+        "Titre": title_from_header(substring, before_coord),
+        "Localisation": location,
+        "Pays": extract_country(location),
+        "Lien": extract_link(clean_text),
+        "Abonnés": extract_followers(clean_text),
+        "Relations": extract_connections(clean_text),
+    }
@@ -0,0 +1,58 @@
+"""Temps d'import des modules du paquet, mesuré chacun dans un interpréteur neuf.
+
+    python -m linkedin_tools.import_budget
+
+Sort en erreur (code 1) si un module dépasse IMPORT_BUDGET_MS ou charge au passage une
+dépendance lourde : elles ne doivent être importées qu'à l'usage.
+"""
+import subprocess
+import sys
+
+MODULES = [
+    "linkedin_tools.header",
+    "linkedin_tools.reactions",
+    "linkedin_tools.posts",
+    "linkedin_tools.org_people",
+    "linkedin_tools.profile_page",
+    "linkedin_tools.experiences",
+    "linkedin_tools.profile_zip",
+    "linkedin_tools.tagging",
+    "linkedin_tools.dedup",
+    "linkedin_tools.dates",
+    "linkedin_tools.exports",
+    "linkedin_tools.export_jobs",
+    "linkedin_tools.xlsx_stream",
+    "linkedin_tools.sqlite_store",
+    "linkedin_tools.cli",
+]
+HEAVY_MODULES = ["streamlit", "pandas", "numpy", "openpyxl", "xlsxwriter"]
+IMPORT_BUDGET_MS = 50
+
+def measure_import(modules):
+    # (durée en ms, dépendances lourdes chargées) pour l'import de `modules`, hors démarrage
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        + "".join(f"import {m}\n" for m in modules)
+        + "elapsed = (time.perf_counter() - start) * 1000\n"
+        f"print(elapsed, *[h for h in {HEAVY_MODULES!r} if h in sys.modules])\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]), out[1:]
+
+def main():
+    failed = False
+    for label, modules in [(m, [m]) for m in MODULES] + [("(tout le paquet)", MODULES)]:
+        elapsed_ms, heavy = measure_import(modules)
+        over = elapsed_ms > IMPORT_BUDGET_MS or bool(heavy)
+        failed |= over
+        line = f"{label:<32} {elapsed_ms:7.1f} ms"
+        if heavy:
+            line += f"  importe {', '.join(heavy)}"
+        if over:
+            line += "  HORS BUDGET"
+        print(line)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+# Mesures à la demande : durée de chaque étape (analyse, DataFrame, affichage, export…) et
+# compteurs des branches des extracteurs (ex : quelle règle a trouvé la localisation).
+# Désactivé par défaut : stage() rend alors un contexte vide partagé et count() ne fait qu'une
+# lecture de ContextVar. Le rapport actif est propre au contexte courant (un rerun Streamlit
+# tourne dans son propre thread), donc deux sessions ne mélangent pas leurs mesures.
+
+_report = ContextVar("linkedin_tools_report", default=None)
+NULL_STAGE = nullcontext()
+
+def new_report():
+    # stages : {étape: [appels, secondes cumulées, secondes max]} ; counters : {compteur: n}
+    return {"stages": {}, "counters": {}}
+
+def activate(report):
+    # report=None désactive les mesures pour le contexte courant
+    _report.set(report)
+
+def current():
+    return _report.get()
+
+@contextmanager
+def _timed(report, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        entry = report["stages"].setdefault(name, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] = max(entry[2], elapsed)
+
+def stage(name):
+    report = _report.get()
+    return NULL_STAGE if report is None else _timed(report, name)
+
+def count(name, n=1):
+    report = _report.get()
+    if report is not None:
+        counters = report["counters"]
+        counters[name] = counters.get(name, 0) + n
+
+def bind(func, *args):
+    # Appel différé (export généré au clic) rattaché au rapport actif au moment de sa création
+    report = _report.get()
+    if report is None:
+        return lambda: func(*args)
+
+    def call():
+        token = _report.set(report)
+        try:
+            return func(*args)
+        finally:
+            _report.reset(token)
+    return call
+
+def to_rows(report):
+    rows = [
+        {"Mesure": name, "Type": "étape", "Appels": calls, "Total (ms)": round(total * 1000, 3), "Max (ms)": round(longest * 1000, 3)}
+        for name, (calls, total, longest) in report["stages"].items()
+    ]
+    rows += [
+        {"Mesure": name, "Type": "compteur", "Appels": n, "Total (ms)": None, "Max (ms)": None}
+        for name, n in sorted(report["counters"].items())
+    ]
+    return rows
+
+def to_json(report):
+    return json.dumps({
+        "stages": {name: {"calls": calls, "total_s": total, "max_s": longest} for name, (calls, total, longest) in report["stages"].items()},
+        "counters": report["counters"],
+    }, ensure_ascii=False, indent=2)
@@ -0,0 +1,82 @@
+from . import instrument
+
+# Pré-passe de l'analyse des expériences d'un profil complet (experiences). Le copier-coller
+# double presque chaque libellé : "InternIntern", "Asmir KhanAsmir Khan". La section est découpée
+# en blocs "Logo de …" comme le faisaient les apps d'origine, et les lignes de chaque bloc sont
+# dédoublées dans le même parcours : les expressions régulières des parsers tournent ensuite sur
+# ces lignes deux fois plus courtes (search_pasted), et la ligne collée n'est reconstruite que là
+# où le parser d'origine la rendait telle quelle (entreprise). Les lignes identiques consécutives
+# (poste répété, puces répétées) restent distinctes : leur sortie ne change pas.
+# profile_page (app4) ne lit que trois lignes par bloc : dédoubler tout le bloc lui coûterait plus
+# que ce que ses trois recherches y gagnent, il garde le découpage d'origine.
+
+def undouble(line):
+    # (libellé, 1) si la ligne est un libellé doublé, sinon (line, 0). Un libellé doublé
+    # recommence à mi-chemin par son premier caractère : le test évite de découper les autres lignes
+    half = len(line) >> 1
+    if half and line[half] == line[0] and line[:half] == line[half:]:
+        return line[:half], 1
+    return line, 0
+
+def pasted_line(lines, doubled, k):
+    # Ligne k telle que collée (sans espaces autour), libellé doublé compris
+    return lines[k] + lines[k] if doubled[k] else lines[k]
+
+def search_pasted(pattern, line, was_doubled, needle):
+    """pattern.search sur la ligne telle que collée, en ne lisant que le libellé dédoublé tant
+    qu'il suffit.
+
+    Pour un motif sans ancre ni assertion (CONTRAT_RE, DATE_RANGE_RE), une correspondance trouvée
+    dans le libellé est aussi la première de la ligne doublée : aucune ne peut commencer plus tôt
+    en débordant sur la seconde copie. Sans correspondance, la ligne doublée n'est relue que si
+    elle contient `needle`, caractère présent dans toute correspondance du motif ("·", "-") : le
+    motif pourrait alors chevaucher les deux copies.
+    """
+    match = pattern.search(line)
+    if match is None and was_doubled and needle in line:
+        match = pattern.search(line + line)
+    return match
+
+def split_lines(text):
+    # Lignes non vides, sans espaces autour, telles que collées : pour les parsers qui lisent les
+    # libellés doublés tels quels (org_people)
+    return [line for line in map(str.strip, text.split("\n")) if line]
+
+def repeated_line(text):
+    # Première ligne collée deux fois de suite (nom affiché deux fois…), ou None ; le parcours
+    # s'arrête dès qu'elle est trouvée (le nom est en tête du collage)
+    previous = None
+    for line in map(str.strip, text.split("\n")):
+        if line:
+            if line == previous:
+                return line
+            previous = line
+    return None
+
+def iter_blocs(text, marker="Logo de "):
+    """Blocs ouverts par `marker` dans `text`, comme re.split(marker) : un marqueur en milieu de
+    ligne coupe la ligne, ce qui le précède reste dans le bloc précédent. Ce qui précède le
+    premier marqueur est ignoré.
+
+    Chaque bloc est un couple de listes parallèles (lignes, doubled) : ses lignes non vides, sans
+    espaces autour, un libellé doublé ramené à un seul exemplaire, et 1 dans doubled pour une
+    ligne qui était un libellé doublé (voir pasted_line).
+    """
+    counting = instrument.current() is not None
+    for piece in text.split(marker)[1:]:
+        lines = []
+        doubled = bytearray()
+        for raw in piece.split("\n"):
+            stripped = raw.strip()
+            if stripped:
+                # undouble() en ligne : cette boucle passe sur chaque ligne de la section
+                half = len(stripped) >> 1
+                if half and stripped[half] == stripped[0] and stripped[:half] == stripped[half:]:
+                    lines.append(stripped[:half])
+                    doubled.append(1)
+                else:
+                    lines.append(stripped)
+                    doubled.append(0)
+        if counting:
+            instrument.count("normalisation : libellés doublés", doubled.count(1))
+        yield lines, doubled
@@ -0,0 +1,64 @@
+import re
+
+from . import instrument
+from .normalize import split_lines
+
+# Page "Personnes" d'une organisation LinkedIn collée : un profil (nom, description) par
+# membre, "Utilisateur LinkedIn" compris.
+
+# Les mots sont séparés par un seul espace absent de la classe de caractères : le découpage
+# est donc sans ambiguïté et la correspondance reste linéaire en la longueur de la ligne.
+NAME_LINE_RE = re.compile(r"^[A-ZÀ-Ÿ][a-zà-ÿA-ZÀ-Ÿ\-']+( [A-ZÀ-Ÿ][a-zà-ÿA-ZÀ-Ÿ\-']+)+$")
+
+def is_name(line):
+    # Détecte si une ligne ressemble à un nom complet (2+ mots commençant par majuscule)
+    # Exemple simple : "Ieva Gaigala"
+    return bool(NAME_LINE_RE.match(line.strip()))
+
+# Nature de chaque ligne, calculée une seule fois
+OTHER, NAME, LINKEDIN_USER = 0, 1, 2
+
+def classify_lines(lines):
+    # Un octet par ligne ; les lignes qui reviennent (descriptions communes) ne sont testées qu'une fois
+    kinds = bytearray(len(lines))
+    known = {}
+    for i, line in enumerate(lines):
+        kind = known.get(line)
+        if kind is None:
+            if line == "Utilisateur LinkedIn":
+                kind = LINKEDIN_USER
+            elif is_name(line):
+                kind = NAME
+            else:
+                kind = OTHER
+            known[line] = kind
+        kinds[i] = kind
+    return kinds
+
+def extract_profiles(text):
+    lines = split_lines(text)
+    kinds = classify_lines(lines)
+    profiles = []
+    i = 0
+    n = len(lines)
+    while i < n:
+        if kinds[i] == OTHER:
+            i += 1
+            continue
+
+        # "Utilisateur LinkedIn" est traité comme un nom de profil ; un nom affiché deux fois de
+        # suite ne compte qu'une fois
+        name = lines[i]
+        if kinds[i] == NAME and i + 1 < n and lines[i + 1] == name:
+            i += 2
+        else:
+            i += 1
+
+        # Description : lignes jusqu'au prochain nom (ou "Utilisateur LinkedIn") ou la fin
+        start = i
+        while i < n and kinds[i] == OTHER:
+            i += 1
+        profiles.append({"Profil": name, "Description": " | ".join(lines[start:i])})
+    if instrument.current() is not None:
+        instrument.count("personnes : Utilisateur LinkedIn", kinds.count(LINKEDIN_USER))
+    return profiles
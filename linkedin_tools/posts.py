@@ -0,0 +1,181 @@
+import hashlib
+import re
+from array import array
+from itertools import chain, repeat
+
+from . import instrument
+from .dates import is_date_line
+
+# Post LinkedIn collé (auteur, date relative, texte) et liste de ses réactions. La date absolue
+# est résolue plus tard, en lot, par dates.resolve_relative_dates.
+
+# Extraction du post : 
+# on retire la partie "Il y a X • Visible..." du début
+def clean_post_text(text):
+    # Supprime la partie "Il y a ... • Visible de tous sur LinkedIn et en dehors"
+    text = re.sub(r"^Il y a [^•]+\s*•\s*Visible de tous sur LinkedIn et en dehors\s*", "", text, flags=re.I)
+    return text.strip()
+
+def parse_post(raw_post):
+    if not raw_post:
+        return {
+            "Auteur": "",
+            "Date relative": "",
+            "Post": ""
+        }
+
+    # Extraction auteur = première ligne sans "Lien graphique..."
+    lines = raw_post.split('\n')
+    # Auteur : on récupère la 2e ligne (car la 1ère est souvent "Lien graphique pour ...")
+    author = ""
+    for line in lines:
+        if line.strip() and not line.lower().startswith("lien graphique"):
+            author = line.strip()
+            break
+
+    # Extraction date relative (ex: "Il y a 3 jours • Visible de tous ..." ou "3d • ...") : 1ère ligne de date
+    # La date absolue est résolue plus tard, en lot, pour tous les posts (voir to_excel)
+    date_relative = None
+    for line in lines:
+        if is_date_line(line):
+            date_relative = line.strip()
+            break
+
+    # Nettoyer le texte du post
+    post_text = clean_post_text(raw_post)
+
+    return {
+        "Auteur": author,
+        "Date relative": date_relative if date_relative else "",
+        "Post": post_text
+    }
+
+# Extraction des réactions
+# Types reconnus, dans l'ordre des catégories de la colonne "Reaction" (support & insightful sont
+# d'autres réactions possibles sur LinkedIn)
+REACTION_TYPES = ["Like", "Love", "Celebrate", "Funny", "Support", "Insightful"]
+_REACTION_CODES = {t.lower(): code for code, t in enumerate(REACTION_TYPES)}
+VIEW_PROFILE_RE = re.compile(r"Voir le profil de .*")
+
+def iter_reactions(raw_text):
+    # (code du type dans REACTION_TYPES, nom, position, info) de chaque réaction complète
+    lines = raw_text.strip().split('\n')
+    idx = 0
+    while idx < len(lines):
+        code = _REACTION_CODES.get(lines[idx].strip().lower())
+        if code is None:
+            idx += 1
+            continue
+        # Le type est suivi du nom, de la position / réseau et d'une info (souvent une ligne,
+        # peut être vide) : une réaction tronquée en fin de collage est ignorée
+        if idx + 3 >= len(lines):
+            break
+        # Enlever "Voir le profil de" du nom si présent
+        name = VIEW_PROFILE_RE.sub("", lines[idx + 1].strip()).strip()
+        yield code, name, lines[idx + 2].strip(), lines[idx + 3].strip()
+        idx += 4
+
+def parse_reactions(raw_text):
+    return [
+        {"Reaction": REACTION_TYPES[code], "Name": name, "Position": position, "Info": info}
+        for code, name, position, info in iter_reactions(raw_text)
+    ]
+
+def new_reaction_columns():
+    """Tampons colonnaires des réactions d'un post, remplis par add_reactions.
+
+    "Post n°" et "Reaction" (code dans REACTION_TYPES) sont des tableaux d'entiers ; Position est
+    codée dans le dictionnaire "positions" (chaque intitulé distinct n'est gardé qu'une fois) ;
+    Name et Info sont des listes.
+    """
+    return {"Post n°": array("i"), "Reaction": array("b"), "Name": [], "Position": array("i"), "Info": [], "positions": {}}
+
+def add_reactions(columns, raw_text, post_number):
+    # Analyse un collage de réactions directement dans les colonnes, sans dict par réaction ;
+    # renvoie le nombre de réactions ajoutées
+    positions = columns["positions"]
+    start = len(columns["Name"])
+    for code, name, position, info in iter_reactions(raw_text):
+        columns["Reaction"].append(code)
+        columns["Name"].append(name)
+        columns["Position"].append(positions.setdefault(position, len(positions)))
+        columns["Info"].append(info)
+    added = len(columns["Name"]) - start
+    columns["Post n°"].extend(repeat(post_number, added))
+    return added
+
+def reaction_rows(columns):
+    # (Reaction, Name, Position, Info) de chaque réaction des tampons, pour l'enregistrement
+    positions = list(columns["positions"])
+    return zip(
+        (REACTION_TYPES[code] for code in columns["Reaction"]),
+        columns["Name"],
+        (positions[code] for code in columns["Position"]),
+        columns["Info"],
+    )
+
+# ---------- Saisies d'app2-2 : analyse gardée d'un rerun à l'autre ----------
+
+def text_digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+def new_post_slot():
+    # Analyse d'une saisie (post et réactions) : textes analysés et leur empreinte, résultats, et
+    # numéro de la ligne enregistrée en base
+    return {
+        "post_text": None, "post_key": None, "post": None,
+        "reac_text": None, "reac_key": None, "reactions": None,
+        "post_id": None,
+    }
+
+def refresh_post_slot(slot, raw_post, raw_reac, post_number):
+    """Met à jour l'analyse d'une saisie : seul un texte modifié depuis le dernier appel est
+    réanalysé (réactions directement en colonnes, avec le numéro du post).
+
+    Les textes sont comparés tels quels à ceux du dernier appel (souvent le même objet, sinon
+    une comparaison de mémoire) : l'empreinte n'est recalculée que pour un texte modifié.
+    Renvoie True si le post ou ses réactions ont changé.
+    """
+    # .get : une session ouverte avant l'ajout des textes aux cases les réanalyse une fois
+    changed = False
+    if slot.get("post_text") != raw_post:
+        with instrument.stage("analyse post"):
+            slot["post_text"], slot["post_key"], slot["post"] = raw_post, text_digest(raw_post), parse_post(raw_post)
+        changed = True
+    else:
+        instrument.count("post repris du cache de session")
+    if slot.get("reac_text") != raw_reac:
+        with instrument.stage("analyse réactions"):
+            slot["reac_text"], slot["reac_key"], slot["reactions"] = raw_reac, text_digest(raw_reac), new_reaction_columns()
+            add_reactions(slot["reactions"], raw_reac, post_number)
+        changed = True
+    else:
+        instrument.count("réactions reprises du cache de session")
+    return changed
+
+def reaction_frame(buffers):
+    """DataFrame (Reaction, Name, Position, Info, Post n°) des tampons de plusieurs posts, à la suite.
+
+    Reaction et Position sont des catégories construites sur les codes : seuls les tableaux
+    d'entiers sont mis bout à bout, les chaînes ne sont ni copiées ni regroupées en dicts.
+    """
+    import numpy as np
+    import pandas as pd
+
+    # Dictionnaires de positions des posts fusionnés : codes de chaque post renumérotés d'un coup
+    positions = {}
+    position_codes = [np.empty(0, dtype=np.int32)]
+    for columns in buffers:
+        mapping = np.array([positions.setdefault(p, len(positions)) for p in columns["positions"]], dtype=np.int32)
+        position_codes.append(mapping[np.frombuffer(columns["Position"], dtype=np.int32)])
+
+    def concat(column, dtype):
+        return np.concatenate([np.empty(0, dtype=dtype)] + [np.frombuffer(c[column], dtype=dtype) for c in buffers])
+
+    return pd.DataFrame({
+        "Reaction": pd.Categorical.from_codes(concat("Reaction", np.int8), categories=REACTION_TYPES),
+        "Name": pd.Series(list(chain.from_iterable(c["Name"] for c in buffers)), dtype=object),
+        "Position": pd.Categorical.from_codes(np.concatenate(position_codes), categories=pd.Index(list(positions), dtype=object)),
+        "Info": pd.Series(list(chain.from_iterable(c["Info"] for c in buffers)), dtype=object),
+        "Post n°": concat("Post n°", np.int32),
+    }, copy=False)
@@ -0,0 +1,65 @@
+import re
+
+from .normalize import undouble, repeated_line
+
+# Profil LinkedIn complet collé (Ctrl+A) : nom et expériences détaillées (contrat, dates, durée,
+# description). Seules trois lignes par bloc sont lues : les blocs sont découpés tels quels, sans
+# la pré-passe de normalize.iter_blocs, et seul le poste est dédoublé.
+
+def extract_name(text):
+    # Nom répété deux fois côte à côte (ex : Asmir KhanAsmir Khan)
+    name = repeated_line(text)
+    return "Nom inconnu" if name is None else name
+
+LOGO_MARKER = "Logo de "
+CONTRAT_RE = re.compile(r'·\s*(Stage|Temps plein|Temps partiel|CDI|CDD)', re.I)
+DATE_RANGE_RE = re.compile(r'(\w+\.? \d{4})\s*-\s*(aujourd’hui|\w+\.? \d{4})', re.I)
+DUREE_RE = re.compile(r'·\s*(\d+.*)$')
+
+def parse_experiences(section_text):
+    # Analyse le texte de la section Expérience (voir sections.index_sections)
+    experiences = []
+
+    for bloc in section_text.split(LOGO_MARKER)[1:]:  # ce qui précède le premier logo est ignoré
+        lines = [line for line in map(str.strip, bloc.split("\n")) if line]
+        entreprise = lines[0] if lines else ""
+
+        # Poste : ligne suivante, avec doublon probable
+        poste = undouble(lines[1])[0] if len(lines) > 1 else ""
+
+        # Contrat + dates : ligne suivante
+        type_contrat = ""
+        date_debut = ""
+        date_fin = ""
+        duree = ""
+        if len(lines) > 2:
+            contrat_line = lines[2]
+            contrat_match = CONTRAT_RE.search(contrat_line)
+            type_contrat = contrat_match.group(1) if contrat_match else ""
+
+            # Dates
+            date_match = DATE_RANGE_RE.search(contrat_line)
+            if date_match:
+                date_debut = date_match.group(1)
+                date_fin = date_match.group(2)
+
+            # Durée
+            duree_match = DUREE_RE.search(contrat_line)
+            if duree_match:
+                duree = duree_match.group(1)
+
+        # Description (lignes suivantes commençant par un tiret)
+        description_lines = [line.strip('- ').strip() for line in lines[3:] if line.startswith('-')]
+        description = " | ".join(description_lines) if description_lines else ""
+
+        experiences.append({
+            "Entreprise": entreprise,
+            "Poste": poste,
+            "Type de contrat": type_contrat,
+            "Date début": date_debut,
+            "Date fin": date_fin,
+            "Durée": duree,
+            "Description": description
+        })
+
+    return experiences
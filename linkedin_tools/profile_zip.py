@@ -0,0 +1,108 @@
+import os
+import re
+from collections import deque
+
+from .experiences import parse_full_profile
+
+# Import en lot de profils complets enregistrés en texte dans une archive zip : un fichier par
+# profil, l'URL du profil en option dans un fichier .url du même nom ("jean.txt" + "jean.url",
+# raccourci Internet ou simple lien). Les fichiers sont lus un à un dans l'archive et analysés
+# par parse_full_profile, par lots sur un pool de processus ; au plus deux lots par processus
+# sont en cours à la fois (comme cli.iter_rows), si bien que la mémoire de l'analyse ne dépend
+# pas du nombre de profils de l'archive, seulement de la taille d'un fichier. Reste le répertoire
+# de l'archive, que zipfile garde en mémoire (moins d'un Ko par fichier).
+
+URL_SUFFIX = ".url"
+# Un collage de profil fait quelques dizaines de Ko : au-delà, le fichier est écarté sans être lu
+MAX_MEMBER_BYTES = 5 * 1024 * 1024
+MAX_URL_BYTES = 64 * 1024
+# Fichiers envoyés ensemble à un processus, et lots en cours par processus
+BATCH_FILES = 16
+IN_FLIGHT_PER_WORKER = 2
+URL_RE = re.compile(r"https?://\S+", re.IGNORECASE)
+
+def _ignored(filename):
+    # Dossiers, métadonnées macOS et fichiers cachés
+    parts = filename.split("/")
+    return filename.endswith("/") or "__MACOSX" in parts or parts[-1].startswith(".")
+
+def _read_url(zf, filename):
+    try:
+        sidecar = zf.getinfo(os.path.splitext(filename)[0] + URL_SUFFIX)
+    except KeyError:
+        return ""
+    with zf.open(sidecar) as f:
+        match = URL_RE.search(f.read(MAX_URL_BYTES).decode("utf-8", errors="replace"))
+    return match.group(0) if match else ""
+
+def iter_members(archive):
+    """(fichier, texte, URL, erreur) de chaque profil de l'archive (chemin ou fichier ouvert),
+    lus un à un ; texte None quand le fichier est écarté (erreur renseignée)."""
+    import zipfile
+
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            if _ignored(info.filename) or info.filename.lower().endswith(URL_SUFFIX):
+                continue
+            url = _read_url(zf, info.filename)
+            if info.file_size > MAX_MEMBER_BYTES:
+                yield info.filename, None, url, f"fichier trop volumineux ({info.file_size} octets)"
+                continue
+            with zf.open(info) as f:
+                text = f.read(MAX_MEMBER_BYTES).decode("utf-8", errors="replace")
+            yield info.filename, text, url, None
+
+def _parse(text):
+    # (profil ou None, erreur) : une erreur d'analyse n'interrompt pas le lot
+    try:
+        return parse_full_profile(text), None
+    except Exception as exc:
+        return None, f"analyse impossible ({exc})"
+
+def parse_batch(texts):
+    # Tâche d'un processus du pool : un lot de fichiers, pour amortir les échanges entre processus
+    return [_parse(text) for text in texts]
+
+def _result(filename, url, profile, error):
+    if error is None and profile is None:
+        error = "section Expérience introuvable"
+    name, records = profile if error is None else ("", [])
+    return {"Fichier": filename, "Nom": name, "Lien": url, "Expériences": records, "Erreur": error}
+
+def _batches(members, size):
+    batch = []
+    for member in members:
+        batch.append(member)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _collect(members, future):
+    # Résultats d'un lot, dans l'ordre de ses fichiers (les fichiers écartés n'ont pas été envoyés)
+    outcomes = iter(future.result())
+    for filename, url, error in members:
+        profile, error = next(outcomes) if error is None else (None, error)
+        yield _result(filename, url, profile, error)
+
+def iter_profiles(archive, workers=1, batch_files=BATCH_FILES):
+    """Profils analysés de l'archive, dans l'ordre des fichiers : {"Fichier", "Nom", "Lien",
+    "Expériences", "Erreur"} ("Erreur" vaut None pour un profil lu)."""
+    members = iter_members(archive)
+    if workers <= 1:
+        for filename, text, url, error in members:
+            profile, error = _parse(text) if error is None else (None, error)
+            yield _result(filename, url, profile, error)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in _batches(members, batch_files):
+            texts = [text for _, text, _, error in batch if error is None]
+            pending.append(([(filename, url, error) for filename, _, url, error in batch], pool.submit(parse_batch, texts)))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                yield from _collect(*pending.popleft())
+        while pending:
+            yield from _collect(*pending.popleft())
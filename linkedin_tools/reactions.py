@@ -0,0 +1,61 @@
+import re
+
+from . import instrument
+
+# Réactions d'un post LinkedIn collées en texte brut (type, nom, position réseau, infos),
+# analysées au fil de l'eau : une réaction produite dès qu'elle est complète.
+
+REACTION_TYPES = ["like", "celebrate", "love", "funny", "insightful"]  # types courants de réactions LinkedIn
+POSITION_RE = re.compile(r"(network|niveau|et|\d+)", re.IGNORECASE)
+COLUMNS = ["Réaction", "Nom", "Position réseau", "Infos complémentaires"]
+
+REACTION_SET = frozenset(REACTION_TYPES)
+
+def iter_lines(stream):
+    # Lignes d'un fichier texte lu au fil de l'eau, découpées comme str.splitlines()
+    for physical_line in stream:
+        yield from physical_line.splitlines()
+
+def iter_reactions(lines):
+    # Générateur : consomme les lignes une à une et produit chaque réaction dès qu'elle est
+    # complète. Seules les lignes de la réaction en cours sont gardées en mémoire.
+    lines = (line.strip() for line in lines)
+    lines = (line for line in lines if line != "")
+    line = next(lines, None)
+    while line is not None:
+        # 1) type de réaction
+        reaction = line.lower()
+        if reaction not in REACTION_SET:
+            line = next(lines, None)
+            continue
+
+        # 2) nom (nettoyage pour enlever "Voir le profil de ...")
+        name_line = next(lines, None)
+        if name_line is None:
+            break
+        name = name_line.split("Voir le profil de")[0].strip()
+        line = next(lines, None)
+
+        # 3) position réseau (ex: Out of network · 3e et +)
+        position = ""
+        if line is not None and POSITION_RE.search(line):
+            position = line
+            line = next(lines, None)
+        else:
+            instrument.count("réactions : position réseau absente")
+
+        # 4) infos complémentaires (jusqu'à la prochaine réaction ou fin)
+        info_lines = []
+        while line is not None and line.lower() not in REACTION_SET:
+            info_lines.append(line)
+            line = next(lines, None)
+
+        yield {
+            "Réaction": reaction,
+            "Nom": name,
+            "Position réseau": position,
+            "Infos complémentaires": " || ".join(info_lines)
+        }
+
+def parse_reactions(raw_text):
+    return list(iter_reactions(raw_text.splitlines()))
@@ -0,0 +1,52 @@
+import re
+
+# Index des sections d'un profil LinkedIn collé en entier. Au copier-coller, chaque titre de
+# section apparaît doublé ("ExpérienceExpérience", "FormationFormation"…) : un seul parcours
+# du texte relève la position de tous ces titres, et chaque section court jusqu'au titre suivant.
+
+# Titre tel qu'il apparaît -> nom canonique de la section
+SECTION_TITLES = {
+    "Infos": "Infos",
+    "About": "Infos",
+    "Activité": "Activité",
+    "Activity": "Activité",
+    "Expérience": "Expérience",
+    "Experience": "Expérience",
+    "Formation": "Formation",
+    "Education": "Formation",
+    "Licences et certifications": "Licences et certifications",
+    "Licenses & certifications": "Licences et certifications",
+    "Bénévolat": "Bénévolat",
+    "Volunteering": "Bénévolat",
+    "Compétences": "Compétences",
+    "Skills": "Compétences",
+    "Recommandations": "Recommandations",
+    "Recommendations": "Recommandations",
+    "Projets": "Projets",
+    "Projects": "Projets",
+    "Publications": "Publications",
+    "Distinctions et prix": "Distinctions et prix",
+    "Honors & awards": "Distinctions et prix",
+    "Langues": "Langues",
+    "Languages": "Langues",
+    "Centres d’intérêt": "Centres d’intérêt",
+    "Centres d'intérêt": "Centres d’intérêt",
+    "Interests": "Centres d’intérêt",
+}
+
+SECTION_HEADER_RE = re.compile(
+    "(" + "|".join(re.escape(t) for t in sorted(SECTION_TITLES, key=len, reverse=True)) + r")\1"
+)
+
+def index_sections(text):
+    """Renvoie {section: (début, fin)} : positions du contenu de chaque section dans `text`.
+
+    Le contenu commence juste après le titre doublé et s'arrête au titre doublé suivant (ou à
+    la fin du texte). Si une section apparaît plusieurs fois, la première occurrence est gardée.
+    """
+    headers = [(m.start(), m.end(), SECTION_TITLES[m.group(1)]) for m in SECTION_HEADER_RE.finditer(text)]
+    sections = {}
+    for k, (_, content_start, name) in enumerate(headers):
+        content_end = headers[k + 1][0] if k + 1 < len(headers) else len(text)
+        sections.setdefault(name, (content_start, content_end))
+    return sections
@@ -0,0 +1,466 @@
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from .dedup import profile_keys, band_hashes, shingles, jaccard, match_rows, FUZZY_THRESHOLD, MAX_BUCKET
+from .header import COLUMNS as PROFILE_COLUMNS
+
+# Stockage persistant (SQLite, bibliothèque standard) des profils, expériences, posts et
+# réactions collectés par les apps : rien n'est perdu au rafraîchissement de la page, et
+# l'historique n'a pas à tenir en mémoire. Chaque collecte (session d'une app, retrouvée par
+# son identifiant) a son propre fichier : l'historique, les exports et la réinitialisation d'une
+# session ne touchent jamais aux données d'une autre. Les apps écrivent au fil de l'eau et n'en relisent
+# que des pages (LIMIT/OFFSET sur des colonnes indexées) ; les exports parcourent les requêtes
+# par lots (iter_query). Le repérage des doublons (voir dedup) se fait aussi en base : liens et
+# clés de nom sont indexés, et les bandes MinHash rangées dans profile_bands.
+# Les expériences de tous les profils forment une seule table longue, repérée par le numéro de
+# profil ; Entreprise et Type de contrat y sont des codes (tables companies et contract_types),
+# relus en colonnes catégorielles pandas par experiences_frame.
+
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".cache", "linkedin-tools")
+# Un fichier par collecte, nommé par un identifiant aléatoire (qui sert aussi de clé d'accès)
+COLLECTIONS_DIR = os.environ.get("LINKEDIN_TOOLS_COLLECTIONS", os.path.join(DATA_DIR, "collectes"))
+COLLECTION_ID_RE = re.compile(r"[0-9a-f]{32}")
+# Une collecte ni rouverte ni modifiée depuis ce nombre de jours est supprimée (prune_collections)
+COLLECTION_MAX_AGE_DAYS = 30
+PAGE_ROWS = 50
+BATCH_ROWS = 1000
+
+# Provenance d'un profil : en-tête collé (app.py) ou profil complet (app-4-2)
+HEADER_SOURCE = "en-tête"
+FULL_PROFILE_SOURCE = "profil complet"
+# Groupes de tables dont la version (voir data_version) change à chaque écriture
+PROFILES_SCOPE = "profils"
+POSTS_SCOPE = "posts"
+
+EXPERIENCE_COLUMNS = ["Entreprise", "Poste", "Type de contrat", "Date début", "Date fin", "Année début", "Année fin"]
+POST_COLUMNS = ["Auteur", "Date relative", "Date exacte", "Post"]
+REACTION_COLUMNS = ["Reaction", "Name", "Position", "Info"]
+# Colonne catégorielle -> (table des valeurs distinctes, colonne de code dans experiences)
+EXPERIENCE_CATEGORIES = {"Entreprise": ("companies", "company_id"), "Type de contrat": ("contract_types", "contract_id")}
+_EXPERIENCE_CODES = [code for _, code in EXPERIENCE_CATEGORIES.values()]
+_EXPERIENCE_VALUES = [c for c in EXPERIENCE_COLUMNS if c not in EXPERIENCE_CATEGORIES]
+
+def _columns(columns):
+    return ", ".join(f'"{c}"' for c in columns)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    {", ".join(f'"{c}" TEXT' for c in PROFILE_COLUMNS)},
+    link_key TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    added_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_source ON profiles(source);
+CREATE INDEX IF NOT EXISTS profiles_link ON profiles(source, link_key);
+CREATE INDEX IF NOT EXISTS profiles_name ON profiles(source, name_key);
+CREATE TABLE IF NOT EXISTS profile_bands (
+    source TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS profile_bands_hash ON profile_bands(source, band, hash);
+CREATE INDEX IF NOT EXISTS profile_bands_profile ON profile_bands(profile_id);
+CREATE TABLE IF NOT EXISTS duplicates (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    other_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    "Motif" TEXT,
+    "Score" REAL
+);
+CREATE INDEX IF NOT EXISTS duplicates_profile ON duplicates(profile_id);
+CREATE INDEX IF NOT EXISTS duplicates_other ON duplicates(other_id);
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    "Entreprise" TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS contract_types (
+    id INTEGER PRIMARY KEY,
+    "Type de contrat" TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS experiences (
+    id INTEGER PRIMARY KEY,
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    company_id INTEGER REFERENCES companies(id),
+    contract_id INTEGER REFERENCES contract_types(id),
+    {_columns(_EXPERIENCE_VALUES)}
+);
+CREATE INDEX IF NOT EXISTS experiences_profile ON experiences(profile_id);
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    digest BLOB NOT NULL UNIQUE,
+    {", ".join(f'"{c}" TEXT' for c in POST_COLUMNS)},
+    added_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reactions (
+    id INTEGER PRIMARY KEY,
+    post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+    {", ".join(f'"{c}" TEXT' for c in REACTION_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS reactions_post ON reactions(post_id);
+CREATE INDEX IF NOT EXISTS reactions_type ON reactions("Reaction");
+CREATE TABLE IF NOT EXISTS versions (
+    scope TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+PROFILES_QUERY = f'SELECT id AS "N°", {_columns(PROFILE_COLUMNS)} FROM profiles WHERE source = ? ORDER BY id'
+PROFILE_NAMES_QUERY = 'SELECT id, "Nom", "Lien" FROM profiles WHERE source = ? ORDER BY id'
+# Colonnes d'EXPERIENCE_COLUMNS, les codes remplacés par leurs valeurs
+_EXPERIENCE_SELECT = ", ".join(f'{EXPERIENCE_CATEGORIES[c][0]}."{c}"' if c in EXPERIENCE_CATEGORIES else f'e."{c}"' for c in EXPERIENCE_COLUMNS)
+_EXPERIENCE_JOINS = " ".join(f"LEFT JOIN {table} ON {table}.id = e.{code}" for table, code in EXPERIENCE_CATEGORIES.values())
+EXPERIENCES_QUERY = f"SELECT {_EXPERIENCE_SELECT} FROM experiences e {_EXPERIENCE_JOINS} WHERE e.profile_id = ? ORDER BY e.id"
+# Table longue de toutes les expériences d'une provenance, avec le numéro et le nom du profil
+EXPERIENCES_EXPORT_QUERY = (
+    f'SELECT e.profile_id AS "N°", p."Nom", {_EXPERIENCE_SELECT} FROM experiences e JOIN profiles p ON p.id = e.profile_id '
+    f"{_EXPERIENCE_JOINS} WHERE p.source = ? ORDER BY e.profile_id, e.id"
+)
+# Mêmes lignes, codes non résolus ; filtre et tri complétés par experiences_frame
+EXPERIENCE_CODES_QUERY = (
+    f"SELECT e.profile_id, {', '.join(_EXPERIENCE_CODES)}, {_columns(_EXPERIENCE_VALUES)} "
+    "FROM experiences e JOIN profiles p ON p.id = e.profile_id WHERE p.source = ?"
+)
+POSTS_QUERY = f'SELECT id AS "Post n°", {_columns(POST_COLUMNS)} FROM posts ORDER BY id'
+REACTIONS_QUERY = f'SELECT post_id AS "Post n°", {_columns(REACTION_COLUMNS)} FROM reactions ORDER BY id'
+REACTIONS_BY_TYPE_QUERY = f'SELECT post_id AS "Post n°", {_columns(REACTION_COLUMNS)} FROM reactions WHERE "Reaction" = ? ORDER BY id'
+DUPLICATES_QUERY = """
+SELECT d.profile_id AS "N°", p."Nom" AS "Nom", d.other_id AS "Doublon de", o."Nom" AS "Nom existant", d."Motif", d."Score"
+FROM duplicates d JOIN profiles p ON p.id = d.profile_id JOIN profiles o ON o.id = d.other_id
+WHERE p.source = ? ORDER BY d.rowid
+"""
+
+def new_collection_id():
+    return secrets.token_hex(16)
+
+def is_collection_id(value):
+    return bool(COLLECTION_ID_RE.fullmatch(value or ""))
+
+def collection_path(collection_id):
+    # L'identifiant peut venir de l'URL : vérifié avant d'en faire un nom de fichier
+    if not is_collection_id(collection_id):
+        raise ValueError(f"identifiant de collecte invalide : {collection_id!r}")
+    return os.path.join(COLLECTIONS_DIR, f"{collection_id}.sqlite3")
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+def touch_collection(collection_id):
+    # La date de modification du fichier sert de date de dernière ouverture de la collecte
+    path = collection_path(collection_id)
+    if os.path.exists(path):
+        os.utime(path)
+
+def _last_use(path):
+    # Dernière ouverture ou écriture : en mode WAL, les écritures vont d'abord dans le fichier -wal
+    times = []
+    for suffix in ("", "-wal"):
+        try:
+            times.append(os.stat(path + suffix).st_mtime)
+        except FileNotFoundError:
+            pass
+    return max(times, default=None)
+
+def prune_collections(max_age_days=COLLECTION_MAX_AGE_DAYS, keep=None, collections_dir=COLLECTIONS_DIR):
+    """Supprime les collectes ni rouvertes (touch_collection) ni modifiées depuis max_age_days
+    jours, fichiers -wal et -shm compris ; keep (la collecte de la session) n'est jamais
+    supprimée. Renvoie le nombre de collectes supprimées."""
+    if not os.path.isdir(collections_dir):
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for name in os.listdir(collections_dir):
+        collection_id, extension = os.path.splitext(name)
+        if extension != ".sqlite3" or not is_collection_id(collection_id) or collection_id == keep:
+            continue
+        path = os.path.join(collections_dir, name)
+        last_use = _last_use(path)
+        if last_use is None or last_use >= cutoff:
+            continue
+        with _init_lock:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(path + suffix)
+                except FileNotFoundError:
+                    pass  # supprimé entre-temps par une autre session
+            # Un identifiant réutilisé (ancienne URL) retrouve une base neuve, schéma compris
+            _initialized.discard(path)
+        removed += 1
+    return removed
+
+def connect(path):
+    """Connexion à la base `path` (créée au besoin ; ":memory:" pour une base en mémoire),
+    utilisable depuis un autre thread que celui qui l'a ouverte : les exports différés de
+    st.download_button tournent hors du thread du rerun."""
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    # Schéma et mode WAL (lectures pendant une écriture) une fois par processus et par fichier
+    with _init_lock:
+        if path == ":memory:" or path not in _initialized:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SCHEMA)
+            _initialized.add(path)
+    return conn
+
+def now():
+    return datetime.now().isoformat(timespec="seconds")
+
+def _bump(conn, scope):
+    # À appeler dans la transaction de l'écriture
+    conn.execute("INSERT INTO versions (scope, version) VALUES (?, 1) ON CONFLICT(scope) DO UPDATE SET version = version + 1", (scope,))
+
+def data_version(conn, scope):
+    """Numéro qui change à chaque écriture dans le groupe de tables `scope` (PROFILES_SCOPE,
+    POSTS_SCOPE) : identifie le contenu d'un export sans relire les tables."""
+    row = conn.execute("SELECT version FROM versions WHERE scope = ?", (scope,)).fetchone()
+    return row[0] if row else 0
+
+# ---------- Profils ----------
+
+def _first_id(conn, column, source, value):
+    if not value:
+        return None
+    row = conn.execute(f"SELECT id FROM profiles WHERE source = ? AND {column} = ? ORDER BY id LIMIT 1", (source, value)).fetchone()
+    return row[0] if row else None
+
+def _similar(conn, source, key, bands):
+    # Comme dedup._similar, les bandes lues en base : au plus MAX_BUCKET profils par bande
+    candidates = {}
+    for band, band_hash in enumerate(bands):
+        for profile_id, other in conn.execute(
+            "SELECT p.id, p.name_key FROM profile_bands b JOIN profiles p ON p.id = b.profile_id "
+            "WHERE b.source = ? AND b.band = ? AND b.hash = ? ORDER BY b.rowid LIMIT ?",
+            (source, band, band_hash, MAX_BUCKET),
+        ):
+            candidates[profile_id] = other
+    key_shingles = shingles(key)
+    similar = []
+    for profile_id, other in candidates.items():
+        score = jaccard(key_shingles, shingles(other))
+        if score >= FUZZY_THRESHOLD:
+            similar.append((profile_id, round(score, 3)))
+    similar.sort(key=lambda item: (-item[1], item[0]))
+    return similar
+
+def lookup_profile(conn, source, link, name):
+    # Doublons d'un profil parmi ceux de la même provenance, au format de dedup.lookup
+    # (numéros de profil en base à la place des numéros de ligne)
+    link_key, key = profile_keys(link, name)
+    match = {"link": _first_id(conn, "link_key", source, link_key), "name": _first_id(conn, "name_key", source, key), "similar": []}
+    if key and match["name"] is None:
+        match["similar"] = _similar(conn, source, key, band_hashes(key))
+    return match
+
+def _index_name(conn, source, profile_id, key):
+    # Bandes MinHash d'une clé de nom encore inconnue pour cette provenance
+    if key and _first_id(conn, "name_key", source, key) == profile_id:
+        conn.executemany(
+            "INSERT INTO profile_bands (source, band, hash, profile_id) VALUES (?, ?, ?, ?)",
+            [(source, band, band_hash, profile_id) for band, band_hash in enumerate(band_hashes(key))],
+        )
+
+def add_profile(conn, source, record):
+    """Enregistre un profil ({colonne de PROFILE_COLUMNS: valeur}) et renvoie son numéro."""
+    link_key, key = profile_keys(record.get("Lien", ""), record.get("Nom", ""))
+    with conn:
+        cursor = conn.execute(
+            f"INSERT INTO profiles (source, {_columns(PROFILE_COLUMNS)}, link_key, name_key, added_at) "
+            f"VALUES (?, {', '.join('?' * len(PROFILE_COLUMNS))}, ?, ?, ?)",
+            (source, *[record.get(c, "") for c in PROFILE_COLUMNS], link_key, key, now()),
+        )
+        _index_name(conn, source, cursor.lastrowid, key)
+        _bump(conn, PROFILES_SCOPE)
+    return cursor.lastrowid
+
+def update_profile(conn, profile_id, record):
+    # Remplace les colonnes renseignées dans `record` (profil ré-analysé)
+    columns = [c for c in PROFILE_COLUMNS if c in record]
+    source, link, name = conn.execute('SELECT source, "Lien", "Nom" FROM profiles WHERE id = ?', (profile_id,)).fetchone()
+    link_key, key = profile_keys(record.get("Lien", link), record.get("Nom", name))
+    assignments = "".join(f'"{c}" = ?, ' for c in columns)
+    with conn:
+        conn.execute(
+            f"UPDATE profiles SET {assignments}link_key = ?, name_key = ? WHERE id = ?",
+            (*[record[c] for c in columns], link_key, key, profile_id),
+        )
+        conn.execute("DELETE FROM profile_bands WHERE profile_id = ?", (profile_id,))
+        _index_name(conn, source, profile_id, key)
+        _bump(conn, PROFILES_SCOPE)
+
+def last_profile_id(conn, source):
+    row = conn.execute("SELECT MAX(id) FROM profiles WHERE source = ?", (source,)).fetchone()
+    return row[0]
+
+def get_profile(conn, profile_id):
+    row = conn.execute(f"SELECT {_columns(PROFILE_COLUMNS)} FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+    return dict(zip(PROFILE_COLUMNS, row)) if row else None
+
+def record_duplicates(conn, profile_id, match):
+    """Garde les doublons signalés pour le profil `profile_id` et les renvoie à afficher."""
+    warnings = match_rows(profile_id, match)
+    if warnings:
+        with conn:
+            conn.executemany(
+                'INSERT INTO duplicates (profile_id, other_id, "Motif", "Score") VALUES (?, ?, ?, ?)',
+                [(w["Ligne"], w["Doublon de"], w["Motif"], w["Score"]) for w in warnings],
+            )
+        names = dict(conn.execute(
+            f'SELECT id, "Nom" FROM profiles WHERE id IN ({", ".join("?" * (len(warnings) + 1))})',
+            [profile_id] + [w["Doublon de"] for w in warnings],
+        ))
+        for w in warnings:
+            w["Nom"], w["Nom existant"] = names.get(profile_id, ""), names.get(w["Doublon de"], "")
+    return warnings
+
+def _category_ids(conn, column, values):
+    # {valeur: code} des valeurs d'une colonne catégorielle, les nouvelles ajoutées à sa table
+    table, _ = EXPERIENCE_CATEGORIES[column]
+    values = {v for v in values if v is not None}
+    conn.executemany(f'INSERT OR IGNORE INTO {table} ("{column}") VALUES (?)', [(v,) for v in values])
+    return {v: conn.execute(f'SELECT id FROM {table} WHERE "{column}" = ?', (v,)).fetchone()[0] for v in values}
+
+def replace_experiences(conn, profile_id, experiences):
+    with conn:
+        ids = {c: _category_ids(conn, c, [e.get(c) for e in experiences]) for c in EXPERIENCE_CATEGORIES}
+        conn.execute("DELETE FROM experiences WHERE profile_id = ?", (profile_id,))
+        conn.executemany(
+            f"INSERT INTO experiences (profile_id, {', '.join(_EXPERIENCE_CODES)}, {_columns(_EXPERIENCE_VALUES)}) "
+            f"VALUES (?, {', '.join('?' * (len(_EXPERIENCE_CODES) + len(_EXPERIENCE_VALUES)))})",
+            [
+                (profile_id, *[ids[c].get(e.get(c)) for c in EXPERIENCE_CATEGORIES], *[e.get(c) for c in _EXPERIENCE_VALUES])
+                for e in experiences
+            ],
+        )
+        _bump(conn, PROFILES_SCOPE)
+
+def experiences_frame(conn, source, profile_ids=None):
+    """Expériences des profils d'une provenance (ou des seuls `profile_ids`) en une table longue
+    pandas : colonne "N°" (numéro de profil, lignes triées dessus) puis EXPERIENCE_COLUMNS, Entreprise
+    et Type de contrat en catégories construites directement sur les codes de la base."""
+    import numpy as np
+    import pandas as pd
+
+    query = EXPERIENCE_CODES_QUERY
+    params = [source]
+    if profile_ids is not None:
+        query += f" AND e.profile_id IN ({', '.join('?' * len(profile_ids))})"
+        params += list(profile_ids)
+    rows = conn.execute(query + " ORDER BY e.profile_id, e.id", params).fetchall()
+    columns = list(zip(*rows)) or [()] * (1 + len(_EXPERIENCE_CODES) + len(_EXPERIENCE_VALUES))
+    data = {"N°": np.array(columns[0], dtype=np.int64)}
+    categories = {}
+    for (column, (table, _)), values in zip(EXPERIENCE_CATEGORIES.items(), columns[1:]):
+        # Codes de la base -> codes 0..n-1 du Categorical (-1 pour une valeur absente)
+        category_codes, ids = pd.factorize(pd.Series(values, dtype=object))
+        names = dict(conn.execute(f'SELECT id, "{column}" FROM {table} WHERE id IN ({", ".join("?" * len(ids))})', [int(i) for i in ids]))
+        categories[column] = pd.Categorical.from_codes(category_codes, categories=pd.Index([names[i] for i in ids], dtype=object))
+    values = dict(zip(_EXPERIENCE_VALUES, columns[1 + len(_EXPERIENCE_CODES):]))
+    for c in EXPERIENCE_COLUMNS:
+        data[c] = categories[c] if c in categories else pd.Series(values[c], dtype=object)
+    return pd.DataFrame(data, copy=False)
+
+def profile_slices(frame):
+    # {numéro de profil: slice de ses lignes} sur une table triée par "N°" : frame.iloc[slice]
+    # est une vue, sans copie ni filtre ligne à ligne
+    import numpy as np
+
+    ids = frame["N°"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=np.int64)
+    ends = np.r_[starts[1:], len(ids)]
+    return {int(ids[start]): slice(int(start), int(end)) for start, end in zip(starts, ends)}
+
+def delete_profiles(conn, source):
+    # Profils d'une provenance, avec leurs expériences, bandes et doublons (ON DELETE CASCADE)
+    with conn:
+        conn.execute("DELETE FROM profiles WHERE source = ?", (source,))
+        _bump(conn, PROFILES_SCOPE)
+
+# ---------- Posts et réactions ----------
+
+def save_post(conn, digest, post, exact_date="", replaces=None):
+    """Numéro du post d'empreinte `digest` (texte brut), enregistré s'il est nouveau.
+
+    `replaces` : numéro du post enregistré auparavant pour la même saisie, dont le texte vient
+    de changer. Sa ligne est mise à jour sur place (ses réactions restent à remplacer) ; si le
+    nouveau texte est déjà enregistré sous un autre numéro, l'ancienne ligne est supprimée avec
+    ses réactions. L'historique ne garde ainsi qu'une ligne par saisie, pas une par version.
+    """
+    values = (post.get("Auteur", ""), post.get("Date relative", ""), exact_date, post.get("Post", ""))
+    with conn:
+        row = conn.execute("SELECT id FROM posts WHERE digest = ?", (digest,)).fetchone()
+        if row is not None:
+            if replaces is not None and replaces != row[0]:
+                conn.execute("DELETE FROM posts WHERE id = ?", (replaces,))
+                _bump(conn, POSTS_SCOPE)
+            return row[0]
+        if replaces is not None:
+            assignments = "".join(f'"{c}" = ?, ' for c in POST_COLUMNS)
+            cursor = conn.execute(
+                f"UPDATE posts SET digest = ?, {assignments}added_at = ? WHERE id = ?",
+                (digest, *values, now(), replaces),
+            )
+            if cursor.rowcount:
+                _bump(conn, POSTS_SCOPE)
+                return replaces
+        cursor = conn.execute(
+            f"INSERT INTO posts (digest, {_columns(POST_COLUMNS)}, added_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, *values, now()),
+        )
+        _bump(conn, POSTS_SCOPE)
+    return cursor.lastrowid
+
+def delete_post(conn, post_id):
+    # Post dont le texte a été effacé de sa saisie : supprimé avec ses réactions (ON DELETE CASCADE)
+    with conn:
+        if conn.execute("DELETE FROM posts WHERE id = ?", (post_id,)).rowcount:
+            _bump(conn, POSTS_SCOPE)
+
+def replace_reaction_rows(conn, post_id, rows):
+    # Réactions d'un post en tuples dans l'ordre de REACTION_COLUMNS (voir posts.reaction_rows)
+    with conn:
+        conn.execute("DELETE FROM reactions WHERE post_id = ?", (post_id,))
+        conn.executemany(
+            f"INSERT INTO reactions (post_id, {_columns(REACTION_COLUMNS)}) VALUES (?, {', '.join('?' * len(REACTION_COLUMNS))})",
+            ((post_id, *row) for row in rows),
+        )
+        _bump(conn, POSTS_SCOPE)
+
+def replace_reactions(conn, post_id, reactions):
+    replace_reaction_rows(conn, post_id, ([r.get(c, "") for c in REACTION_COLUMNS] for r in reactions))
+
+def reaction_counts(conn):
+    # {type de réaction: nombre}, lu sur l'index reactions_type
+    return dict(conn.execute('SELECT "Reaction", COUNT(*) FROM reactions GROUP BY "Reaction" ORDER BY "Reaction"'))
+
+# ---------- Lecture par pages et par lots ----------
+
+# ORDER BY final d'une requête de page : sans effet sur un comptage, mais il empêche SQLite
+# d'aplatir la sous-requête (toutes les lignes lues et triées avant d'être comptées)
+TRAILING_ORDER_BY_RE = re.compile(r"\s+ORDER\s+BY\s+[^()]*$", re.IGNORECASE)
+
+def count_rows(conn, query, params=()):
+    query = TRAILING_ORDER_BY_RE.sub("", query)
+    return conn.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+
+def fetch_page(conn, query, params=(), page=0, page_rows=PAGE_ROWS):
+    # (colonnes, lignes) de la page `page` (à partir de 0) de la requête
+    cursor = conn.execute(f"{query} LIMIT ? OFFSET ?", (*params, page_rows, page * page_rows))
+    return [d[0] for d in cursor.description], cursor.fetchall()
+
+def iter_query(conn, query, params=(), batch_rows=BATCH_ROWS):
+    # Lignes de la requête, lues par lots : jamais toutes en mémoire
+    cursor = conn.execute(query, params)
+    while True:
+        rows = cursor.fetchmany(batch_rows)
+        if not rows:
+            return
+        yield from rows
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import deque
+
+from . import instrument
+
+# Automate d'Aho-Corasick pour le taggage des intitulés : tous les mots-clés de tous les tags
+# sont compilés une seule fois, puis chaque intitulé est parcouru en une seule passe.
+
+def build_automaton(tags_keywords, whole_word_max_len=0):
+    """Compile {tag: [mots-clés]} en automate.
+
+    Les mots-clés de longueur <= whole_word_max_len (ex: "pm", "ia", "rh") ne sont retenus
+    que s'ils forment un mot entier ; avec 0, tout mot-clé compte comme sous-chaîne.
+    """
+    tags = list(tags_keywords)
+    goto = [{}]
+    # Par état : tags gagnés sans condition, et (longueur, tag) soumis aux limites de mot
+    plain = [set()]
+    bounded = [[]]
+    for tag_index, tag in enumerate(tags):
+        for kw in tags_keywords[tag]:
+            kw = kw.lower()
+            if not kw:
+                continue
+            state = 0
+            for ch in kw:
+                if ch not in goto[state]:
+                    goto.append({})
+                    plain.append(set())
+                    bounded.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            if len(kw) <= whole_word_max_len:
+                bounded[state].append((len(kw), tag_index))
+            else:
+                plain[state].add(tag_index)
+
+    # Liens d'échec en largeur, puis transitions complètes (DFA) pour ne jamais remonter
+    # la chaîne d'échec pendant le parcours
+    delta = [dict(g) for g in goto]
+    fail = [0] * len(goto)
+    queue = deque()
+    for ch, child in goto[0].items():
+        queue.append(child)
+    while queue:
+        state = queue.popleft()
+        plain[state] |= plain[fail[state]]
+        bounded[state] = bounded[state] + bounded[fail[state]]
+        for ch, fallback in delta[fail[state]].items():
+            if ch not in goto[state]:
+                delta[state][ch] = fallback
+        for ch, child in goto[state].items():
+            fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+            queue.append(child)
+
+    return {
+        "tags": tags,
+        "delta": delta,
+        "plain": [frozenset(s) for s in plain],
+        "bounded": [tuple(b) for b in bounded],
+    }
+
+def match_tags(automaton, text):
+    # Renvoie les tags trouvés dans le texte (déjà en minuscules), dans l'ordre du dictionnaire
+    delta = automaton["delta"]
+    plain = automaton["plain"]
+    bounded = automaton["bounded"]
+    found = set()
+    state = 0
+    end = len(text)
+    for pos, ch in enumerate(text):
+        state = delta[state].get(ch, 0)
+        if state:
+            if plain[state]:
+                found |= plain[state]
+            for length, tag_index in bounded[state]:
+                start = pos + 1 - length
+                if (start == 0 or not text[start - 1].isalnum()) and (pos + 1 == end or not text[pos + 1].isalnum()):
+                    found.add(tag_index)
+    return [automaton["tags"][i] for i in sorted(found)]
+
+def format_tags(found_tags):
+    return ", ".join(found_tags) if found_tags else "Autre"
+
+# ========== CACHE INTITULÉ -> TAGS ==========
+# Un fichier JSON par dictionnaire de mots-clés : changer tags_keywords ou le réglage des mots
+# entiers change l'empreinte, donc le fichier, et l'ancien cache n'est jamais relu à tort.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "linkedin-tools")
+
+def keywords_digest(tags_keywords, whole_word_max_len=0):
+    payload = json.dumps([tags_keywords, whole_word_max_len], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def tag_cache_path(digest, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"tags-{digest}.json")
+
+def load_tag_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+# Au-delà, les intitulés les plus anciens du cache (ordre d'insertion) sont oubliés
+MAX_CACHE_ENTRIES = 200_000
+
+# Les sessions Streamlit sont des threads d'un même processus et partagent le dict du cache
+_save_lock = threading.Lock()
+
+def save_tag_cache(path, cache, max_entries=MAX_CACHE_ENTRIES):
+    """Écrit le cache sur disque, ramené à ses max_entries intitulés les plus récents.
+
+    Le dict est copié sous verrou avant l'écriture : d'autres sessions peuvent y ajouter des
+    intitulés pendant le json.dump. L'écriture passe par un fichier temporaire propre à chaque
+    appel puis os.replace : un lecteur ne voit jamais un fichier à moitié écrit.
+    """
+    with _save_lock:
+        snapshot = dict(cache)
+        excess = len(snapshot) - max_entries
+        if excess > 0:
+            stale = list(snapshot)[:excess]
+            for key in stale:
+                del snapshot[key]
+                cache.pop(key, None)
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as f:
+        tmp_path = f.name
+        try:
+            json.dump(snapshot, f, ensure_ascii=False)
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, path)
+
+def tag_titles(titles, automaton, cache):
+    """Tague une liste d'intitulés distincts en passant par le cache.
+
+    Renvoie (tags, hits) : la chaîne de tags de chaque intitulé et le nombre d'intitulés
+    trouvés dans le cache. Les intitulés manquants sont ajoutés au cache.
+    """
+    tags = []
+    hits = 0
+    for title in titles:
+        key = str(title).lower()
+        found = cache.get(key)
+        if found is None:
+            found = format_tags(match_tags(automaton, key))
+            cache[key] = found
+        else:
+            hits += 1
+        tags.append(found)
+    instrument.count("tags : intitulés déjà en cache", hits)
+    instrument.count("tags : intitulés passés à l'automate", len(tags) - hits)
+    return tags, hits
+
+# Tags et mots-clés par défaut des intitulés de postes
+TAGS_KEYWORDS = {
+    "Management": [
+        "responsable", "chef de projet", "chief of staff", "coordinateur", "bras droit", "directeur", "manager",
+        "program manager", "project manager", "pm", "gestion", "organisational development", "référent pédagogique",
+        "chef·fe de service", "chef de projets", "operations", "product owner", "strategy"
+    ],
+    "Commercial / Vente": [
+        "commercial", "business developer", "développement commercial", "affaires", "vente", "biz dev",
+        "partenariats", "business development", "conseiller", "chargé d'affaires", "responsable commercial",
+        "price manager", "partnership manager", "business manager", "sales"
+    ],
+    "Marketing / Communication": [
+        "communication", "marketing", "fidélisation", "événementiel", "digital", "contenu", "promotion",
+        "responsable communication", "campagne", "publicité"
+    ],
+    "Support / Administration": [
+        "assistant", "administration", "admissions", "gestion", "support", "ressources humaines", "rh",
+        "coordination", "secrétariat", "chargé d'accompagnement", "chargé de mission", "chargé de scolarité",
+        "chargé de service client"
+    ],
+    "Technique / Ingénierie": [
+        "consultant", "ingénieur", "technique", "data", "analyse", "innovation", "digital", "ia", "erp", "r&d",
+        "product owner", "chef de projet digital", "chef de projet data"
+    ],
+    "Création / Design": [
+        "design", "création", "animateur", "créatif", "rédaction", "ux", "ui", "animation"
+    ]
+}
+
+# Mots-clés courts ("pm", "ia", "rh", "ux"…) exigés comme mots entiers quand l'option est active
+SHORT_KEYWORD_LEN = 3
+
+def is_missing(value):
+    # None, NaN, NaT ou pd.NA (cellule vide), sans importer pandas
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except TypeError:
+        return True
+
+def find_tags(title, automaton):
+    if is_missing(title):
+        return "Autre"
+    return format_tags(match_tags(automaton, str(title).lower()))
+
+def tag_column(series, automaton, cache):
+    # Les intitulés se répètent énormément : on ne tague que les valeurs distinctes,
+    # puis on rediffuse le résultat sur toutes les lignes via les codes de factorize
+    # (le code -1 des valeurs manquantes pointe sur le dernier élément, "Autre"). Les valeurs
+    # sont comparées sur leur clé normalisée (sans espaces autour, en minuscules) : " Manager"
+    # et "manager" ne font qu'un intitulé distinct, tagué et mis en cache une fois
+    import pandas as pd
+
+    # (sans l'accesseur .str, qui refuse une colonne entièrement vide, de type float)
+    keys = series.map(lambda title: str(title).strip().lower(), na_action="ignore")
+    codes, uniques = pd.factorize(keys)
+    unique_tags, hits = tag_titles(uniques, automaton, cache)
+    tags = pd.Series(unique_tags + ["Autre"], dtype=object).to_numpy()[codes]
+    return pd.Series(tags, index=series.index), len(uniques), hits
+
+def tag_chunks(chunks, col_index, automaton, cache, seen):
+    # Version par blocs de tag_column, sur la même clé normalisée : chaque bloc (en-tête,
+    # lignes) ressort avec la colonne Tags ajoutée ; seen accumule les intitulés distincts
+    # rencontrés, chacun avec True s'il était déjà dans le cache à sa première apparition
+    for header, rows in chunks:
+        keys = {}
+        for row in rows:
+            if row[col_index] is not None:
+                keys.setdefault(str(row[col_index]).strip().lower())
+        for key in keys:
+            if key not in seen:
+                seen[key] = key in cache
+        unique_tags, _ = tag_titles(keys, automaton, cache)
+        tags_by_key = dict(zip(keys, unique_tags))
+        yield header + ["Tags"], [
+            row + (tags_by_key[str(row[col_index]).strip().lower()] if row[col_index] is not None else "Autre",)
+            for row in rows
+        ]
@@ -0,0 +1,153 @@
+import csv
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+
+# Lecture et écriture de classeurs par blocs de lignes : ni le classeur d'entrée ni celui de
+# sortie ne sont jamais entièrement en mémoire.
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "linkedin-tools", "uploads")
+CHUNK_ROWS = 10_000
+# Taille maximale du cache des fichiers décodés ; au-delà, les moins récemment lus sont supprimés
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+
+def content_digest(fileobj, block_size=1 << 20):
+    # Empreinte du contenu, lue par blocs ; la position du fichier est remise au début
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    for block in iter(lambda: fileobj.read(block_size), b""):
+        digest.update(block)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+def header_names(row):
+    # Mêmes noms que pd.read_excel pour les en-têtes vides ou dupliqués
+    names = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def iter_xlsx_chunks(fileobj, chunk_rows=CHUNK_ROWS):
+    """Lit la première feuille en mode read-only et produit (en-tête, lignes) par blocs."""
+    from openpyxl import load_workbook
+
+    fileobj.seek(0)
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        first = next(rows, None)
+        if first is None:
+            return
+        header = header_names(first)
+        width = len(header)
+        chunk = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            if len(row) != width:
+                row = (tuple(row) + (None,) * width)[:width]
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                yield header, chunk
+                chunk = []
+        if chunk:
+            yield header, chunk
+    finally:
+        workbook.close()
+
+def iter_cached_chunks(fileobj, chunk_rows=CHUNK_ROWS, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Comme iter_xlsx_chunks, mais garde la forme décodée sur disque, indexée par empreinte.
+
+    Un même fichier re-téléversé est relu depuis les blocs picklés, sans décoder le xlsx. Le
+    cache est borné à max_bytes : les fichiers les moins récemment lus en sortent d'abord.
+    """
+    digest = content_digest(fileobj)
+    target = os.path.join(cache_dir, digest)
+    if os.path.isdir(target):
+        # La date de modification du répertoire sert de date de dernière lecture
+        os.utime(target)
+        for name in sorted(os.listdir(target)):
+            with open(os.path.join(target, name), "rb") as f:
+                yield pickle.load(f)
+        return
+
+    # Écriture dans un répertoire temporaire renommé à la fin : un décodage interrompu
+    # ne laisse jamais de cache partiel
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=cache_dir)
+    try:
+        for index, chunk in enumerate(iter_xlsx_chunks(fileobj, chunk_rows)):
+            with open(os.path.join(tmp_dir, f"{index:06d}.pkl"), "wb") as f:
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+            yield chunk
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            # Une autre session a décodé le même fichier entre-temps : son cache vaut le nôtre,
+            # le répertoire temporaire est supprimé ci-dessous
+            if not os.path.isdir(target):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    evict_cached_uploads(cache_dir, max_bytes, keep=digest)
+
+def evict_cached_uploads(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, keep=None):
+    # Supprime les fichiers décodés les moins récemment lus jusqu'à repasser sous max_bytes ;
+    # keep (celui qui vient d'être écrit) n'est jamais supprimé. Les répertoires temporaires
+    # des décodages en cours ne sont pas comptés.
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith("tmp") or not os.path.isdir(path):
+            continue
+        try:
+            size = sum(entry.stat().st_size for entry in os.scandir(path))
+            entries.append((os.stat(path).st_mtime, size, name, path))
+        except OSError:
+            continue  # supprimé entre-temps par une autre session
+    total = sum(size for _, size, _, _ in entries)
+    for _, size, name, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if name != keep:
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+def write_sheets_xlsx(path, sheets):
+    # [(feuille, en-tête, lignes)] écrites l'une après l'autre, xlsxwriter en constant_memory :
+    # chaque ligne est écrite sur disque dès qu'elle est complète. Renvoie le nombre de lignes.
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "default_date_format": "yyyy-mm-dd hh:mm:ss"})
+    row_count = 0
+    for name, header, rows in sheets:
+        worksheet = workbook.add_worksheet(name)
+        worksheet.write_row(0, 0, header)
+        row_index = 0
+        for row_index, row in enumerate(rows, start=1):
+            worksheet.write_row(row_index, 0, row)
+        row_count += row_index
+    workbook.close()
+    return row_count
+
+def write_rows_xlsx(path, header, rows):
+    return write_sheets_xlsx(path, [(None, header, rows)])
+
+def write_rows_csv(path, header, rows):
+    row_count = 0
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])
+            row_count += 1
+    return row_count
@@ -0,0 +1,80 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from linkedin_tools import dates
+
+NOW = "2024-06-15 12:00:00"
+
+
+def test_resolve_relative_dates_short_and_long_french_labels():
+    resolved = dates.resolve_relative_dates(["Il y a 3 jours • Visible de tous", "2 sem •", "5h •", "1 mois •"], now=NOW)
+    assert list(resolved) == [
+        pd.Timestamp("2024-06-12 12:00:00"),
+        pd.Timestamp("2024-06-01 12:00:00"),
+        pd.Timestamp("2024-06-15 07:00:00"),
+        pd.Timestamp("2024-05-16 12:00:00"),
+    ]
+
+
+def test_resolve_relative_dates_english_labels():
+    resolved = dates.resolve_relative_dates(["3d • Edited", "2mo •", "1 week ago"], now=NOW)
+    assert list(resolved) == [
+        pd.Timestamp("2024-06-12 12:00:00"),
+        pd.Timestamp("2024-04-16 12:00:00"),
+        pd.Timestamp("2024-06-08 12:00:00"),
+    ]
+
+
+def test_resolve_relative_dates_missing_and_unreadable_labels_give_nat():
+    resolved = dates.resolve_relative_dates([None, "", "Bonjour à tous", "3 j •"], now=NOW)
+    assert resolved.isna().tolist() == [True, True, True, False]
+    assert str(resolved.dtype) == "datetime64[ns]"
+
+
+def test_resolve_relative_dates_out_of_range_labels_give_nat():
+    # Au-delà d'un entier 64 bits, et dans la plage des entiers mais avant 1677
+    texts = ["Il y a 100000000000000000000 jours", "Il y a 500 ans, Gutenberg…", "Il y a 1 an"]
+    resolved = dates.resolve_relative_dates(texts, now=NOW)
+    assert resolved.isna().tolist() == [True, True, False]
+
+
+def test_month_periods_months_years_present_and_missing():
+    texts = ["janv. 2021", "Sep 2019", "2018", "aujourd’hui", "Present", None, "bientôt"]
+    start = dates.month_periods(texts, now=NOW)
+    assert str(start.dtype) == "period[M]"
+    assert [str(p) for p in start[:5]] == ["2021-01", "2019-09", "2018-01", "2024-06", "2024-06"]
+    assert start[5:].isna().all()
+    # Une année seule en fin d'expérience vaut décembre
+    assert str(dates.month_periods(["2018"], now=NOW, default_month=12)[0]) == "2018-12"
+
+
+def experiences(rows):
+    return pd.DataFrame(rows, columns=["N°", "Entreprise", "Date début", "Date fin"])
+
+
+def test_add_tenure_counts_both_bounds():
+    frame = dates.add_tenure(experiences([
+        (1, "Acme", "janv. 2020", "mars 2020"),
+        (1, "Acme", "2018", "2018"),
+        (1, "Acme", "janv. 2024", "aujourd’hui"),
+        (1, "Acme", "mars 2021", "janv. 2021"),
+        (1, "Acme", "mars 2021", None),
+    ]), now=NOW)
+    assert frame[dates.TENURE_COLUMN].tolist()[:3] == [3, 12, 6]
+    # Fin avant le début, ou date manquante : durée vide
+    assert frame[dates.TENURE_COLUMN][3:].isna().all()
+    assert [str(p) for p in frame["Fin"][:3]] == ["2020-03", "2018-12", "2024-06"]
+
+
+def test_total_tenure_counts_overlapping_jobs_once():
+    frame = dates.add_tenure(experiences([
+        (1, "Acme", "janv. 2020", "déc. 2020"),
+        (1, "Acme", "juin 2020", "juin 2021"),
+        (1, "Acme", "mars 2020", "avr. 2020"),
+        (1, "Globex", "mars 2022", "mai 2022"),
+        (1, "Globex", "juin 2022", "janv. 2022"),
+        (2, "Acme", "2019", "2019"),
+    ]), now=NOW)
+    totals = dates.total_tenure(frame, ["N°", "Entreprise"])
+    assert [tuple(row) for row in totals.itertuples(index=False)] == [(1, "Acme", 18), (1, "Globex", 3), (2, "Acme", 12)]
@@ -0,0 +1,53 @@
+from linkedin_tools import dedup, sqlite_store
+
+
+def test_band_hashes_of_short_keys():
+    # Une clé d'un caractère n'a qu'un trigramme (" x "), une clé vide aucun
+    assert len(dedup.band_hashes("x")) == dedup.BANDS
+    assert dedup.band_hashes("x") == dedup.band_hashes("x")
+    assert dedup.band_hashes("") == []
+
+
+def test_find_duplicates_with_one_character_and_empty_names():
+    records = [
+        {"Nom": "X", "Lien": ""},
+        {"Nom": "x", "Lien": ""},
+        {"Nom": "", "Lien": ""},
+        {"Nom": "", "Lien": ""},
+    ]
+    assert list(dedup.find_duplicates(records)) == [(1, {"link": None, "name": 0, "similar": []})]
+
+
+def test_find_duplicates_by_link_name_and_similar_name():
+    records = [
+        {"Nom": "Jean Dupont", "Lien": "https://www.linkedin.com/in/jean-dupont-1a2b"},
+        {"Nom": "Élodie Lefèvre", "Lien": ""},
+        {"Nom": "J. Dupont", "Lien": "https://fr.linkedin.com/in/Jean-Dupont-1a2b/?originalSubdomain=fr"},
+        {"Nom": "lefevre elodie", "Lien": ""},
+        {"Nom": "Elodie Lefevres", "Lien": ""},
+        {"Nom": "Utilisateur LinkedIn", "Lien": ""},
+        {"Nom": "Utilisateur LinkedIn", "Lien": ""},
+    ]
+    assert list(dedup.find_duplicates(records)) == [
+        (2, {"link": 0, "name": None, "similar": [(0, 0.583)]}),
+        (3, {"link": None, "name": 1, "similar": []}),
+        (4, {"link": None, "name": None, "similar": [(1, 0.812)]}),
+    ]
+
+
+def test_match_rows():
+    match = {"link": 0, "name": 0, "similar": [(3, 0.6)]}
+    assert dedup.match_rows(5, match) == [
+        {"Ligne": 5, "Doublon de": 0, "Motif": "même lien", "Score": 1.0},
+        {"Ligne": 5, "Doublon de": 3, "Motif": "nom proche", "Score": 0.6},
+    ]
+
+
+def test_lookup_profile_with_one_character_name():
+    conn = sqlite_store.connect(":memory:")
+    source = sqlite_store.HEADER_SOURCE
+    assert sqlite_store.lookup_profile(conn, source, "", "x") == {"link": None, "name": None, "similar": []}
+    first = sqlite_store.add_profile(conn, source, {"Nom": "X", "Lien": ""})
+    assert sqlite_store.lookup_profile(conn, source, "", "x") == {"link": None, "name": first, "similar": []}
+    assert sqlite_store.lookup_profile(conn, source, "", "") == {"link": None, "name": None, "similar": []}
+    conn.close()
@@ -0,0 +1,68 @@
+import threading
+
+from linkedin_tools import export_jobs
+
+
+def test_same_key_shares_one_job():
+    worker = export_jobs.new_worker()
+    release = threading.Event()
+    calls = []
+
+    def build(progress):
+        calls.append(None)
+        release.wait(5)
+        progress(0, total=3)
+        for _ in export_jobs.counted(range(3), progress, every=2):
+            pass
+        return b"xlsx"
+
+    first = export_jobs.submit_job(worker, ("profils", 1), build)
+    # Deuxième demande (autre session) pendant la construction : même travail
+    assert export_jobs.submit_job(worker, ("profils", 1), build) is first
+    release.set()
+    assert first["future"].result(5) == b"xlsx"
+    assert export_jobs.submit_job(worker, ("profils", 1), build) is first
+    assert export_jobs.find_job(worker, ("profils", 1)) is first
+    assert len(calls) == 1
+    assert (first["rows"], first["total"], export_jobs.job_fraction(first)) == (3, 3, 1.0)
+
+    # Nouvelle version des données : nouveau travail
+    second = export_jobs.submit_job(worker, ("profils", 2), build)
+    assert second is not first
+    assert second["future"].result(5) == b"xlsx"
+    assert len(calls) == 2
+    worker["executor"].shutdown()
+
+
+def test_failed_job_is_submitted_again():
+    worker = export_jobs.new_worker()
+    outcomes = [ValueError("base verrouillée"), b"csv"]
+
+    def build(progress):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    failed = export_jobs.submit_job(worker, "posts", build)
+    assert isinstance(failed["future"].exception(5), ValueError)
+    retried = export_jobs.submit_job(worker, "posts", build)
+    assert retried is not failed
+    assert retried["future"].result(5) == b"csv"
+    assert export_jobs.find_job(worker, "posts") is retried
+    worker["executor"].shutdown()
+
+
+def test_finished_jobs_are_evicted_oldest_first():
+    worker = export_jobs.new_worker()
+    for key in range(export_jobs.MAX_FINISHED + 2):
+        export_jobs.submit_job(worker, key, lambda progress: b"")["future"].result(5)
+    export_jobs.submit_job(worker, "dernier", lambda progress: b"")["future"].result(5)
+    # Éviction à la soumission : les MAX_FINISHED travaux terminés, plus celui qui vient d'être lancé
+    assert list(worker["jobs"]) == list(range(2, export_jobs.MAX_FINISHED + 2)) + ["dernier"]
+    worker["executor"].shutdown()
+
+
+def test_job_fraction_without_total():
+    assert export_jobs.job_fraction({"rows": 10, "total": None}) is None
+    assert export_jobs.job_fraction({"rows": 10, "total": 4}) == 1.0
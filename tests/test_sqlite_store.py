@@ -0,0 +1,122 @@
+import os
+
+from linkedin_tools import sqlite_store
+
+SOURCE = sqlite_store.HEADER_SOURCE
+
+
+def post(text):
+    return {"Auteur": "Jean Dupont", "Date relative": "2 j", "Post": text}
+
+
+def posts_and_reactions(conn):
+    posts = [tuple(row) for row in conn.execute('SELECT id, "Post" FROM posts ORDER BY id')]
+    reactions = [tuple(row) for row in conn.execute('SELECT post_id, "Name" FROM reactions ORDER BY id')]
+    return posts, reactions
+
+
+def test_save_post_is_idempotent_per_digest():
+    conn = sqlite_store.connect(":memory:")
+    first = sqlite_store.save_post(conn, b"a", post("Bonjour"))
+    assert sqlite_store.save_post(conn, b"a", post("Bonjour")) == first
+    assert sqlite_store.save_post(conn, b"b", post("Autre")) == first + 1
+    assert posts_and_reactions(conn)[0] == [(first, "Bonjour"), (first + 1, "Autre")]
+    conn.close()
+
+
+def test_save_post_replaces_the_edited_row_in_place():
+    conn = sqlite_store.connect(":memory:")
+    post_id = sqlite_store.save_post(conn, b"v1", post("Bonjour"))
+    sqlite_store.replace_reaction_rows(conn, post_id, [("like", "Marie Curie", "Chercheuse", "")])
+    version = sqlite_store.data_version(conn, sqlite_store.POSTS_SCOPE)
+    assert sqlite_store.save_post(conn, b"v2", post("Bonjour à tous"), "2025-01-13 12:00:00", replaces=post_id) == post_id
+    assert sqlite_store.data_version(conn, sqlite_store.POSTS_SCOPE) != version
+    # Les réactions restent rattachées à la ligne, jusqu'à leur remplacement par l'app
+    assert posts_and_reactions(conn) == ([(post_id, "Bonjour à tous")], [(post_id, "Marie Curie")])
+    assert conn.execute('SELECT "Date exacte" FROM posts').fetchone()[0] == "2025-01-13 12:00:00"
+    conn.close()
+
+
+def test_save_post_merges_into_an_existing_digest():
+    conn = sqlite_store.connect(":memory:")
+    kept = sqlite_store.save_post(conn, b"a", post("Bonjour"))
+    edited = sqlite_store.save_post(conn, b"b", post("Autre"))
+    sqlite_store.replace_reaction_rows(conn, kept, [("like", "Marie Curie", "", "")])
+    sqlite_store.replace_reaction_rows(conn, edited, [("love", "Paul Martin", "", "")])
+    # La saisie "b" reprend le texte de "a" : sa ligne disparaît avec ses réactions
+    assert sqlite_store.save_post(conn, b"a", post("Bonjour"), replaces=edited) == kept
+    assert posts_and_reactions(conn) == ([(kept, "Bonjour")], [(kept, "Marie Curie")])
+    conn.close()
+
+
+def test_save_post_with_a_missing_replaced_row_inserts():
+    conn = sqlite_store.connect(":memory:")
+    assert sqlite_store.save_post(conn, b"a", post("Bonjour"), replaces=42) == 1
+    assert posts_and_reactions(conn)[0] == [(1, "Bonjour")]
+    conn.close()
+
+
+def test_delete_post_drops_its_reactions():
+    conn = sqlite_store.connect(":memory:")
+    deleted = sqlite_store.save_post(conn, b"a", post("Bonjour"))
+    kept = sqlite_store.save_post(conn, b"b", post("Autre"))
+    sqlite_store.replace_reaction_rows(conn, deleted, [("like", "Marie Curie", "", "")])
+    sqlite_store.replace_reaction_rows(conn, kept, [("love", "Paul Martin", "", "")])
+    version = sqlite_store.data_version(conn, sqlite_store.POSTS_SCOPE)
+    sqlite_store.delete_post(conn, deleted)
+    assert sqlite_store.data_version(conn, sqlite_store.POSTS_SCOPE) != version
+    assert posts_and_reactions(conn) == ([(kept, "Autre")], [(kept, "Paul Martin")])
+    version = sqlite_store.data_version(conn, sqlite_store.POSTS_SCOPE)
+    sqlite_store.delete_post(conn, deleted)
+    assert sqlite_store.data_version(conn, sqlite_store.POSTS_SCOPE) == version
+    conn.close()
+
+
+def test_lookup_and_record_duplicates():
+    conn = sqlite_store.connect(":memory:")
+    jean = sqlite_store.add_profile(conn, SOURCE, {"Nom": "Jean Dupont", "Lien": "https://www.linkedin.com/in/jean-dupont-1a2b"})
+    elodie = sqlite_store.add_profile(conn, SOURCE, {"Nom": "Élodie Lefèvre", "Lien": ""})
+    # Autre provenance : jamais comparée
+    sqlite_store.add_profile(conn, sqlite_store.FULL_PROFILE_SOURCE, {"Nom": "Paul Martin", "Lien": ""})
+
+    assert sqlite_store.lookup_profile(conn, SOURCE, "https://fr.linkedin.com/in/Jean-Dupont-1a2b/?originalSubdomain=fr", "J. Dupont") == {
+        "link": jean, "name": None, "similar": [(jean, 0.583)],
+    }
+    assert sqlite_store.lookup_profile(conn, SOURCE, "", "lefevre elodie") == {"link": None, "name": elodie, "similar": []}
+    assert sqlite_store.lookup_profile(conn, SOURCE, "", "Paul Martin") == {"link": None, "name": None, "similar": []}
+
+    match = sqlite_store.lookup_profile(conn, SOURCE, "", "Elodie Lefevres")
+    assert match == {"link": None, "name": None, "similar": [(elodie, 0.812)]}
+    new = sqlite_store.add_profile(conn, SOURCE, {"Nom": "Elodie Lefevres", "Lien": ""})
+    assert sqlite_store.record_duplicates(conn, new, match) == [
+        {"Ligne": new, "Doublon de": elodie, "Motif": "nom proche", "Score": 0.812, "Nom": "Elodie Lefevres", "Nom existant": "Élodie Lefèvre"},
+    ]
+    assert [tuple(row) for row in conn.execute(sqlite_store.DUPLICATES_QUERY, (SOURCE,))] == [
+        (new, "Elodie Lefevres", elodie, "Élodie Lefèvre", "nom proche", 0.812),
+    ]
+    conn.close()
+
+
+def test_update_profile_reindexes_the_name():
+    conn = sqlite_store.connect(":memory:")
+    profile_id = sqlite_store.add_profile(conn, SOURCE, {"Nom": "Jean Dupont", "Lien": ""})
+    sqlite_store.update_profile(conn, profile_id, {"Nom": "Marie Curie"})
+    assert sqlite_store.lookup_profile(conn, SOURCE, "", "Jean Dupont") == {"link": None, "name": None, "similar": []}
+    assert sqlite_store.lookup_profile(conn, SOURCE, "", "marie curie") == {"link": None, "name": profile_id, "similar": []}
+    conn.close()
+
+
+def test_prune_collections_removes_only_stale_collections(tmp_path):
+    stale, fresh, kept = (sqlite_store.new_collection_id() for _ in range(3))
+    old = 1_000_000_000
+    for collection_id in (stale, fresh, kept):
+        path = tmp_path / f"{collection_id}.sqlite3"
+        path.write_bytes(b"")
+        if collection_id != fresh:
+            os.utime(path, (old, old))
+    (tmp_path / f"{stale}.sqlite3-wal").write_bytes(b"")
+    os.utime(tmp_path / f"{stale}.sqlite3-wal", (old, old))
+    (tmp_path / "notes.sqlite3").write_bytes(b"")
+    os.utime(tmp_path / "notes.sqlite3", (old, old))
+    assert sqlite_store.prune_collections(keep=kept, collections_dir=str(tmp_path)) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([f"{fresh}.sqlite3", f"{kept}.sqlite3", "notes.sqlite3"])